@@ -0,0 +1,7 @@
+"""Performance benchmarks for the simulator (see :mod:`benchmarks.suite`).
+
+Run from the repository root::
+
+    python -m benchmarks run -o benchmarks/baselines/main.json
+    python -m benchmarks compare benchmarks/baselines/main.json
+"""
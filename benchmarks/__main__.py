@@ -0,0 +1,85 @@
+"""Command line for the benchmark suite: ``run`` a baseline, ``compare`` against one."""
+
+import argparse
+import os
+import sys
+
+from benchmarks import suite
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "baseline.json")
+
+
+def _progress(key, seconds):
+    print(f"  {key:<36} {suite.format_seconds(seconds):>10}", flush=True)
+
+
+def _run(args, sizes=None, names=None):
+    return suite.run_suite(sizes=sizes or args.sizes, names=names or args.case,
+                           min_time=args.min_time, repeat=args.repeat, progress=_progress)
+
+
+def cmd_run(args):
+    results = _run(args)
+    suite.save_results(results, args.output)
+    print(f"saved {len(results['results'])} results to {args.output}")
+    return 0
+
+
+def cmd_compare(args):
+    baseline = suite.load_results(args.baseline)
+    if args.current is not None:
+        current = suite.load_results(args.current)
+    else:
+        # Re-run just the cases and sizes the baseline has.
+        keys = baseline["results"]
+        names = sorted({key.split("/")[0] for key in keys})
+        sizes = sorted({int(key.split("/N=")[1]) for key in keys if "/N=" in key})
+        current = _run(args, sizes=sizes or suite.DEFAULT_SIZES, names=names)
+        if args.output:
+            suite.save_results(current, args.output)
+
+    rows = suite.compare_results(baseline, current, args.threshold)
+    print(f"\n{'case':<36} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for key, before, after, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{key:<36} {suite.format_seconds(before):>10} "
+              f"{suite.format_seconds(after):>10} {ratio:>6.2f}x{flag}")
+    regressions = sum(row[4] for row in rows)
+    print(f"\n{regressions} of {len(rows)} cases slower than {1 + args.threshold:.2f}x baseline")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def timing_options(p):
+        p.add_argument("--sizes", type=int, nargs="+", default=list(suite.DEFAULT_SIZES),
+                       help="story counts to sweep (default: %(default)s)")
+        p.add_argument("--case", nargs="+", choices=[c.name for c in suite.CASES],
+                       help="only these cases")
+        p.add_argument("--min-time", type=float, default=0.05,
+                       help="seconds each timing repeat runs for at least")
+        p.add_argument("--repeat", type=int, default=5, help="timing repeats per case")
+
+    run = commands.add_parser("run", help="time the suite and save the results as a baseline")
+    timing_options(run)
+    run.add_argument("-o", "--output", default=DEFAULT_BASELINE, help="where to save the JSON")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="flag cases slower than a baseline")
+    compare.add_argument("baseline", help="baseline JSON from 'run'")
+    compare.add_argument("current", nargs="?",
+                         help="results JSON to compare (default: run the suite now)")
+    compare.add_argument("--threshold", type=float, default=suite.DEFAULT_THRESHOLD,
+                         help="allowed slowdown as a fraction (default: %(default)s)")
+    compare.add_argument("-o", "--output", help="also save a fresh run here")
+    timing_options(compare)
+    compare.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
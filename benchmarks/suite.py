@@ -0,0 +1,195 @@
+"""Microbenchmarks of the simulator's hot paths, with JSON baselines.
+
+Each case times one operation (assembling a model, a modal analysis, a
+Newmark step, a load evaluation, drawing a frame) for buildings of
+``N`` stories, swept over :data:`DEFAULT_SIZES`. Cases that do not depend on
+the building (ground-motion synthesis) are timed once. :func:`run_suite`
+returns the results as a JSON-ready dict that :func:`save_results` writes
+as a baseline. :func:`compare_results` then flags every case that got slower
+than a baseline by more than a threshold.
+
+Timings are the best per-call time over several repeats, each repeat
+running enough calls to last ``min_time`` seconds, so they are comparable
+between runs on one machine, not across machines.
+"""
+
+import json
+import os
+import platform
+import time
+import timeit
+
+import numpy as np
+
+from core import physics
+from core.building_structure import Building
+
+DEFAULT_SIZES = (1, 10, 100, 1000)
+DEFAULT_THRESHOLD = 0.10     # a case is a regression if >10% slower
+
+
+class Case:
+    """One benchmark: ``setup(n)`` returns the zero-argument call to time.
+
+    ``sized`` cases are swept over the story counts; the others ignore ``n``.
+    """
+
+    def __init__(self, name, setup, sized=True):
+        self.name = name
+        self.setup = setup
+        self.sized = sized
+
+
+def _building(n):
+    return Building(num_stories=n)
+
+
+def _build_model(n):
+    return _building(n).build_model
+
+
+def _modal_analysis(n):
+    b = _building(n)
+    return lambda: physics.modal_analysis(b.M, b.K, num_modes=min(3, b.ndof))
+
+
+def _newmark_step(n):
+    b = _building(n)
+    state = [np.zeros(b.ndof) for _ in range(3)]
+    force = b._seismic_pattern * 0.5
+    return lambda: b.integrator.step_inplace(*state, force)
+
+
+def _synthetic_ground_motion(n):
+    return lambda: physics.SyntheticGroundMotion(0.3, duration=20.0, seed=0)
+
+
+def _wind_force_at(n):
+    wind = physics.WindLoad(_building(n), 30.0, seed=0)
+    return lambda: wind.force_at(12.345)
+
+
+def _flood_lateral_force(n):
+    b = _building(n)
+    return lambda: physics.flood_lateral_force(b, 4.0)
+
+
+def _render_world(n):
+    # Drawing needs a display driver even offscreen; the dummy one is headless.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from config import settings
+    from core.biome_generator import BiomeGenerator
+    from graphics.particles import RainField, WindField
+    from graphics.renderer import Renderer
+
+    pygame.init()
+    width, height = settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT
+    screen = pygame.display.set_mode((width, height))
+    biomes = BiomeGenerator(width, height)
+    renderer = Renderer(screen, biomes)
+    b = _building(n)
+    b.update_physics(None, 2.0)
+    x = width // 2
+    ground_y = biomes.get_ground_y_at_x(x, "Af")
+    rain = RainField(width, height, seed=0)
+    rain.spawn(2000)
+    wind = WindField(width, height, ground_y, seed=0)
+    wind.spawn(500, 30.0)
+    water_y = ground_y - 2.0 * settings.METERS_TO_PIXELS
+    return lambda: renderer.render_world("Af", b, x, wind_particles=wind, rain_particles=rain,
+                                         flood_water_surface_y_px=water_y)
+
+
+CASES = (
+    Case("build_model", _build_model),
+    Case("modal_analysis", _modal_analysis),
+    Case("newmark_step", _newmark_step),
+    Case("synthetic_ground_motion", _synthetic_ground_motion, sized=False),
+    Case("wind_force_at", _wind_force_at),
+    Case("flood_lateral_force", _flood_lateral_force),
+    Case("render_world", _render_world),
+)
+
+
+def time_call(func, min_time=0.05, repeat=5):
+    """Best seconds per call of ``func`` over ``repeat`` runs of >= ``min_time`` s each."""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed <= 0.0 else max(2, int(min_time / elapsed * 1.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number, number
+
+
+def result_key(name, n):
+    return name if n is None else f"{name}/N={n}"
+
+
+def run_suite(sizes=DEFAULT_SIZES, names=None, min_time=0.05, repeat=5, progress=None):
+    """Time every case (or those in ``names``) and return the results dict.
+
+    ``progress``, if given, is called with each result key and its seconds per
+    call as they finish.
+    """
+    results = {}
+    for case in CASES:
+        if names and case.name not in names:
+            continue
+        for n in (sizes if case.sized else (None,)):
+            func = case.setup(n or 1)
+            func()  # warm caches and lazy imports before timing
+            seconds, number = time_call(func, min_time, repeat)
+            key = result_key(case.name, n)
+            results[key] = {"seconds": seconds, "number": number}
+            if progress is not None:
+                progress(key, seconds)
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+
+def save_results(results, path):
+    directory = os.path.dirname(os.fspath(path))
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1, sort_keys=True)
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Per-case ``(key, baseline_s, current_s, ratio, regressed)`` rows.
+
+    Only cases present in both runs are compared; a case regressed when it
+    takes more than ``1 + threshold`` times its baseline time.
+    """
+    rows = []
+    base, new = baseline["results"], current["results"]
+    for key in base:
+        if key not in new:
+            continue
+        before, after = base[key]["seconds"], new[key]["seconds"]
+        ratio = after / before if before > 0 else float("inf")
+        rows.append((key, before, after, ratio, ratio > 1.0 + threshold))
+    return rows
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
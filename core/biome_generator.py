@@ -1,5 +1,6 @@
-import math
-import numpy as np # Though not used in this version, it's good to keep if you plan more complex terrain.
+from collections import OrderedDict
+
+import numpy as np
 from config import settings
 
 # Biome definitions (Koppen-inspired)
@@ -57,14 +58,39 @@ BIOME_DATA = {
 DEFAULT_BIOME_CODE = "Af" # Default if a code is not found
 
 class BiomeGenerator:
-    def __init__(self, screen_width, screen_height):
+    """Terrain and colours for each biome.
+
+    The ground of a biome is a sine profile across the screen, which
+    liquefaction makes taller and choppier. Since it is drawn and queried
+    every frame, each ``(biome, liquefaction scale)`` profile is evaluated
+    once with numpy into a heightfield (the ground y of every pixel column)
+    and kept in a small LRU cache. Lookups then interpolate in it in O(1),
+    for one x or an array of them. Liquefaction scales are rounded to
+    ``liquefaction_resolution`` first, and the last ``cache_size`` profiles
+    are kept.
+    """
+
+    # Liquefaction deformation at full scale: ground waves 80% taller and
+    # 50% more frequent.
+    MAX_AMPLITUDE_INCREASE_FACTOR = 1.8
+    MAX_FREQUENCY_INCREASE_FACTOR = 1.5
+
+    def __init__(self, screen_width, screen_height, liquefaction_resolution=1.0 / 64,
+                 cache_size=32):
         """
         Initializes the BiomeGenerator.
         :param screen_width: Width of the game screen.
         :param screen_height: Height of the game screen.
+        :param liquefaction_resolution: Step the liquefaction scale is rounded to.
+        :param cache_size: Number of terrain profiles kept.
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.liquefaction_resolution = float(liquefaction_resolution)
+        self.cache_size = int(cache_size)
+        self._heightfields = OrderedDict()
+        self._last_query = self._last_heightfield = None
+        self._ground_points = OrderedDict()
 
     def get_biome_properties(self, biome_code):
         """
@@ -78,45 +104,70 @@ class BiomeGenerator:
             return BIOME_DATA[DEFAULT_BIOME_CODE]
         return BIOME_DATA[biome_code]
 
+    # -- Terrain profile -------------------------------------------------------
+
+    def _quantise(self, liquefaction_effect_scale):
+        return int(round(liquefaction_effect_scale / self.liquefaction_resolution))
+
+    def _ground_y(self, x, biome_code, level):
+        """Ground y at the x values (array) for liquefaction level ``level`` (quantised)."""
+        props = self.get_biome_properties(biome_code)
+        scale = level * self.liquefaction_resolution
+        amplitude = props["amplitude"] * (1.0 + (self.MAX_AMPLITUDE_INCREASE_FACTOR - 1.0) * scale)
+        frequency = props["frequency"] * (1.0 + (self.MAX_FREQUENCY_INCREASE_FACTOR - 1.0) * scale)
+        phase_shift = props.get("phase_shift", 0.0)
+        y = self.screen_height * props["base_height_factor"] + amplitude * np.sin(frequency * x + phase_shift)
+        return np.clip(y, 0, self.screen_height - 1)  # keep y within screen bounds
+
+    def _heightfield(self, biome_code, liquefaction_effect_scale):
+        """``(array, list)`` forms of the heightfield; the list is for fast scalar lookups."""
+        query = (biome_code, liquefaction_effect_scale)
+        if query == self._last_query:   # per-frame lookups repeat the same profile
+            return self._last_heightfield
+        key = (biome_code, self._quantise(liquefaction_effect_scale))
+        cache = self._heightfields
+        entry = cache.get(key)
+        if entry is None:
+            field = self._ground_y(np.arange(int(self.screen_width) + 1, dtype=float), biome_code, key[1])
+            field.flags.writeable = False
+            entry = cache[key] = (field, field.tolist())
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        self._last_query, self._last_heightfield = query, entry
+        return entry
+
+    def heightfield(self, biome_code, liquefaction_effect_scale=0.0):
+        """Ground y at each pixel column ``x = 0 .. screen_width`` (read-only array)."""
+        return self._heightfield(biome_code, liquefaction_effect_scale)[0]
+
     def generate_ground_points(self, biome_code, num_points=None, liquefaction_effect_scale=0.0):
         """
-        Generates a list of (x, y) points for a curvy ground polygon.
+        Generates the (x, y) points for a curvy ground polygon.
         The number of points can be specified, or defaults to screen_width / 10 for reasonable detail.
+        The points are cached and shared between calls, hence a tuple.
         :param biome_code: The Koppen code for the biome.
         :param num_points: The number of points to generate for the top edge of the terrain.
         :param liquefaction_effect_scale: Float (0.0 to 1.0) controlling the intensity of liquefaction deformation.
-        :return: A list of (x,y) tuples representing the vertices of the ground polygon.
+        :return: A tuple of (x,y) tuples representing the vertices of the ground polygon.
         """
-        props_orig = self.get_biome_properties(biome_code)
-        props = props_orig.copy() # Work with a copy to modify for liquefaction
-
-        base_ground_y = self.screen_height * props["base_height_factor"]
-        
-        # Liquefaction effect parameters
-        max_amplitude_increase_factor = 1.8 # e.g., ground waves can be 80% taller
-        max_frequency_increase_factor = 1.5 # e.g., ground waves can be 50% more frequent
-
-        amplitude_multiplier = 1.0 + (max_amplitude_increase_factor - 1.0) * liquefaction_effect_scale
-        frequency_multiplier = 1.0 + (max_frequency_increase_factor - 1.0) * liquefaction_effect_scale
-        
-        amplitude = props["amplitude"] * amplitude_multiplier
-        frequency = props["frequency"] * frequency_multiplier
-        phase_shift = props.get("phase_shift", 0.0) # Use .get for backward compatibility if not all biomes have it
-
         if num_points is None:
             num_points = max(50, int(self.screen_width / 10)) # Ensure at least 50 points, or one every 10 pixels
-
-        points = []
-        for i in range(num_points + 1):
-            x = (self.screen_width / num_points) * i
-            # Sine wave for simple curviness.
-            y_offset = amplitude * math.sin(frequency * x + phase_shift)
-            y = base_ground_y + y_offset
-            points.append((x, min(self.screen_height -1, max(0, y)))) # Clamp y to be within screen bounds
-
-        # Add points to close the polygon at the bottom of the screen
-        points.append((self.screen_width, self.screen_height))
-        points.append((0, self.screen_height))
+        key = (biome_code, self._quantise(liquefaction_effect_scale), num_points)
+        cache = self._ground_points
+        points = cache.get(key)
+        if points is None:
+            x = (self.screen_width / num_points) * np.arange(num_points + 1)
+            points = list(zip(x.tolist(), self._ground_y(x, biome_code, key[1]).tolist()))
+            # Add points to close the polygon at the bottom of the screen
+            points.append((self.screen_width, self.screen_height))
+            points.append((0, self.screen_height))
+            points = cache[key] = tuple(points)
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
         return points
 
     def get_available_biomes(self):
@@ -127,28 +178,20 @@ class BiomeGenerator:
 
     def get_ground_y_at_x(self, x_coord, biome_code, liquefaction_effect_scale=0.0):
         """
-        Calculates the y-coordinate of the ground at a specific x-coordinate
-        based on the biome's terrain generation parameters.
-        :param x_coord: The x-coordinate on the screen.
+        The y-coordinate of the ground at a specific x-coordinate (or array of them),
+        interpolated in the cached heightfield. x is clamped to the screen.
+        :param x_coord: The x-coordinate on the screen, or an array of them.
         :param biome_code: The Koppen code for the biome.
         :param liquefaction_effect_scale: Float (0.0 to 1.0) controlling the intensity of liquefaction deformation.
-        :return: The y-coordinate of the ground.
+        :return: The y-coordinate of the ground (a float, or an array shaped like x_coord).
         """
-        props_orig = self.get_biome_properties(biome_code)
-        props = props_orig.copy() # Work with a copy
-
-        base_ground_y = self.screen_height * props["base_height_factor"]
-
-        # Liquefaction effect parameters (should match generate_ground_points)
-        max_amplitude_increase_factor = 1.8
-        max_frequency_increase_factor = 1.5
-
-        amplitude_multiplier = 1.0 + (max_amplitude_increase_factor - 1.0) * liquefaction_effect_scale
-        frequency_multiplier = 1.0 + (max_frequency_increase_factor - 1.0) * liquefaction_effect_scale
-
-        amplitude = props["amplitude"] * amplitude_multiplier
-        frequency = props["frequency"] * frequency_multiplier
-        phase_shift = props.get("phase_shift", 0.0)
-
-        y_offset = amplitude * math.sin(frequency * x_coord + phase_shift)
-        return min(self.screen_height -1, max(0, base_ground_y + y_offset))
+        field, values = self._heightfield(biome_code, liquefaction_effect_scale)
+        last = len(values) - 1
+        if np.ndim(x_coord) == 0:
+            x = min(max(float(x_coord), 0.0), last)
+            i = min(int(x), last - 1)
+            y0 = values[i]
+            return y0 + (values[i + 1] - y0) * (x - i)
+        x = np.clip(np.asarray(x_coord, dtype=float), 0.0, last)
+        i = np.minimum(x.astype(np.intp), last - 1)
+        return field[i] + (field[i + 1] - field[i]) * (x - i)
@@ -1,11 +1,13 @@
+from dataclasses import dataclass
 from enum import Enum, auto
 import math
 import random
+import time
 
 import numpy as np
 
-from graphics.renderer import BuildingFragment
 from core import physics
+from core.trace import tracer
 
 
 class Material:
@@ -65,7 +67,57 @@ class JointType(Enum):
     SEMI_RIGID = auto()
 
 
-class Building:
+class _ResponseReadouts:
+    """Displacement and damage readouts shared by :class:`Building` and its snapshots.
+
+    Needs ``q`` and ``q_previous`` (SSI displacements now and one step back),
+    ``n``, ``height_of_floor``, ``story_height`` and ``failed_stories``.
+    """
+
+    def _displacements_at(self, alpha):
+        """Displacements ``alpha`` (0..1) of the way from the previous step to this one."""
+        if alpha >= 1.0:
+            return self.q
+        return self.q_previous + alpha * (self.q - self.q_previous)
+
+    def floor_displacements(self, alpha=1.0):
+        """Absolute lateral displacement of each floor relative to ground (m).
+
+        ``x_i = u_f + theta_f * z_i + v_i`` -- foundation sway, rocking, and
+        structural distortion combined. An ``alpha`` below 1 interpolates
+        between the previous step and the current one, for drawing between
+        fixed steps (see :attr:`core.clock.FixedStepClock.alpha`).
+        """
+        q = self._displacements_at(alpha)
+        v = q[:self.n]
+        u_f = q[self.n]
+        theta_f = q[self.n + 1]
+        return u_f + theta_f * self.height_of_floor + v
+
+    def foundation_sway(self, alpha=1.0):
+        """Foundation horizontal displacement (m), interpolated like
+        :meth:`floor_displacements`."""
+        return float(self._displacements_at(alpha)[self.n])
+
+    @property
+    def base_sway(self):
+        """Foundation horizontal displacement (m)."""
+        return self.foundation_sway()
+
+    @property
+    def current_drift_ratios(self):
+        return physics.story_drifts(self.q[:self.n], self.story_height)
+
+    @property
+    def max_drift_ratio(self):
+        return float(np.max(np.abs(self.current_drift_ratios))) if self.n else 0.0
+
+    @property
+    def num_failed_stories(self):
+        return int(np.count_nonzero(self.failed_stories))
+
+
+class Building(_ResponseReadouts):
     """A building modelled as a multi-degree-of-freedom dynamic system.
 
     The lateral response is a shear+flexural stack on a flexible foundation
@@ -91,7 +143,9 @@ class Building:
                  facade_cladding_mass_per_area: float = 75.0,
                  overall_damping_ratio: float = None,
                  plan_symmetry: PlanSymmetry = PlanSymmetry.SYMMETRIC,
-                 time_step: float = 1.0 / 60.0):
+                 time_step: float = 1.0 / 60.0,
+                 banded: bool = None,
+                 hysteresis=None):
 
         self.num_stories = num_stories
         self.story_height = story_height
@@ -109,6 +163,13 @@ class Building:
         self.effective_damping_ratio = (overall_damping_ratio if overall_damping_ratio is not None
                                         else primary_material.damping_ratio)
         self.dt = time_step
+        # Banded storage keeps tall stacks at O(N) memory and work per step;
+        # by default it switches on once the dense matrices stop being cheap.
+        self.banded = banded
+        # Optional story hysteresis (physics.BilinearHysteresis or
+        # BoucWenHysteresis): stories then yield gradually under a Newton
+        # solve instead of only switching to a residual stiffness on failure.
+        self.hysteresis = hysteresis
 
         self.recompute_derived_properties()
         self.build_model()
@@ -130,24 +191,57 @@ class Building:
         """
         self.recompute_derived_properties()
 
-        self.M, self.C, self.K, self.influence = physics.build_ssi_system(self, self.soil_profile)
-        self.ndof = self.M.shape[0]
-        self.n = self.num_stories
-        self.height_of_floor = physics.floor_heights(self)            # m above base
-        self.calculated_mass = float(physics.floor_masses(self).sum())
-
-        modal = physics.modal_analysis(self.M, self.K)
-        self.fundamental_period = float(modal.periods[0])
-
-        self.collapse = physics.ProgressiveCollapse(self)
+        banded = self.uses_banded_storage
+        # One context for the whole build: masses, section sizes, rigidities and
+        # the fixed-base modes are each derived once and shared.
+        with physics.AssemblyContext.of(self):
+            self.M, self.C, self.K, self.influence = physics.build_ssi_system(
+                self, self.soil_profile, banded=banded)
+            self.ndof = self.M.shape[0]
+            self.n = self.num_stories
+            self.height_of_floor = physics.floor_heights(self)            # m above base
+            self.calculated_mass = float(physics.floor_masses(self).sum())
+
+            # Only the fundamental mode is needed. The previous build's shape is a
+            # good warm start when a slider nudges the parameters; otherwise the
+            # fixed-base modes (no foundation motion) already used for damping are.
+            previous = getattr(self, "fundamental_mode", None)
+            if previous is not None and len(previous) == self.ndof:
+                guess = previous[:, None]
+            else:
+                fixed = physics.fixed_base_modes(self, banded=banded).mode_shapes
+                guess = np.vstack([fixed, np.zeros((2, fixed.shape[1]))])
+            modal = physics.modal_analysis(self.M, self.K, num_modes=1, initial_modes=guess)
+            self.fundamental_period = float(modal.periods[0])
+            self.fundamental_mode = modal.mode_shapes[:, 0]
+
+            self.collapse = physics.ProgressiveCollapse(self, banded=banded)
+            if self.hysteresis is not None:
+                self.integrator = physics.hysteretic_integrator(
+                    self, self.soil_profile, self.hysteresis, banded=banded)
+            else:
+                self.integrator = physics.NewmarkIntegrator(self.M, self.C, self.K, self.dt)
         self.drift_capacity = self.collapse.capacity
-        self.integrator = physics.NewmarkIntegrator(self.M, self.C, self.K, self.dt)
 
         self.q = np.zeros(self.ndof)     # displacements [v_1..v_N, u_f, theta_f]
         self.qd = np.zeros(self.ndof)    # velocities
         self.qdd = np.zeros(self.ndof)   # accelerations
+        # State one step back, for drawing between steps (floor_displacements).
+        self.q_previous = np.zeros(self.ndof)
+        self._pending_time = 0.0
+        # Unit-acceleration earthquake load and a reusable load buffer, so a
+        # step only scales the pattern instead of re-forming M @ influence.
+        self._seismic_pattern = physics.seismic_force(self.M, self.influence, 1.0)
+        self._load = np.zeros(self.ndof)
         self.is_destroyed = False
 
+    @property
+    def uses_banded_storage(self):
+        """Whether the model is assembled in banded rather than dense storage."""
+        if self.banded is not None:
+            return bool(self.banded)
+        return self.num_stories >= physics.BANDED_MIN_STORIES
+
     def set_soil_profile(self, soil_profile):
         """Swap the soil (e.g. liquefaction) and refactorise in place.
 
@@ -158,26 +252,48 @@ class Building:
         k_h, k_r = physics.soil_stiffness(self, soil_profile)
         c_h, c_r = physics.soil_damping(self, soil_profile)
         n = self.n
-        self.K[n, n] = k_h
-        self.K[n + 1, n + 1] = k_r
-        self.C[n, n] = c_h
-        self.C[n + 1, n + 1] = c_r
-        self.integrator.update_system(K=self.K, C=self.C)
+        # The foundation block is the banded border's corner, or a view into
+        # the dense matrices; either way it is edited in place.
+        K_f = self.K.corner if self.uses_banded_storage else self.K[n:, n:]
+        C_f = self.C.corner if self.uses_banded_storage else self.C[n:, n:]
+        K_f[0, 0] = k_h
+        K_f[1, 1] = k_r
+        C_f[0, 0] = c_h
+        C_f[1, 1] = c_r
+        if self.hysteresis is not None:
+            self.integrator.set_foundation(k_h, k_r, c_h, c_r)
+        else:
+            self.integrator.update_system(K=self.K, C=self.C)
 
     # -- Time stepping -------------------------------------------------------
 
+    @tracer.traced("physics.update")
     def update_physics(self, delta_time=None, ground_acceleration=0.0,
                        wind_force=None, flood_force=None):
-        """Advance the dynamic state one step under the given loads.
+        """Advance the dynamic state under the given loads; returns the steps taken.
 
         ``ground_acceleration`` is the base input (m/s^2); ``wind_force`` and
         ``flood_force`` are per-floor horizontal force vectors (length N) or None.
-        The fixed model time step is used so the integrator stays factorised.
+        The fixed model time step is used so the integrator stays factorised;
+        the state arrays are advanced in place. With ``delta_time`` None this
+        is one step. Otherwise it is as many whole steps as fit in
+        ``delta_time`` plus the time left over from earlier calls, with the
+        loads held over all of them. To vary the loads within a frame, drive
+        single steps from a :class:`core.clock.FixedStepClock` instead.
         """
         if self.is_destroyed:
-            return
-
-        load = physics.seismic_force(self.M, self.influence, ground_acceleration)
+            return 0
+        if delta_time is None:
+            steps = 1
+        else:
+            self._pending_time += delta_time
+            steps = int(self._pending_time / self.dt + 1e-9)
+            self._pending_time = max(0.0, self._pending_time - steps * self.dt)
+        if not steps:
+            return 0
+
+        load = self._load
+        np.multiply(self._seismic_pattern, ground_acceleration, out=load)
         floor_load = None
         if wind_force is not None:
             floor_load = np.asarray(wind_force, dtype=float)
@@ -185,45 +301,54 @@ class Building:
             flood = np.asarray(flood_force, dtype=float)
             floor_load = flood if floor_load is None else floor_load + flood
         if floor_load is not None:
-            load = load + physics.structural_force_to_ssi(floor_load, self.height_of_floor)
-
-        self.q, self.qd, self.qdd = self.integrator.step(self.q, self.qd, self.qdd, load)
-
-        if self.collapse.update(self.q[:self.n]):
-            self.K[:self.n, :self.n] = self.collapse.stiffness_matrix()
-            self.integrator.update_system(K=self.K)
+            load += physics.structural_force_to_ssi(floor_load, self.height_of_floor)
+
+        for taken in range(1, steps + 1):
+            self._step(load)
+            if self.is_destroyed:
+                return taken
+        return steps
+
+    def _step(self, load):
+        """One model step under the assembled load vector."""
+        np.copyto(self.q_previous, self.q)
+        self.integrator.step_inplace(self.q, self.qd, self.qdd, load)
+
+        # With story hysteresis the integrator already carries the yielding,
+        # so the collapse model only tracks failure.
+        if self.collapse.update(self.q[:self.n]) and self.hysteresis is None:
+            # Hinges are low-rank stiffness changes: patch K and the
+            # integrator's factorisation rather than rebuilding either.
+            U, D = self.collapse.stiffness_update()
+            if self.uses_banded_storage:
+                self.K = self.K.with_core(self.collapse.stiffness_matrix())
+            else:
+                self.K[:self.n, :self.n] += U @ D @ U.T
+            U_ssi = np.zeros((self.ndof, U.shape[1]))
+            U_ssi[:self.n] = U
+            self.integrator.update_stiffness(self.K, U_ssi, D)
         if self.collapse.is_collapsed:
             self.is_destroyed = True
 
     # -- Response readouts (for rendering & UI) -----------------------------
 
-    def floor_displacements(self):
-        """Absolute lateral displacement of each floor relative to ground (m).
-
-        ``x_i = u_f + theta_f * z_i + v_i`` -- foundation sway, rocking, and
-        structural distortion combined.
-        """
-        v = self.q[:self.n]
-        u_f = self.q[self.n]
-        theta_f = self.q[self.n + 1]
-        return u_f + theta_f * self.height_of_floor + v
-
     @property
-    def base_sway(self):
-        """Foundation horizontal displacement (m)."""
-        return float(self.q[self.n])
-
-    @property
-    def current_drift_ratios(self):
-        return physics.story_drifts(self.q[:self.n], self.story_height)
+    def base_shear(self):
+        """Shear carried by the first story (N)."""
+        if self.hysteresis is not None:
+            return float(self.integrator.story_shears[0])
+        return float((self.K @ self.q)[:self.n].sum())
 
     @property
-    def max_drift_ratio(self):
-        return float(np.max(np.abs(self.current_drift_ratios))) if self.n else 0.0
+    def failed_stories(self):
+        """``(N,)`` mask of the stories that have failed (hinged)."""
+        return self.collapse.failed
 
-    @property
-    def num_failed_stories(self):
-        return int(np.count_nonzero(self.collapse.failed))
+    def snapshot(self, sim_time=0.0, loads=None):
+        """A :class:`BuildingSnapshot` of the current response at simulated ``sim_time``."""
+        return BuildingSnapshot(self, float(sim_time), _frozen_copy(self.q),
+                                _frozen_copy(self.q_previous), _frozen_copy(self.failed_stories),
+                                self.is_destroyed, time.perf_counter(), loads)
 
     @property
     def angular_displacement_rad(self):
@@ -242,6 +367,9 @@ class Building:
 
     def generate_fragments(self, base_x_m, building_base_y_m, initial_lean_angle_rad):
         """Generate BuildingFragment objects when the building collapses."""
+        # Imported here so the model itself stays usable without pygame.
+        from graphics.renderer import BuildingFragment
+
         fragments = []
         num_fragments_per_story_width = 2
         fragment_width_m = self.footprint_length / num_fragments_per_story_width
@@ -287,3 +415,154 @@ class Building:
 
                 fragments.append(BuildingFragment(points_m, fragment_color, vel_x_mps, vel_y_mps, angular_vel_rad_s))
         return fragments
+
+
+def _frozen_copy(array):
+    copy = np.array(array)
+    copy.flags.writeable = False
+    return copy
+
+
+@dataclass(frozen=True)
+class BuildingSnapshot(_ResponseReadouts):
+    """Read-only copy of a building's response at one instant.
+
+    Made by :meth:`Building.snapshot` for readers on another thread (see
+    :class:`core.worker.PhysicsWorker`). The arrays are write-protected copies,
+    so a snapshot never changes once taken and can be read without locking.
+    ``building`` is the source, kept for its geometry, which does not change
+    while it is stepped; ``wall_time`` is the ``time.perf_counter()`` reading
+    when the snapshot was taken. ``loads`` is an immutable record of the
+    load source's own state at the same step, if the publisher has one (see
+    :class:`core.worker.PhysicsWorker`).
+    """
+
+    building: Building
+    sim_time: float
+    q: np.ndarray
+    q_previous: np.ndarray
+    failed_stories: np.ndarray
+    is_destroyed: bool
+    wall_time: float
+    loads: object = None
+
+    @property
+    def n(self):
+        return self.building.n
+
+    @property
+    def story_height(self):
+        return self.building.story_height
+
+    @property
+    def height_of_floor(self):
+        return self.building.height_of_floor
+
+
+class BuildingBatch:
+    """Many :class:`Building` variants with equal DOF counts stepped together.
+
+    Stacks the variants' SSI systems into one
+    :class:`physics.BatchNewmarkIntegrator` and their collapse models into one
+    :class:`physics.BatchProgressiveCollapse`, so a parameter sweep advances
+    every building per step with a few vectorised calls rather than one
+    ``update_physics`` loop per building. The batch keeps its own ``(B, ndof)``
+    state; the member buildings' own state is left untouched.
+    """
+
+    def __init__(self, buildings):
+        self.buildings = list(buildings)
+        if not self.buildings:
+            raise ValueError("BuildingBatch needs at least one building")
+        first = self.buildings[0]
+        if any(b.ndof != first.ndof for b in self.buildings):
+            raise ValueError("all buildings in a batch must have the same number of DOFs")
+        if any(b.dt != first.dt for b in self.buildings):
+            raise ValueError("all buildings in a batch must share the model time step")
+        if any(b.hysteresis is not None for b in self.buildings):
+            raise ValueError("hysteretic buildings cannot be batched; step them one by one")
+        if any(b.uses_banded_storage != first.uses_banded_storage for b in self.buildings):
+            raise ValueError("all buildings in a batch must use the same (dense or banded) storage")
+
+        self.n = first.n
+        self.ndof = first.ndof
+        self.dt = first.dt
+        self.integrator = physics.BatchNewmarkIntegrator(
+            [b.M for b in self.buildings], [b.C for b in self.buildings],
+            [b.K for b in self.buildings], self.dt)
+        self.collapse = physics.BatchProgressiveCollapse(b.collapse for b in self.buildings)
+        self.height_of_floor = np.stack([b.height_of_floor for b in self.buildings])
+
+        shape = (len(self.buildings), self.ndof)
+        self.q = np.zeros(shape)
+        self.qd = np.zeros(shape)
+        self.qdd = np.zeros(shape)
+        self._seismic_pattern = np.stack([b._seismic_pattern for b in self.buildings])
+        self._load = np.zeros(shape)
+        # Starting stiffness and failure flags, for reset().
+        self._K0 = list(self.integrator.K) if self.integrator.banded else self.integrator.K.copy()
+        self._failed0 = self.collapse.failed.copy()
+        self._collapsed0 = self.collapse.is_collapsed.copy()
+
+    def __len__(self):
+        return len(self.buildings)
+
+    @property
+    def is_destroyed(self):
+        """``(B,)`` mask of buildings that have collapsed."""
+        return self.collapse.is_collapsed
+
+    def reset(self):
+        """Put every building back at rest in its starting condition.
+
+        Only the systems whose stories failed are refactorised, so a batch can
+        be reused for many runs at the cost of a state reset rather than a
+        rebuild.
+        """
+        changed = np.flatnonzero((self.collapse.failed != self._failed0).any(axis=1))
+        if changed.size:
+            self.integrator.update_system(changed, K=[self._K0[i] for i in changed])
+        self.collapse.failed[:] = self._failed0
+        self.collapse.is_collapsed[:] = self._collapsed0
+        self.q.fill(0.0)
+        self.qd.fill(0.0)
+        self.qdd.fill(0.0)
+
+    def update_physics(self, ground_acceleration=0.0, floor_force=None):
+        """Advance every building one model step.
+
+        ``ground_acceleration`` is a scalar or per-building ``(B,)`` base input
+        (m/s^2); ``floor_force`` is an optional per-floor force, ``(N,)`` shared
+        or ``(B, N)`` per building. Collapsed buildings are frozen.
+        """
+        load = self._load
+        a_g = np.asarray(ground_acceleration, dtype=float)
+        np.multiply(self._seismic_pattern, a_g[..., None] if a_g.ndim else a_g, out=load)
+        if floor_force is not None:
+            load += physics.structural_force_to_ssi(floor_force, self.height_of_floor)
+
+        active = ~self.collapse.is_collapsed
+        self.integrator.step_inplace(self.q, self.qd, self.qdd, load, active=active)
+
+        changed = np.flatnonzero(self.collapse.update(self.q[:, :self.n]) & active)
+        if changed.size:
+            softened = self.collapse.stiffness_matrices(changed)
+            if self.integrator.banded:
+                K = [self.integrator.K[i].with_core(core) for i, core in zip(changed, softened)]
+            else:
+                K = self.integrator.K[changed]
+                K[:, :self.n, :self.n] = softened
+            self.integrator.update_system(changed, K=K)
+
+    def floor_displacements(self):
+        """``(B, N)`` absolute floor displacements relative to ground (m)."""
+        v = self.q[:, :self.n]
+        u_f = self.q[:, self.n, None]
+        theta_f = self.q[:, self.n + 1, None]
+        return u_f + theta_f * self.height_of_floor + v
+
+    @property
+    def max_drift_ratios(self):
+        """``(B,)`` peak absolute story drift ratio of each building right now."""
+        drifts = physics.story_drifts(self.q[:, :self.n], self.collapse.story_height[:, None])
+        return np.abs(drifts).max(axis=1)
@@ -0,0 +1,76 @@
+"""Fixed-step simulation clock for the interactive loop.
+
+The integrators stay factorised for one fixed model step, but frames take
+however long they take. :class:`FixedStepClock` accumulates frame time
+(optionally scaled, e.g. 10x faster than real time) and hands out whole
+model steps, so the physics and the loads driving it advance on the same
+simulated clock whatever the frame rate. Work per frame is capped so a long
+stall cannot snowball into ever longer catch-up frames; the time beyond the
+cap is dropped rather than simulated. The leftover fraction of a step is
+exposed as :attr:`FixedStepClock.alpha` for interpolating what is drawn
+between the last two states.
+"""
+
+
+class FixedStepClock:
+    """Turns variable frame times into a whole number of fixed model steps.
+
+    ``step`` is the model time step (s). ``time_scale`` multiplies the frame
+    time (2.0 runs twice as fast as real time, 0 pauses). ``max_frame_time``
+    caps the wall-clock time a single frame may catch up on (s).
+    """
+
+    def __init__(self, step, time_scale=1.0, max_frame_time=0.25):
+        self.step = float(step)
+        self.time_scale = float(time_scale)
+        self.max_frame_time = float(max_frame_time)
+        self.steps_taken = 0
+        self.dropped_time = 0.0     # wall-clock time skipped by the cap (s)
+        self._accumulator = 0.0
+
+    @property
+    def time(self):
+        """Simulated time at the end of the last step handed out (s)."""
+        return self.steps_taken * self.step
+
+    @property
+    def alpha(self):
+        """How far (0..1) the clock is between the last step and the next."""
+        return min(1.0, self._accumulator / self.step)
+
+    def reset(self):
+        """Back to ``t = 0`` with nothing pending (e.g. on a rebuild)."""
+        self.steps_taken = 0
+        self.dropped_time = 0.0
+        self._accumulator = 0.0
+
+    def advance(self, frame_time):
+        """Add one frame's wall-clock time; returns how many steps are now due.
+
+        The caller runs exactly that many model steps; :attr:`time` already
+        counts them.
+        """
+        steps = self._due(frame_time)
+        self.steps_taken += steps
+        return steps
+
+    def steps(self, frame_time):
+        """Yield the simulated time at the end of each step due this frame.
+
+        Each step is counted as it is handed out, so a caller that stops
+        early (say, once the building has collapsed) leaves :attr:`time` at
+        the last step it took; the steps it did not take are dropped.
+        """
+        for _ in range(self._due(frame_time)):
+            self.steps_taken += 1
+            yield self.steps_taken * self.step
+
+    def _due(self, frame_time):
+        if frame_time > self.max_frame_time:
+            self.dropped_time += frame_time - self.max_frame_time
+            frame_time = self.max_frame_time
+        self._accumulator += frame_time * self.time_scale
+        # The tolerance keeps a frame of exactly one step from rounding down.
+        steps = int(self._accumulator / self.step + 1e-9)
+        self._accumulator = max(0.0, self._accumulator - steps * self.step)
+        return steps
@@ -0,0 +1,134 @@
+"""Monte Carlo seismic fragility curves.
+
+A fragility curve gives, for each ground-motion intensity (here the peak
+ground acceleration), the probability that a building collapses or exceeds
+a given inter-story drift. :func:`fragility_analysis` estimates these curves
+from many :class:`physics.SyntheticGroundMotion` records per PGA level.
+
+The runs are spread over a process pool. Each worker process builds the
+building once, keeps it as a :class:`BuildingBatch` of ``chunk_size``
+copies, and steps a whole chunk of records together, resetting the batch
+between chunks. Record ``s`` of every PGA level uses the ``s``-th
+independent stream spawned from ``seed``. A run's outcome therefore depends
+only on its (level, record) pair, never on the number of workers or on how
+the runs were chunked. Sharing the streams across levels also means each
+record is the same motion scaled up (as in incremental dynamic analysis),
+which keeps the curves smooth.
+
+On platforms that spawn worker processes (Windows, macOS), call
+:func:`fragility_analysis` from under an ``if __name__ == "__main__":`` guard.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from core import physics
+from core.building_structure import Building, BuildingBatch
+
+DEFAULT_DRIFT_THRESHOLDS = (0.005, 0.01, 0.02, 0.04)
+
+
+@dataclass
+class FragilityResult:
+    """Outcome of every run of a :func:`fragility_analysis`.
+
+    ``peak_drifts`` and ``collapsed`` have one row per PGA level and one column
+    per record. A collapsed run counts as exceeding every drift threshold.
+    """
+
+    pga_levels: np.ndarray          # (P,) g
+    drift_thresholds: np.ndarray    # (D,) drift ratios
+    peak_drifts: np.ndarray         # (P, S) peak inter-story drift ratio of each run
+    collapsed: np.ndarray           # (P, S) bool
+
+    @property
+    def num_records(self):
+        return self.peak_drifts.shape[1]
+
+    @property
+    def collapse_probability(self):
+        """``(P,)`` fraction of runs at each level that collapsed."""
+        return self.collapsed.mean(axis=1)
+
+    @property
+    def exceedance_probability(self):
+        """``(P, D)`` fraction of runs at each level exceeding each drift threshold."""
+        exceeded = self.peak_drifts[:, :, None] >= self.drift_thresholds
+        return (exceeded | self.collapsed[:, :, None]).mean(axis=1)
+
+
+# Per-process state: the worker's reusable batch, set up by _init_worker.
+_worker_batch = None
+
+
+def _init_worker(building_config, chunk_size):
+    global _worker_batch
+    building = Building(**building_config)
+    _worker_batch = BuildingBatch([building] * chunk_size)
+
+
+def _run_chunk(pga_g, seeds, duration, motion_options):
+    """Peak drifts and collapse flags of one chunk of records at one PGA level."""
+    batch = _worker_batch
+    batch.reset()
+    num_steps = int(math.floor(duration / batch.dt + 1e-9))
+    times = np.arange(num_steps + 1) * batch.dt
+    accels = np.zeros((num_steps + 1, len(batch)))
+    for j, seed in enumerate(seeds):
+        motion = physics.SyntheticGroundMotion(pga_g, duration=duration, seed=seed,
+                                               **motion_options)
+        accels[:, j] = motion.at(times)
+
+    peak = np.zeros(len(batch))
+    for i in range(1, num_steps + 1):
+        batch.update_physics(accels[i])
+        np.maximum(peak, batch.max_drift_ratios, out=peak)
+        if batch.is_destroyed[:len(seeds)].all():
+            break
+    return peak[:len(seeds)], batch.is_destroyed[:len(seeds)].copy()
+
+
+def fragility_analysis(building_config, pga_levels, num_records,
+                       drift_thresholds=DEFAULT_DRIFT_THRESHOLDS, duration=20.0,
+                       seed=0, max_workers=None, chunk_size=16, motion_options=None):
+    """Estimate collapse and drift-exceedance fragility curves.
+
+    ``building_config`` is a dict of :class:`Building` keyword arguments
+    (e.g. ``dict(num_stories=20, primary_material=STEEL)``), so workers can
+    rebuild the model cheaply. Each of the ``pga_levels`` (g) is run against
+    ``num_records`` synthetic motions of ``duration`` seconds.
+    ``motion_options`` are extra :class:`physics.SyntheticGroundMotion`
+    arguments such as ``f_g``. ``max_workers=1`` runs in this process without
+    a pool; ``None`` uses one worker per CPU.
+    """
+    building_config = dict(building_config)
+    pga_levels = np.atleast_1d(np.asarray(pga_levels, dtype=float))
+    motion_options = dict(motion_options or {})
+    streams = np.random.SeedSequence(seed).spawn(num_records)
+    chunk_size = max(1, min(int(chunk_size), num_records))
+
+    tasks = [(p, start) for p in range(len(pga_levels))
+             for start in range(0, num_records, chunk_size)]
+    args = ([pga_levels[p] for p, _ in tasks],
+            [streams[start:start + chunk_size] for _, start in tasks],
+            [duration] * len(tasks),
+            [motion_options] * len(tasks))
+
+    if max_workers == 1:
+        _init_worker(building_config, chunk_size)
+        outcomes = list(map(_run_chunk, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(building_config, chunk_size)) as pool:
+            outcomes = list(pool.map(_run_chunk, *args))
+
+    peak_drifts = np.zeros((len(pga_levels), num_records))
+    collapsed = np.zeros((len(pga_levels), num_records), dtype=bool)
+    for (p, start), (peak, destroyed) in zip(tasks, outcomes):
+        peak_drifts[p, start:start + len(peak)] = peak
+        collapsed[p, start:start + len(peak)] = destroyed
+    return FragilityResult(pga_levels, np.asarray(drift_thresholds, dtype=float),
+                           peak_drifts, collapsed)
@@ -13,18 +13,33 @@ degree of freedom per floor. The equation of motion is
 
 where ``u`` is the vector of floor displacements relative to the ground.
 
-Build status (see the improvement roadmap): this file is being grown one
-milestone at a time, each backed by tests in ``tests/test_physics.py``.
-
-  * Step 1 (this commit): section sizing, lumped floor masses, and the shear
-    stiffness matrix, plus the pure linear-algebra assembly helpers.
-
-Later steps add flexural behaviour, modal analysis, Rayleigh damping, the
-Newmark-beta integrator, soil-structure interaction, loads, and progressive
-collapse.
+Each story is a Timoshenko element, so the stack bends as well as racks, and
+two foundation DOFs (sway and rocking on soil springs) complete the
+soil-structure system. The sections below follow the order a model is built
+and run in:
+
+  * section sizing, floor masses and story stiffness, in dense or banded
+    (block-tridiagonal, O(N)) storage for tall stacks;
+  * modal analysis (full, or subspace iteration for the lowest modes) and
+    Rayleigh damping;
+  * time integration: Newmark-beta for one building or a batch of them,
+    story hysteresis (bilinear / Bouc-Wen) with Newton iterations, and
+    truncated mode superposition;
+  * soil-structure interaction;
+  * loads: wind, ground motion (harmonic, synthetic and recorded
+    accelerograms, with response spectra) and flood;
+  * progressive collapse of stories past their drift capacity.
+
+Tests live in ``tests/test_physics.py`` (recorded accelerograms in
+``tests/test_records.py``).
 """
 
+import functools
+import inspect
 import math
+import re
+import warnings
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
 
 import numpy as np
@@ -39,6 +54,72 @@ DEFAULT_BAY_SPACING_M = 6.0      # typical column grid spacing
 DEFAULT_SLAB_THICKNESS_M = 0.15  # equivalent solid floor-slab thickness
 DEFAULT_LIVE_LOAD_KG_PER_M2 = 200.0  # ~2 kPa service live load mass allowance
 MIN_COLUMN_AREA_M2 = 0.09        # 300 mm x 300 mm minimum practical column
+BANDED_MIN_STORIES = 40          # auto-switch to banded storage from this height
+
+
+# ---------------------------------------------------------------------------
+# Per-build assembly context
+# ---------------------------------------------------------------------------
+#
+# Assembling a model derives the same quantities again and again: the floor
+# masses feed the column sizing, which feeds both the shear and the flexural
+# rigidity, and the SSI assembly, the collapse model and the building itself
+# all ask for the masses, heights and stiffness once more. Inside an
+# :class:`AssemblyContext` each of those is computed once and shared.
+
+class AssemblyContext:
+    """Shares derived quantities between the physics functions during one build.
+
+    While the context is open, every function marked :func:`_shared` computes
+    its value for ``building`` once and hands out the cached result afterwards
+    (callers must not modify it in place). ``evaluations`` counts the real
+    computations per function. The building must not change while the context
+    is open; re-entering an open context is harmless, so a caller can wrap
+    ``build_model`` in its own context to inspect the counts.
+    """
+
+    def __init__(self, building):
+        self.building = building
+        self.values = {}
+        self.evaluations = Counter()
+        self._depth = 0
+
+    @classmethod
+    def of(cls, building):
+        """The context already open on ``building``, or a new one."""
+        context = getattr(building, "_assembly_context", None)
+        return context if context is not None else cls(building)
+
+    def __enter__(self):
+        self._depth += 1
+        self.building._assembly_context = self
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            self.building._assembly_context = None
+        return False
+
+
+def _shared(func):
+    """Compute ``func(building, ...)`` once per open :class:`AssemblyContext`."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(building, *args, **kwargs):
+        context = getattr(building, "_assembly_context", None)
+        if context is None:
+            return func(building, *args, **kwargs)
+        # Bind with defaults so f(b) and f(b, banded=False) share one entry.
+        bound = signature.bind(building, *args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__,) + tuple(bound.arguments.items())[1:]
+        if key not in context.values:
+            context.evaluations[func.__name__] += 1
+            context.values[key] = func(building, *args, **kwargs)
+        return context.values[key]
+    return wrapper
 
 
 # ---------------------------------------------------------------------------
@@ -63,6 +144,7 @@ def estimate_column_count(footprint_length, footprint_width, bay_spacing=DEFAULT
     return nx * ny
 
 
+@_shared
 def column_section(building):
     """Size a representative square column from the gravity load it carries.
 
@@ -92,6 +174,7 @@ def column_section(building):
 # Mass
 # ---------------------------------------------------------------------------
 
+@_shared
 def floor_masses(building):
     """Return the lumped translational mass of each floor (kg), length ``N``.
 
@@ -133,15 +216,15 @@ def _apply_mass_distribution(masses, distribution):
     """Rescale a uniform mass profile to honour the requested distribution.
 
     The total mass is preserved; only how it is shared between floors changes.
-    Imported lazily to avoid a hard dependency on the enum at module import.
+    The ``MassDistribution`` member is matched by name, so this module never
+    has to import the enum.
     """
-    from core.building_structure import MassDistribution
-
     n = len(masses)
-    if n <= 1 or distribution == MassDistribution.UNIFORM:
+    name = getattr(distribution, "name", None)
+    if n <= 1 or name == "UNIFORM":
         return masses
 
-    if distribution == MassDistribution.CONCENTRATED_TOP:
+    if name == "CONCENTRATED_TOP":
         total = float(np.sum(masses))
         # Linearly ramp weighting from the base (1.0) to the roof (2.0).
         weights = np.linspace(1.0, 2.0, n)
@@ -150,10 +233,498 @@ def _apply_mass_distribution(masses, distribution):
     return masses
 
 
+# ---------------------------------------------------------------------------
+# Banded storage for tall story stacks
+# ---------------------------------------------------------------------------
+#
+# A story only connects the floor below it to the floor above it, so every
+# matrix of the stack is block-tridiagonal in its floor nodes: the shear
+# building couples one lateral DOF per floor, the Timoshenko cantilever a
+# ``[v, theta]`` pair. Storing just the diagonal and sub-diagonal blocks keeps a
+# 2000-story model at O(N) memory, and block cyclic reduction factorises and
+# solves it in O(N) work using O(log N) vectorised numpy calls.
+#
+# The condensed Timoshenko stiffness ``Kvv - Kvr Krr^-1 Krv`` is *dense* (the
+# rotations couple every floor), so it is never formed: a :class:`BandedMatrix`
+# keeps the uncondensed blocks and applies the condensation implicitly in its
+# products and solves. The soil-structure system adds two foundation DOFs that
+# couple to every floor through the mass matrix; :class:`BorderedMatrix` carries
+# those as a dense border around the banded core.
+
+def _swap(a):
+    """Transpose the trailing two axes of a stack of blocks."""
+    return np.ascontiguousarray(np.swapaxes(a, -1, -2))
+
+
+class BlockTridiagonal:
+    """Symmetric block-tridiagonal matrix over ``m`` nodes of ``p`` DOFs each.
+
+    ``diag`` has shape ``(m, p, p)`` and ``lower`` ``(m - 1, p, p)``, where
+    ``lower[i]`` couples node ``i + 1`` to node ``i`` (the block above the
+    diagonal is its transpose). DOFs are numbered node by node.
+    """
+
+    def __init__(self, diag, lower):
+        self.diag = np.asarray(diag, dtype=float)
+        self.lower = np.asarray(lower, dtype=float)
+        self.num_nodes, self.block_size = self.diag.shape[0], self.diag.shape[1]
+        self._internal_factor = None
+
+    @property
+    def size(self):
+        return self.num_nodes * self.block_size
+
+    @property
+    def shape(self):
+        return (self.size, self.size)
+
+    def matvec(self, x):
+        """``A @ x`` for ``x`` of shape ``(size,)`` or ``(size, r)``."""
+        x = np.asarray(x, dtype=float)
+        X = x.reshape(self.num_nodes, self.block_size, -1)
+        Y = self.diag @ X
+        Y[1:] += self.lower @ X[:-1]
+        Y[:-1] += _swap(self.lower) @ X[1:]
+        return Y.reshape(x.shape)
+
+    def to_dense(self):
+        m, p = self.num_nodes, self.block_size
+        A = np.zeros((m, p, m, p))
+        idx = np.arange(m)
+        A[idx, :, idx, :] = self.diag
+        A[idx[1:], :, idx[:-1], :] = self.lower
+        A[idx[:-1], :, idx[1:], :] = _swap(self.lower)
+        return A.reshape(m * p, m * p)
+
+    def factor(self):
+        """Cyclic-reduction factorisation; see :class:`BlockTridiagonalFactor`."""
+        return BlockTridiagonalFactor(self)
+
+    # -- Static condensation of the internal DOFs ---------------------------
+    #
+    # DOF 0 of every node is the retained lateral displacement; DOFs 1..p-1
+    # (floor rotations) are condensed out. With p == 1 there is nothing to
+    # condense and these reduce to the plain matrix.
+
+    def _internal(self):
+        """Factor of ``Krr``, the internal-DOF block (cached)."""
+        if self._internal_factor is None:
+            self._internal_factor = BlockTridiagonal(
+                self.diag[:, 1:, 1:], self.lower[:, 1:, 1:]).factor()
+        return self._internal_factor
+
+    def condensed_matvec(self, x):
+        """``(Kvv - Kvr Krr^-1 Krv) @ x`` without forming the condensed matrix."""
+        x = np.asarray(x, dtype=float)
+        if self.block_size == 1:
+            return self.matvec(x)
+        m, p = self.num_nodes, self.block_size
+        X = np.zeros((m, p) + x.shape[1:])
+        X[:, 0] = x
+        krv_x = self.matvec(X.reshape(m * p, -1)).reshape(X.shape)[:, 1:]
+        X[:, 1:] = -self._internal().solve(krv_x.reshape(m * (p - 1), -1)).reshape(krv_x.shape)
+        return self.matvec(X.reshape(m * p, -1)).reshape(X.shape)[:, 0]
+
+    def condensed_dense(self):
+        """The dense ``N x N`` condensed matrix (O(N^2); for eigen-analysis)."""
+        return self.condensed_matvec(np.eye(self.num_nodes))
+
+
+class BlockTridiagonalFactor:
+    """Block cyclic reduction of an SPD :class:`BlockTridiagonal` matrix.
+
+    Each level eliminates the odd-numbered nodes, leaving a block-tridiagonal
+    system on the even ones with half as many nodes; after ``log2(m)`` levels a
+    single block remains. This is Cholesky elimination in odd-even order, so it
+    is stable for SPD matrices, and every level is a handful of batched
+    ``(k, p, p)`` products rather than a Python loop over the floors.
+    """
+
+    def __init__(self, matrix):
+        self.num_nodes, self.block_size = matrix.num_nodes, matrix.block_size
+        D, B = matrix.diag, matrix.lower
+        self._levels = []
+        while D.shape[0] > 1:
+            m = D.shape[0]
+            odd_inv = np.linalg.inv(D[1::2])
+            k = odd_inv.shape[0]
+            left = B[0::2][:k]      # A[j, j-1] for odd j
+            right = B[1::2]         # A[j+1, j] for odd j with an even node above
+            kr = right.shape[0]
+            gl = odd_inv @ left
+            gr = odd_inv[:kr] @ _swap(right)
+            D_even = D[0::2].copy()
+            D_even[:k] -= _swap(left) @ gl
+            D_even[1:kr + 1] -= right @ gr
+            B = -(right @ gl[:kr])
+            D = D_even
+            self._levels.append((m, odd_inv, gl, gr, _swap(gl), _swap(gr)))
+        self._root_inv = np.linalg.inv(D[0])
+
+    def solve(self, b):
+        """Solve ``A x = b`` for ``b`` of shape ``(size,)`` or ``(size, r)``."""
+        b = np.asarray(b, dtype=float)
+        F = b.reshape(self.num_nodes, self.block_size, -1)
+        partial = []
+        for m, odd_inv, gl, gr, gl_t, gr_t in self._levels:
+            f_odd = F[1::2]
+            kr = gr.shape[0]
+            f_even = F[0::2].copy()
+            f_even[:f_odd.shape[0]] -= gl_t @ f_odd
+            f_even[1:kr + 1] -= gr_t @ f_odd[:kr]
+            partial.append(odd_inv @ f_odd)
+            F = f_even
+        X = self._root_inv @ F
+        for (m, odd_inv, gl, gr, _gl_t, _gr_t), y in zip(reversed(self._levels), reversed(partial)):
+            kr = gr.shape[0]
+            x = np.empty((m,) + X.shape[1:])
+            x[0::2] = X
+            x_odd = y - gl @ X[:y.shape[0]]
+            x_odd[:kr] -= gr @ X[1:kr + 1]
+            x[1::2] = x_odd
+            X = x
+        return X.reshape(b.shape)
+
+
+class _StructuredMatrix:
+    """Arithmetic shared by the banded matrix types.
+
+    They support exactly what the dynamics code does with ``M``, ``C`` and
+    ``K``: scaling, adding, ``@`` with a vector, ``shape``, ``to_dense`` and
+    ``factor().solve``. Setting ``__array_ufunc__`` to None makes numpy defer to
+    these operators instead of broadcasting the object.
+    """
+
+    __array_ufunc__ = None
+
+    def __rmul__(self, scalar):
+        return self * scalar
+
+    def __radd__(self, other):
+        return self + other
+
+    def __matmul__(self, x):
+        return self.matvec(x)
+
+
+class BandedMatrix(_StructuredMatrix):
+    """Symmetric ``N x N`` floor matrix ``sum_k s_k * condense(K_k) + diag(d)``.
+
+    Each term is a :class:`BlockTridiagonal` over the ``N`` floor nodes whose
+    internal DOFs (rotations) are statically condensed; ``diagonal`` holds a
+    lumped contribution such as floor masses. Mass, Rayleigh damping, and the
+    Newmark effective stiffness of a story stack are all of this form.
+    """
+
+    def __init__(self, terms=(), diagonal=None, size=None):
+        merged = []
+        for scale, blocks in terms:
+            for i, (s, b) in enumerate(merged):
+                if b is blocks:
+                    merged[i] = (s + scale, b)
+                    break
+            else:
+                merged.append((float(scale), blocks))
+        self.terms = tuple((s, b) for s, b in merged if s != 0.0)
+        if size is None:
+            size = len(diagonal) if diagonal is not None else merged[0][1].num_nodes
+        self.diagonal = np.zeros(size) if diagonal is None else np.asarray(diagonal, dtype=float)
+        self._factor = None
+
+    @property
+    def shape(self):
+        n = len(self.diagonal)
+        return (n, n)
+
+    def __mul__(self, scalar):
+        return BandedMatrix([(scalar * s, b) for s, b in self.terms],
+                            scalar * self.diagonal)
+
+    def __add__(self, other):
+        if not isinstance(other, BandedMatrix):
+            return NotImplemented
+        return BandedMatrix(self.terms + other.terms, self.diagonal + other.diagonal)
+
+    def matvec(self, x):
+        x = np.asarray(x, dtype=float)
+        d = self.diagonal if x.ndim == 1 else self.diagonal[:, None]
+        y = d * x
+        for scale, blocks in self.terms:
+            y += scale * blocks.condensed_matvec(x)
+        return y
+
+    def to_dense(self):
+        A = np.diag(self.diagonal)
+        for scale, blocks in self.terms:
+            A += scale * blocks.condensed_dense()
+        return 0.5 * (A + A.T)
+
+    def factor(self):
+        """Factorise once (cached); the result has ``solve(b)``."""
+        if self._factor is None:
+            self._factor = _BandedFactor(self)
+        return self._factor
+
+
+class _BandedFactor:
+    """Solver for a :class:`BandedMatrix` via its uncondensed block system.
+
+    Condensation commutes with solving: ``K_c x = b`` is the lateral part of
+    ``K [x; theta] = [b; 0]``. Several terms are merged into one block system by
+    giving each term its own copy of the internal DOFs, so the node block grows
+    to ``1 + sum_k (p_k - 1)`` while staying tridiagonal.
+    """
+
+    def __init__(self, matrix):
+        self.n = len(matrix.diagonal)
+        if not matrix.terms:
+            self._inv_diag = 1.0 / matrix.diagonal
+            return
+        self._inv_diag = None
+        extra = [b.block_size - 1 for _, b in matrix.terms]
+        p = 1 + sum(extra)
+        diag = np.zeros((self.n, p, p))
+        lower = np.zeros((self.n - 1, p, p))
+        diag[:, 0, 0] = matrix.diagonal
+        offset = 1
+        for (scale, blocks), q in zip(matrix.terms, extra):
+            sl = slice(offset, offset + q)
+            for dst, src in ((diag, blocks.diag), (lower, blocks.lower)):
+                dst[:, 0, 0] += scale * src[:, 0, 0]
+                dst[:, 0, sl] = scale * src[:, 0, 1:]
+                dst[:, sl, 0] = scale * src[:, 1:, 0]
+                dst[:, sl, sl] = scale * src[:, 1:, 1:]
+            offset += q
+        self.block_size = p
+        self._factor = BlockTridiagonal(diag, lower).factor()
+
+    def solve(self, b):
+        b = np.asarray(b, dtype=float)
+        if self._inv_diag is not None:
+            return b * (self._inv_diag if b.ndim == 1 else self._inv_diag[:, None])
+        rhs = np.zeros((self.n, self.block_size) + b.shape[1:])
+        rhs[:, 0] = b
+        x = self._factor.solve(rhs.reshape(self.n * self.block_size, -1))
+        return x.reshape(rhs.shape)[:, 0].reshape(b.shape)
+
+
+class BorderedMatrix(_StructuredMatrix):
+    """``[[A, B], [B^T, E]]``: a banded core plus a dense border.
+
+    The core is a :class:`BandedMatrix` or a :class:`BlockTridiagonal`;
+    ``border`` (``N x r``) couples the core to ``r`` extra DOFs and ``corner``
+    (``r x r``) is their own block; for the soil-structure system ``r = 2``
+    (foundation sway and rocking). Solves use the Schur complement on the
+    border, so they stay O(N).
+    """
+
+    def __init__(self, core, border, corner):
+        self.core = core
+        self.border = np.asarray(border, dtype=float)
+        self.corner = np.array(corner, dtype=float)
+        self._factor = None
+
+    @property
+    def shape(self):
+        n = self.core.shape[0] + self.corner.shape[0]
+        return (n, n)
+
+    def with_core(self, core):
+        """A copy with the core replaced (e.g. by a softened stiffness)."""
+        return BorderedMatrix(core, self.border, self.corner)
+
+    def __mul__(self, scalar):
+        return BorderedMatrix(self.core * scalar, scalar * self.border, scalar * self.corner)
+
+    def __add__(self, other):
+        if not isinstance(other, BorderedMatrix):
+            return NotImplemented
+        return BorderedMatrix(self.core + other.core, self.border + other.border,
+                              self.corner + other.corner)
+
+    def matvec(self, x):
+        x = np.asarray(x, dtype=float)
+        n = self.core.shape[0]
+        y = np.empty_like(x)
+        y[:n] = self.core.matvec(x[:n]) + self.border @ x[n:]
+        y[n:] = self.border.T @ x[:n] + self.corner @ x[n:]
+        return y
+
+    def to_dense(self):
+        return np.block([[self.core.to_dense(), self.border],
+                         [self.border.T, self.corner]])
+
+    def factor(self):
+        """Factorise once (cached); the result has ``solve(b)``."""
+        if self._factor is None:
+            self._factor = _BorderedFactor(self)
+        return self._factor
+
+
+class _BorderedFactor:
+    """Schur-complement solver for a :class:`BorderedMatrix`."""
+
+    def __init__(self, matrix):
+        self.n = matrix.core.shape[0]
+        self.border = matrix.border
+        self.core = matrix.core.factor()
+        self.Z = self.core.solve(matrix.border)
+        self.S_inv = np.linalg.inv(matrix.corner - matrix.border.T @ self.Z)
+
+    def solve(self, b):
+        b = np.asarray(b, dtype=float)
+        n = self.n
+        y = self.core.solve(b[:n])
+        x2 = self.S_inv @ (b[n:] - self.border.T @ y)
+        return np.concatenate([y - self.Z @ x2, x2])
+
+
+def _as_matrix(A):
+    """Pass banded matrices through; coerce anything else to a dense array."""
+    if isinstance(A, _StructuredMatrix):
+        return A
+    return np.asarray(A, dtype=float)
+
+
+def _dense(A):
+    """A dense ``ndarray`` view of a dense or banded matrix."""
+    if isinstance(A, _StructuredMatrix):
+        return A.to_dense()
+    return np.asarray(A, dtype=float)
+
+
+class CholeskyFactor:
+    """Cholesky factorisation ``A = L L^T`` of a dense SPD matrix (or a stack).
+
+    Factorising fails loudly if ``A`` is not positive definite. :meth:`solve`
+    runs the forward (``L y = b``) and back (``L^T x = y``) substitutions
+    over blocks of ``block_size`` rows: each block subtracts the product of
+    its off-diagonal rows with the part of the solution already found, then
+    applies its own small triangular diagonal block, which is inverted once
+    here. Only those blocks are inverted, never ``L`` or ``A``.
+
+    ``A`` may carry leading batch axes (``(B, n, n)``), in which case every
+    system is solved at once and :meth:`refactor` refreshes a subset of them.
+    Scratch space is kept between solves, so solving into a caller-owned
+    ``out`` buffer allocates nothing.
+    """
+
+    block_size = 16
+
+    def __init__(self, A):
+        self.L = np.linalg.cholesky(np.asarray(A, dtype=float))
+        n = self.L.shape[-1]
+        self._blocks = [slice(i, min(i + self.block_size, n)) for i in range(0, n, self.block_size)]
+        self._LT = _swap(self.L)
+        self._diag_inv = [np.linalg.inv(self.L[..., s, s]) for s in self._blocks]
+        self._diag_inv_t = [_swap(d) for d in self._diag_inv]
+        self._work_shape = self._work = None
+
+    def refactor(self, index, A):
+        """Refactorise the systems at ``index`` of a stack from their new matrices ``A``."""
+        L = np.linalg.cholesky(np.asarray(A, dtype=float))
+        self.L[index] = L
+        self._LT[index] = _swap(L)
+        for s, inv, inv_t in zip(self._blocks, self._diag_inv, self._diag_inv_t):
+            inv[index] = np.linalg.inv(L[..., s, s])
+            inv_t[index] = _swap(inv[index])
+
+    def _scratch(self, shape):
+        if shape != self._work_shape:
+            sizes = {s.stop - s.start for s in self._blocks}
+            self._work = {m: np.empty(shape[:-2] + (m, shape[-1])) for m in sizes}
+            self._work_shape = shape
+        return self._work
+
+    def solve(self, b, out=None):
+        """Solve ``A x = b``; ``b`` is ``(n,)`` or ``(n, r)``, or ``(B, n, r)`` for a stack."""
+        if out is None:
+            out = np.array(b, dtype=float)
+        elif out is not b:
+            out[...] = b
+        X = out.reshape(out.shape + (1,)) if out.ndim == self.L.ndim - 1 else out
+        work = self._scratch(X.shape)
+        L, LT, n = self.L, self._LT, self.L.shape[-1]
+        for s, inv in zip(self._blocks, self._diag_inv):
+            x, w = X[..., s, :], work[s.stop - s.start]
+            if s.start:
+                np.matmul(L[..., s, :s.start], X[..., :s.start, :], out=w)
+                x -= w
+            np.matmul(inv, x, out=w)
+            x[...] = w
+        for s, inv_t in zip(reversed(self._blocks), reversed(self._diag_inv_t)):
+            x, w = X[..., s, :], work[s.stop - s.start]
+            if s.stop < n:
+                np.matmul(LT[..., s, s.stop:], X[..., s.stop:, :], out=w)
+                x -= w
+            np.matmul(inv_t, x, out=w)
+            x[...] = w
+        return out
+
+
+class _LowRankUpdatedFactor:
+    """Solver for ``A + U D U^T`` given any factor of ``A`` (Woodbury identity).
+
+    With ``Z = A^-1 U``, ``(A + U D U^T)^-1 = A^-1 - Z (I + D U^T Z)^-1 D Z^T``,
+    so each solve is the base solve plus an O(n r) correction, and the
+    factor of ``A`` is never modified. The capacitance matrix
+    ``I + D U^T Z`` needs no inverse of ``D``, so a singular ``D`` is fine.
+    ``condition`` is ``(1 + |D U^T Z|) / sigma_min`` of the capacitance
+    matrix: large when the update cancels most of ``A`` along some direction
+    (``A + U D U^T`` is then near singular) and the correction loses digits.
+    ``rank`` counts the columns accumulated over nested updates.
+    """
+
+    def __init__(self, base, U, D):
+        self.base = base
+        self.U = np.asarray(U, dtype=float)
+        D = np.atleast_2d(np.asarray(D, dtype=float))
+        self.Z = base.solve(self.U)
+        DUZ = D @ (self.U.T @ self.Z)
+        capacitance = np.eye(len(D)) + DUZ
+        smallest = np.linalg.svd(capacitance, compute_uv=False)[-1]
+        self.condition = (1.0 + np.linalg.norm(DUZ, 2)) / smallest if smallest > 0.0 else np.inf
+        self.S = np.linalg.solve(capacitance, D) if np.isfinite(self.condition) else None
+        self.rank = self.U.shape[1] + getattr(base, "rank", 0)
+
+    def solve(self, b, out=None):
+        y = self.base.solve(b) if out is None else self.base.solve(b, out=out)
+        y -= self.Z @ (self.S @ (self.U.T @ y))
+        return y
+
+
+def _factorize(A):
+    """A factor with ``solve(b)`` for the SPD matrix ``A`` (dense or banded)."""
+    if isinstance(A, _StructuredMatrix):
+        return A.factor()
+    return CholeskyFactor(A)
+
+
+# Past this condition number of the Woodbury capacitance matrix a low-rank
+# update loses too many digits; refactorise instead.
+MAX_UPDATE_CONDITION = 1e8
+
+
+def _update_factor(factor, U, D, max_rank=None):
+    """Factor of ``A + U D U^T`` from a factor of ``A`` without refactorising.
+
+    Returns None if the update should not be kept -- the accumulated rank
+    would exceed ``max_rank`` or the capacitance matrix is ill-conditioned --
+    in which case the caller refactorises ``A + U D U^T`` instead.
+    """
+    if max_rank is not None and getattr(factor, "rank", 0) + U.shape[1] > max_rank:
+        return None
+    updated = _LowRankUpdatedFactor(factor, U, D)
+    if not updated.condition <= MAX_UPDATE_CONDITION:
+        return None
+    return updated
+
+
 # ---------------------------------------------------------------------------
 # Stiffness
 # ---------------------------------------------------------------------------
 
+@_shared
 def story_shear_stiffness(building):
     """Return the lateral (shear) stiffness of each story (N/m), length ``N``.
 
@@ -178,7 +749,7 @@ def assemble_mass_matrix(floor_mass_array):
     return np.diag(np.asarray(floor_mass_array, dtype=float))
 
 
-def assemble_shear_stiffness_matrix(story_stiffness_array):
+def assemble_shear_stiffness_matrix(story_stiffness_array, banded=False):
     """Tridiagonal shear-building stiffness matrix from per-story stiffnesses.
 
     ``story_stiffness_array[j]`` is the stiffness of story ``j`` connecting floor
@@ -188,17 +759,20 @@ def assemble_shear_stiffness_matrix(story_stiffness_array):
         K[j, j]   = k[j] + k[j+1]
         K[j, j+1] = K[j+1, j] = -k[j+1]
 
-    with ``k`` beyond the top floor taken as zero (free roof).
+    with ``k`` beyond the top floor taken as zero (free roof). ``banded=True``
+    returns a :class:`BandedMatrix` holding only the two diagonals.
     """
     k = np.asarray(story_stiffness_array, dtype=float)
     n = len(k)
-    K = np.zeros((n, n), dtype=float)
-    for j in range(n):
-        K[j, j] += k[j]
-        if j + 1 < n:
-            K[j, j] += k[j + 1]
-            K[j, j + 1] -= k[j + 1]
-            K[j + 1, j] -= k[j + 1]
+    main = k.copy()
+    main[:-1] += k[1:]
+    if banded:
+        blocks = BlockTridiagonal(main.reshape(n, 1, 1), -k[1:].reshape(n - 1, 1, 1))
+        return BandedMatrix([(1.0, blocks)])
+    K = np.diag(main)
+    idx = np.arange(n - 1)
+    K[idx, idx + 1] = -k[1:]
+    K[idx + 1, idx] = -k[1:]
     return K
 
 
@@ -224,54 +798,65 @@ def timoshenko_story_element(EI, GA_s, length):
     ``length`` the element length (m). The shear-deformation parameter
     ``phi = 12 EI / (GA_s L^2)`` blends the behaviour: ``phi -> 0`` gives the
     Euler-Bernoulli (pure bending) element, ``phi -> inf`` a pure shear spring.
+    Array arguments broadcast, giving a stack of elements of shape ``(..., 4, 4)``.
     """
-    L = length
+    EI, GA_s, L = np.broadcast_arrays(np.asarray(EI, dtype=float),
+                                      np.asarray(GA_s, dtype=float),
+                                      np.asarray(length, dtype=float))
     phi = 12.0 * EI / (GA_s * L * L)
     c = EI / ((1.0 + phi) * L ** 3)
     L2 = L * L
-    return c * np.array([
-        [12.0,        6.0 * L,          -12.0,       6.0 * L],
-        [6.0 * L,     (4.0 + phi) * L2, -6.0 * L,    (2.0 - phi) * L2],
-        [-12.0,       -6.0 * L,         12.0,        -6.0 * L],
-        [6.0 * L,     (2.0 - phi) * L2, -6.0 * L,    (4.0 + phi) * L2],
-    ])
+    one = np.ones_like(L)
+    ke = np.stack([
+        np.stack([12.0 * one,  6.0 * L,          -12.0 * one, 6.0 * L], axis=-1),
+        np.stack([6.0 * L,     (4.0 + phi) * L2, -6.0 * L,    (2.0 - phi) * L2], axis=-1),
+        np.stack([-12.0 * one, -6.0 * L,         12.0 * one,  -6.0 * L], axis=-1),
+        np.stack([6.0 * L,     (2.0 - phi) * L2, -6.0 * L,    (4.0 + phi) * L2], axis=-1),
+    ], axis=-2)
+    return c[..., None, None] * ke
+
+
+def shear_flexural_blocks(EI, GA_s, story_height, num_stories):
+    """Block-tridiagonal ``[v, theta]`` node stiffness of the fixed-base stack.
+
+    Element ``e`` joins floor ``e - 1`` to floor ``e``; its top-top block lands
+    on its own floor, its bottom-bottom block on the floor below (dropped for
+    the fixed base), and its top-bottom block is the coupling between them.
+    """
+    n = num_stories
+    EI = np.broadcast_to(np.asarray(EI, dtype=float), (n,))
+    GA_s = np.broadcast_to(np.asarray(GA_s, dtype=float), (n,))
+    h = np.broadcast_to(np.asarray(story_height, dtype=float), (n,))
+    ke = timoshenko_story_element(EI, GA_s, h)
+    diag = ke[:, 2:, 2:].copy()
+    diag[:-1] += ke[1:, :2, :2]
+    lower = ke[1:, 2:, :2]
+    return BlockTridiagonal(diag, lower)
 
 
-def assemble_shear_flexural_stiffness(EI, GA_s, story_height, num_stories):
+def assemble_shear_flexural_stiffness(EI, GA_s, story_height, num_stories, banded=False):
     """Lateral stiffness (N/m, ``N x N``) of a Timoshenko cantilever.
 
     ``EI`` and ``GA_s`` may be scalars (uniform over height) or length-``N``
     arrays (per story). The base is fixed; floor rotations are statically
     condensed out so the result is in terms of the ``N`` floor lateral
-    displacements only.
+    displacements only. The condensed matrix is dense, so ``banded=True``
+    instead returns a :class:`BandedMatrix` that keeps the uncondensed
+    ``[v, theta]`` blocks and condenses implicitly in O(N).
     """
-    n = num_stories
-    EI = np.broadcast_to(np.asarray(EI, dtype=float), (n,))
-    GA_s = np.broadcast_to(np.asarray(GA_s, dtype=float), (n,))
-    h = np.broadcast_to(np.asarray(story_height, dtype=float), (n,))
+    K = BandedMatrix([(1.0, shear_flexural_blocks(EI, GA_s, story_height, num_stories))])
+    return K if banded else K.to_dense()
 
-    # Global node DOFs: node 0 = base, nodes 1..N = floors; each node [v, theta].
-    ndof = 2 * (n + 1)
-    Kg = np.zeros((ndof, ndof), dtype=float)
-    for e in range(1, n + 1):  # element e connects node e-1 to node e
-        ke = timoshenko_story_element(EI[e - 1], GA_s[e - 1], h[e - 1])
-        dofs = [2 * (e - 1), 2 * (e - 1) + 1, 2 * e, 2 * e + 1]
-        Kg[np.ix_(dofs, dofs)] += ke
-
-    # Drop the fixed base node (DOFs 0, 1).
-    free = np.arange(2, ndof)
-    Kf = Kg[np.ix_(free, free)]
-
-    # Partition into translational (even) and rotational (odd) DOFs, condense.
-    trans = np.arange(0, 2 * n, 2)
-    rot = np.arange(1, 2 * n, 2)
-    Kvv = Kf[np.ix_(trans, trans)]
-    Kvr = Kf[np.ix_(trans, rot)]
-    Krv = Kf[np.ix_(rot, trans)]
-    Krr = Kf[np.ix_(rot, rot)]
-    K_condensed = Kvv - Kvr @ np.linalg.solve(Krr, Krv)
-    # Symmetrise to clean up any round-off from the condensation.
-    return 0.5 * (K_condensed + K_condensed.T)
+
+# (shear, flexural) multipliers keyed by ``StructuralSystemType`` member name.
+SYSTEM_RIGIDITY_FACTORS = {
+    "FRAME_MOMENT_RESISTING":   (1.0, 1.0),
+    "FRAME_BRACED_CONCENTRIC":  (4.0, 3.0),
+    "FRAME_BRACED_ECCENTRIC":   (3.0, 2.5),
+    "SHEAR_WALLS":              (3.0, 40.0),
+    "CORE_WALL":                (2.0, 60.0),
+    "DIAGRID":                  (5.0, 50.0),
+}
 
 
 def _system_rigidity_factors(structural_system):
@@ -282,21 +867,14 @@ def _system_rigidity_factors(structural_system):
     walls / core contribute. They are conceptual-design calibration factors, not
     measured constants: moment frames are shear-dominated (1, 1); braced frames
     stiffen shear; shear-wall / core / diagrid systems add large flexural
-    rigidity so they sway in a cantilever (bending) shape.
+    rigidity so they sway in a cantilever (bending) shape. The
+    ``StructuralSystemType`` member is matched by name (see
+    :data:`SYSTEM_RIGIDITY_FACTORS`).
     """
-    from core.building_structure import StructuralSystemType as S
-
-    factors = {
-        S.FRAME_MOMENT_RESISTING:   (1.0, 1.0),
-        S.FRAME_BRACED_CONCENTRIC:  (4.0, 3.0),
-        S.FRAME_BRACED_ECCENTRIC:   (3.0, 2.5),
-        S.SHEAR_WALLS:              (3.0, 40.0),
-        S.CORE_WALL:                (2.0, 60.0),
-        S.DIAGRID:                  (5.0, 50.0),
-    }
-    return factors.get(structural_system, (1.0, 1.0))
+    return SYSTEM_RIGIDITY_FACTORS.get(getattr(structural_system, "name", None), (1.0, 1.0))
 
 
+@_shared
 def flexural_inertia(building):
     """Effective second moment of area for cantilever bending (m^4).
 
@@ -311,6 +889,7 @@ def flexural_inertia(building):
     return ny * area * float(np.sum(xs ** 2))
 
 
+@_shared
 def shear_rigidity(building):
     """Story shear rigidity ``GA_s`` (N), including the system shear factor.
 
@@ -323,6 +902,7 @@ def shear_rigidity(building):
     return k_story * h * shear_mult
 
 
+@_shared
 def flexural_rigidity(building):
     """Building flexural rigidity ``EI`` (N.m^2), including the system factor."""
     e_mod = building.primary_material.elastic_modulus
@@ -330,13 +910,15 @@ def flexural_rigidity(building):
     return e_mod * flexural_inertia(building) * flex_mult
 
 
-def structural_stiffness_matrix(building):
+@_shared
+def structural_stiffness_matrix(building, banded=False):
     """Unified shear+flexural lateral stiffness for a building (``N x N``)."""
     return assemble_shear_flexural_stiffness(
         EI=flexural_rigidity(building),
         GA_s=shear_rigidity(building),
         story_height=building.story_height,
         num_stories=building.num_stories,
+        banded=banded,
     )
 
 
@@ -361,7 +943,7 @@ class ModalResult:
     effective_mass: np.ndarray
 
 
-def modal_analysis(M, K, influence=None):
+def modal_analysis(M, K, influence=None, num_modes=None, initial_modes=None, tol=1e-8):
     """Solve the generalised eigenproblem ``K phi = omega^2 M phi``.
 
     Works for any symmetric positive-definite mass matrix (diagonal lumped mass
@@ -369,10 +951,24 @@ def modal_analysis(M, K, influence=None):
     problem is reduced to a symmetric standard form via the Cholesky factor of
     ``M`` (``M = L L^T``, ``A = L^-1 K L^-T``) and solved with ``eigh``.
     ``influence`` is the rigid-body displacement vector for unit ground motion
-    (defaults to all-ones, i.e. uniform horizontal base motion).
+    (defaults to all-ones, i.e. uniform horizontal base motion). Banded
+    matrices are expanded to dense for the full eigen-solution.
+
+    With ``num_modes`` only the lowest ``num_modes`` modes are found, by
+    subspace iteration on the original (possibly banded) matrices, so nothing
+    dense is formed. ``initial_modes`` (``n x m``, e.g. the mode shapes of a
+    slightly different model) seeds the subspace, and ``tol`` bounds the
+    relative residual ``|K phi - omega^2 M phi|`` (a ``RuntimeWarning`` is
+    issued if the iteration stops short of it). The effective masses then
+    only sum to the share of the total mass the kept modes carry.
     """
-    M = np.asarray(M, dtype=float)
-    K = np.asarray(K, dtype=float)
+    M = _as_matrix(M)
+    K = _as_matrix(K)
+    n = M.shape[0]
+    if num_modes is not None and _subspace_size(num_modes, n) < n:
+        return _subspace_modal_analysis(M, K, influence, num_modes, initial_modes, tol)
+    M = _dense(M)
+    K = _dense(K)
 
     L = np.linalg.cholesky(M)
     L_inv = np.linalg.inv(L)
@@ -395,13 +991,82 @@ def modal_analysis(M, K, influence=None):
         if phi[np.argmax(np.abs(phi[:, j])), j] < 0:
             phi[:, j] *= -1.0
 
-    n = M.shape[0]
+    if num_modes is not None:
+        omega, periods, phi = omega[:num_modes], periods[:num_modes], phi[:, :num_modes]
     r = np.ones(n) if influence is None else np.asarray(influence, dtype=float)
     participation = phi.T @ (M @ r)
 
     return ModalResult(omega, periods, phi, participation, participation ** 2)
 
 
+def _subspace_size(num_modes, n):
+    """Iteration subspace for ``num_modes`` modes (Bathe's ``min(2k, k + 8)``)."""
+    return min(n, min(2 * num_modes, num_modes + 8))
+
+
+def _subspace_modal_analysis(M, K, influence, num_modes, initial_modes, tol, max_iter=200):
+    """Lowest modes by subspace iteration with Rayleigh-Ritz projection.
+
+    Each sweep is one solve with ``K`` (factorised once; O(N) when banded)
+    applied to ``M X``. Since ``K Y = M X`` the projected stiffness needs no
+    product with ``K``, and the same identity gives the residuals for free.
+    """
+    n = M.shape[0]
+    k = num_modes
+    q = _subspace_size(k, n)
+    # Only the loads M X of the starting vectors are needed: the warm-start
+    # shapes' inertia loads, the uniform-acceleration load, then random loads.
+    # (Random loads rather than random shapes: M can mix very different DOF
+    # scales, e.g. foundation rocking inertia, which would swamp the rest.)
+    MX = np.empty((n, q))
+    m = 0
+    if initial_modes is not None:
+        guess = np.asarray(initial_modes, dtype=float)
+        if guess.ndim == 2 and guess.shape[0] == n:
+            m = min(q, guess.shape[1])
+            MX[:, :m] = M @ guess[:, :m]
+    if m < q:
+        MX[:, m] = M @ np.ones(n)
+        MX[:, m + 1:] = np.random.default_rng(0).standard_normal((n, q - m - 1))
+
+    factor = _factorize(K)
+    for _ in range(max_iter):
+        Y = factor.solve(MX)
+        MY = M @ Y
+        # Unit M-norm columns keep the projected matrices well conditioned
+        # (K Y = M X still holds with both sides scaled alike).
+        s = 1.0 / np.sqrt(np.einsum('ij,ij->j', Y, MY))
+        Y *= s
+        MY *= s
+        MX *= s
+        K_r = Y.T @ MX
+        M_r = Y.T @ MY
+        L_inv = np.linalg.inv(np.linalg.cholesky(0.5 * (M_r + M_r.T)))
+        eigvals, Q = np.linalg.eigh(L_inv @ (0.5 * (K_r + K_r.T)) @ L_inv.T)
+        Q = L_inv.T @ Q
+        X = Y @ Q
+        KX = MX @ Q
+        MX = MY @ Q
+        residual = KX[:, :k] - MX[:, :k] * eigvals[:k]
+        scale = np.linalg.norm(KX[:, :k], axis=0)
+        if np.all(np.linalg.norm(residual, axis=0) <= tol * scale):
+            break
+    else:
+        worst = np.max(np.linalg.norm(residual, axis=0) / scale)
+        warnings.warn(f"subspace iteration did not converge in {max_iter} sweeps "
+                      f"(relative residual {worst:.2g} > tol {tol:.2g})", RuntimeWarning, stacklevel=3)
+
+    eigvals = np.clip(eigvals[:k], 0.0, None)
+    omega = np.sqrt(eigvals)
+    periods = np.where(omega > 0.0, 2.0 * np.pi / np.maximum(omega, 1e-30), np.inf)
+    phi = X[:, :k]
+    flip = phi[np.argmax(np.abs(phi), axis=0), np.arange(k)] < 0
+    phi[:, flip] *= -1.0
+    r = np.ones(n) if influence is None else np.asarray(influence, dtype=float)
+    participation = phi.T @ (M @ r)
+    return ModalResult(omega, periods, phi, participation, participation ** 2)
+
+
 def building_modal_analysis(building):
     """Convenience: modal analysis from a building's mass and stiffness."""
     M = assemble_mass_matrix(floor_masses(building))
@@ -432,18 +1097,16 @@ def rayleigh_coefficients(zeta_i, omega_i, omega_j, zeta_j=None):
 def rayleigh_damping(M, K, zeta, omega_i, omega_j, zeta_j=None):
     """Rayleigh damping matrix ``C = alpha M + beta K`` (see coefficients)."""
     alpha, beta = rayleigh_coefficients(zeta, omega_i, omega_j, zeta_j)
-    return alpha * np.asarray(M, dtype=float) + beta * np.asarray(K, dtype=float)
+    return alpha * _as_matrix(M) + beta * _as_matrix(K)
 
 
-def damping_matrix(building, M, K, modal=None, anchor_modes=(1, 3)):
-    """Rayleigh damping for a building, anchored at two of its modes.
+def damping_coefficients(building, modal, anchor_modes=(1, 3)):
+    """Rayleigh ``(alpha, beta)`` for a building, anchored at two of its modes.
 
     The target ratio is the building's ``effective_damping_ratio``, applied at
     the two ``anchor_modes`` (1-based; clamped to the available modes). A single
     mode degenerates to mass-proportional damping that hits the target exactly.
     """
-    if modal is None:
-        modal = modal_analysis(M, K)
     n = len(modal.frequencies)
     zeta = building.effective_damping_ratio
 
@@ -451,8 +1114,18 @@ def damping_matrix(building, M, K, modal=None, anchor_modes=(1, 3)):
     j = min(anchor_modes[1], n) - 1
     if i == j:
         # Single available mode: C = 2 zeta omega M reproduces zeta at that mode.
-        return 2.0 * zeta * modal.frequencies[i] * np.asarray(M, dtype=float)
-    return rayleigh_damping(M, K, zeta, modal.frequencies[i], modal.frequencies[j])
+        return 2.0 * zeta * float(modal.frequencies[i]), 0.0
+    return rayleigh_coefficients(zeta, modal.frequencies[i], modal.frequencies[j])
+
+
+def damping_matrix(building, M, K, modal=None, anchor_modes=(1, 3)):
+    """Rayleigh damping matrix for a building (see :func:`damping_coefficients`)."""
+    if modal is None:
+        modal = modal_analysis(M, K, num_modes=max(anchor_modes))
+    alpha, beta = damping_coefficients(building, modal, anchor_modes)
+    if beta == 0.0:
+        return alpha * _as_matrix(M)
+    return alpha * _as_matrix(M) + beta * _as_matrix(K)
 
 
 # ---------------------------------------------------------------------------
@@ -469,15 +1142,27 @@ class NewmarkIntegrator:
     stiff upper modes at a 1/60 s frame step.
 
     The effective stiffness is constant while the structure is linear, so it is
-    inverted once up front and reused every step. Call :meth:`update_system`
-    when the stiffness or damping changes (e.g. a story fails or the soil
-    softens) to refactorise.
+    Cholesky-factorised once up front and reused every step. Call
+    :meth:`update_system` when the stiffness or damping changes (e.g. the soil
+    softens) to refactorise, or :meth:`update_stiffness` for a low-rank
+    stiffness change such as a hinging story. ``M``, ``C`` and ``K`` may be
+    banded (:class:`BandedMatrix` / :class:`BorderedMatrix`), in which case the
+    factorisation and every step are O(N).
+
+    :meth:`step_inplace` is the hot-loop entry point: it advances caller-owned
+    state arrays using work buffers allocated at factorisation time, so a
+    dense step is one fused ``[M | C]`` product, one solve, and a few in-place
+    vector updates with no temporaries.
     """
 
+    # Factors carry low-rank updates as a solve-time correction; past this
+    # many accumulated columns a fresh factorisation is cheaper.
+    max_update_rank = 16
+
     def __init__(self, M, C, K, dt, gamma=0.5, beta=0.25):
-        self.M = np.asarray(M, dtype=float)
-        self.C = np.asarray(C, dtype=float)
-        self.K = np.asarray(K, dtype=float)
+        self.M = _as_matrix(M)
+        self.C = _as_matrix(C)
+        self.K = _as_matrix(K)
         self.dt = float(dt)
         self.gamma = float(gamma)
         self.beta = float(beta)
@@ -496,40 +1181,861 @@ class NewmarkIntegrator:
         self.c7 = dt * gamma
 
         K_eff = self.K + self.c0 * self.M + self.c1 * self.C
-        self._K_eff_inv = np.linalg.inv(K_eff)
+        self._factor = _factorize(K_eff)
+
+        # Work buffers for step_inplace. On the dense path M and C are stacked
+        # side by side so both history products are one matvec on [x; y].
+        n = self.M.shape[0]
+        self._dense = not isinstance(K_eff, _StructuredMatrix)
+        self._MC = np.hstack([self.M, self.C]) if self._dense else None
+        self._xy = np.empty(2 * n)
+        self._x, self._y = self._xy[:n], self._xy[n:]
+        self._rhs = np.empty(n)
+        self._u_next = np.empty(n)
+        self._a_next = np.empty(n)
+        self._tmp = np.empty(n)
 
     def update_system(self, K=None, C=None):
         """Replace the stiffness and/or damping matrices and refactorise."""
         if K is not None:
-            self.K = np.asarray(K, dtype=float)
+            self.K = _as_matrix(K)
         if C is not None:
-            self.C = np.asarray(C, dtype=float)
+            self.C = _as_matrix(C)
         self._build()
 
+    def update_stiffness(self, K, U, D):
+        """Swap in ``K = K_old + U D U^T`` by updating, not rebuilding, the factor.
+
+        ``U`` (``n x r``) and ``D`` (``r x r``) describe the change, e.g. from
+        :meth:`ProgressiveCollapse.stiffness_update`. The effective stiffness
+        changes by the same term, so the existing factorisation is kept and
+        each solve adds an O(n r) Woodbury correction, instead of a fresh
+        O(n^3) (dense) or O(n) (banded) factorisation. Once the corrections
+        add up to more than ``max_update_rank`` columns, or one would be
+        ill-conditioned, the effective stiffness is refactorised instead.
+        """
+        self.K = _as_matrix(K)
+        factor = _update_factor(self._factor, U, D, self.max_update_rank)
+        if factor is None:
+            factor = _factorize(self.K + self.c0 * self.M + self.c1 * self.C)
+        self._factor = factor
+
     def initial_acceleration(self, u, v, F):
         """Acceleration consistent with the equation of motion at t=0."""
         u = np.asarray(u, dtype=float)
         v = np.asarray(v, dtype=float)
         F = np.asarray(F, dtype=float)
-        return np.linalg.solve(self.M, F - self.C @ v - self.K @ u)
+        rhs = F - self.C @ v - self.K @ u
+        if isinstance(self.M, _StructuredMatrix):
+            return self.M.factor().solve(rhs)
+        return np.linalg.solve(self.M, rhs)
 
     def step(self, u, v, a, F_next):
         """Advance one step. Returns the new ``(u, v, a)`` at ``t + dt``.
 
-        ``F_next`` is the external force vector at the end of the step.
+        ``F_next`` is the external force vector at the end of the step. The
+        inputs are left untouched; see :meth:`step_inplace` for the
+        allocation-free variant.
+        """
+        u = np.array(u, dtype=float)
+        v = np.array(v, dtype=float)
+        a = np.array(a, dtype=float)
+        self.step_inplace(u, v, a, np.asarray(F_next, dtype=float))
+        return u, v, a
+
+    def step_inplace(self, u, v, a, F_next):
+        """Advance one step, overwriting the float arrays ``u``, ``v``, ``a``.
+
+        ``F_next`` is the external force vector at the end of the step. On the
+        dense path nothing is allocated; banded solves allocate O(N) scratch.
+        """
+        c0, c2, c3 = self.c0, self.c2, self.c3
+        x, y = self._x, self._y
+        tmp, rhs, u_next, a_next = self._tmp, self._rhs, self._u_next, self._a_next
+
+        # x = c0 u + c2 v + c3 a ;  y = c1 u + c4 v + c5 a
+        np.multiply(u, c0, out=x)
+        np.multiply(v, c2, out=tmp)
+        x += tmp
+        np.multiply(a, c3, out=tmp)
+        x += tmp
+        np.multiply(u, self.c1, out=y)
+        np.multiply(v, self.c4, out=tmp)
+        y += tmp
+        np.multiply(a, self.c5, out=tmp)
+        y += tmp
+
+        # F_eff = F + M x + C y, then u_next = K_eff^-1 F_eff.
+        if self._dense:
+            np.matmul(self._MC, self._xy, out=rhs)
+            rhs += F_next
+            self._factor.solve(rhs, out=u_next)
+        else:
+            rhs[:] = F_next + self.M @ x + self.C @ y
+            u_next[:] = self._factor.solve(rhs)
+
+        # a_next = c0 (u_next - u) - c2 v - c3 a
+        np.subtract(u_next, u, out=a_next)
+        a_next *= c0
+        np.multiply(v, c2, out=tmp)
+        a_next -= tmp
+        np.multiply(a, c3, out=tmp)
+        a_next -= tmp
+
+        # v_next = v + c6 a + c7 a_next
+        np.multiply(a, self.c6, out=tmp)
+        v += tmp
+        np.multiply(a_next, self.c7, out=tmp)
+        v += tmp
+        u[:] = u_next
+        a[:] = a_next
+
+
+class BatchNewmarkIntegrator:
+    """Newmark-beta for ``B`` independent systems of equal size, stepped together.
+
+    ``M``, ``C`` and ``K`` are stacks of shape ``(B, n, n)`` or sequences of
+    dense or banded matrices, and states are ``(B, n)``. Dense systems are
+    stacked and factorised together as one :class:`CholeskyFactor`, so a
+    step for the whole batch is one batched ``[M | C]`` product, one batched
+    solve, and a few vector updates -- no per-system Python loop. Banded
+    systems (:class:`BandedMatrix` / :class:`BorderedMatrix`) stay banded:
+    each keeps its own O(N) factor and the step visits them in turn. Use
+    :meth:`update_system` with an index array to refactorise just the
+    systems that changed (e.g. the buildings in which a story just hinged).
+    """
+
+    def __init__(self, M, C, K, dt, gamma=0.5, beta=0.25):
+        M, C, K = list(M), list(C), list(K)
+        self.banded = any(isinstance(A, _StructuredMatrix) for A in M + C + K)
+        if self.banded:
+            self.M = [_as_matrix(m) for m in M]
+            self.C = [_as_matrix(c) for c in C]
+            self.K = [_as_matrix(k) for k in K]
+        else:
+            self.M = np.stack([_dense(m) for m in M])
+            self.C = np.stack([_dense(c) for c in C])
+            self.K = np.stack([_dense(k) for k in K])
+        self.dt = float(dt)
+        self.gamma = float(gamma)
+        self.beta = float(beta)
+        self.batch_size, n = len(self.M), self.M[0].shape[0]
+
+        dt, beta, gamma = self.dt, self.beta, self.gamma
+        self.c0 = 1.0 / (beta * dt * dt)
+        self.c1 = gamma / (beta * dt)
+        self.c2 = 1.0 / (beta * dt)
+        self.c3 = 1.0 / (2.0 * beta) - 1.0
+        self.c4 = gamma / beta - 1.0
+        self.c5 = dt * (gamma / (2.0 * beta) - 1.0)
+        self.c6 = dt * (1.0 - gamma)
+        self.c7 = dt * gamma
+
+        self._MC = None if self.banded else np.concatenate([self.M, self.C], axis=2)
+        self._factor = None
+        self._factors = [None] * self.batch_size
+        self._build(np.arange(self.batch_size))
+
+        shape = (self.batch_size, n)
+        self._xy = np.empty((self.batch_size, 2 * n, 1))
+        self._x, self._y = self._xy[:, :n, 0], self._xy[:, n:, 0]
+        self._rhs = np.empty(shape + (1,))
+        self._u_next = np.empty(shape + (1,))
+        self._a_next = np.empty(shape)
+        self._tmp = np.empty(shape)
+
+    def _build(self, index):
+        c0, c1 = self.c0, self.c1
+        if self.banded:
+            for i in index:
+                self._factors[i] = _factorize(self.K[i] + c0 * self.M[i] + c1 * self.C[i])
+            return
+        K_eff = self.K[index] + c0 * self.M[index] + c1 * self.C[index]
+        if self._factor is None:
+            self._factor = CholeskyFactor(K_eff)
+        else:
+            self._factor.refactor(index, K_eff)
+
+    def update_system(self, index, K=None, C=None):
+        """Replace ``K`` and/or ``C`` of the systems at ``index`` and refactorise them.
+
+        ``K`` / ``C`` hold one matrix per entry of ``index`` (a stack, or a
+        sequence of banded matrices for a banded batch).
         """
+        index = np.atleast_1d(np.asarray(index))
+        if self.banded:
+            for j, i in enumerate(index):
+                if K is not None:
+                    self.K[i] = _as_matrix(K[j])
+                if C is not None:
+                    self.C[i] = _as_matrix(C[j])
+        else:
+            if K is not None:
+                self.K[index] = K
+            if C is not None:
+                self.C[index] = C
+                self._MC[index] = np.concatenate([self.M[index], self.C[index]], axis=2)
+        self._build(index)
+
+    def initial_acceleration(self, u, v, F):
+        """Accelerations consistent with the equations of motion, ``(B, n)``."""
         u = np.asarray(u, dtype=float)
         v = np.asarray(v, dtype=float)
-        a = np.asarray(a, dtype=float)
-        F_next = np.asarray(F_next, dtype=float)
+        F = np.asarray(F, dtype=float)
+        if self.banded:
+            return np.stack([_factorize(M).solve(F[i] - self.C[i] @ v[i] - self.K[i] @ u[i])
+                             for i, M in enumerate(self.M)])
+        rhs = F - (self.C @ v[..., None])[..., 0] - (self.K @ u[..., None])[..., 0]
+        return np.linalg.solve(self.M, rhs[..., None])[..., 0]
+
+    def step(self, u, v, a, F_next, active=None):
+        """Advance every system one step; returns new ``(u, v, a)`` arrays."""
+        u = np.array(u, dtype=float)
+        v = np.array(v, dtype=float)
+        a = np.array(a, dtype=float)
+        self.step_inplace(u, v, a, np.asarray(F_next, dtype=float), active)
+        return u, v, a
+
+    def step_inplace(self, u, v, a, F_next, active=None):
+        """Advance the ``(B, n)`` states in place under loads ``F_next`` ``(B, n)``.
+
+        ``active`` is an optional ``(B,)`` boolean mask; systems where it is
+        False (e.g. collapsed buildings) keep their state unchanged.
+        """
+        c0, c2, c3 = self.c0, self.c2, self.c3
+        x, y, tmp, a_next = self._x, self._y, self._tmp, self._a_next
+
+        np.multiply(u, c0, out=x)
+        np.multiply(v, c2, out=tmp)
+        x += tmp
+        np.multiply(a, c3, out=tmp)
+        x += tmp
+        np.multiply(u, self.c1, out=y)
+        np.multiply(v, self.c4, out=tmp)
+        y += tmp
+        np.multiply(a, self.c5, out=tmp)
+        y += tmp
+
+        if self.banded:
+            for i, factor in enumerate(self._factors):
+                rhs = F_next[i] + self.M[i] @ x[i] + self.C[i] @ y[i]
+                self._u_next[i, :, 0] = factor.solve(rhs)
+        else:
+            np.matmul(self._MC, self._xy, out=self._rhs)
+            self._rhs[..., 0] += F_next
+            self._factor.solve(self._rhs, out=self._u_next)
+        u_next = self._u_next[..., 0]
+
+        np.subtract(u_next, u, out=a_next)
+        a_next *= c0
+        np.multiply(v, c2, out=tmp)
+        a_next -= tmp
+        np.multiply(a, c3, out=tmp)
+        a_next -= tmp
+
+        if active is None:
+            np.multiply(a, self.c6, out=tmp)
+            v += tmp
+            np.multiply(a_next, self.c7, out=tmp)
+            v += tmp
+            u[:] = u_next
+            a[:] = a_next
+        else:
+            mask = np.asarray(active, dtype=bool)[:, None]
+            np.multiply(a, self.c6, out=tmp)
+            tmp += self.c7 * a_next
+            tmp *= mask
+            v += tmp
+            np.copyto(u, u_next, where=mask)
+            np.copyto(a, a_next, where=mask)
+
+
+# ---------------------------------------------------------------------------
+# Story hysteresis (bilinear / Bouc-Wen, Newton-Raphson)
+# ---------------------------------------------------------------------------
+#
+# Progressive collapse switches a story to its residual stiffness the moment it
+# fails. Real stories yield gradually instead. Here each Timoshenko story
+# element carries a hysteretic shear spring on its shear sway
+# ``u_s = v_top - v_bottom - h (theta_bottom + theta_top) / 2``: the elastic
+# story shear ``k_s u_s`` becomes ``k_s (a u_s + (1 - a) z)``, where ``z`` is
+# the hysteretic displacement of a bilinear or Bouc-Wen law and ``a`` the
+# post-yield stiffness ratio. The element force then changes by a multiple of
+# ``b = [-1, -h/2, 1, -h/2]`` and its tangent by a rank-1 term ``b b^T``, so
+# the tangent of the whole stack stays block-tridiagonal in the ``[v, theta]``
+# floor nodes and each Newton iteration is one O(N) block solve.
+
+@dataclass
+class BilinearHysteresis:
+    """Bilinear story shear: elastic up to yield, then hardening.
+
+    A story yields at a shear sway of ``yield_drift`` times the story height
+    and keeps ``post_yield_ratio`` of its shear stiffness afterwards.
+    """
+
+    yield_drift: float = 0.005
+    post_yield_ratio: float = 0.05
+
+    def update(self, z, du, z_yield):
+        """Hysteretic displacement after a sway increment ``du``, and ``dz/du``."""
+        trial = z + du
+        return np.clip(trial, -z_yield, z_yield), (np.abs(trial) < z_yield).astype(float)
+
+
+@dataclass
+class BoucWenHysteresis:
+    """Smooth Bouc-Wen hysteretic shear.
+
+    ``dz = (1 - |z/z_y|^n (beta sgn(du z) + 1 - beta)) du`` with ``z_y`` the
+    yield sway (``yield_drift`` times the story height): ``z`` saturates at
+    ``z_y``, the ``exponent`` n sets how sharp the knee is and ``beta = 0.5``
+    unloads at the elastic stiffness. Each step is integrated with backward
+    Euler, solved by a few Newton iterations on all stories at once.
+    """
+
+    yield_drift: float = 0.005
+    post_yield_ratio: float = 0.05
+    exponent: float = 2.0
+    beta: float = 0.5
+    iterations: int = 8
+
+    def _evolution(self, z, du, z_yield):
+        """``phi`` of ``dz = phi du`` at ``z``, and the backward-Euler slope."""
+        ratio = np.abs(z) / z_yield
+        shape = self.beta * np.sign(du) * np.sign(z) + (1.0 - self.beta)
+        phi = 1.0 - ratio ** self.exponent * shape
+        dphi_dz = -self.exponent * ratio ** (self.exponent - 1.0) * np.sign(z) * shape / z_yield
+        return phi, 1.0 - du * dphi_dz
+
+    def update(self, z, du, z_yield):
+        """Hysteretic displacement after a sway increment ``du``, and ``dz/du``."""
+        z_new = np.clip(z + du, -z_yield, z_yield)
+        for _ in range(self.iterations):
+            phi, slope = self._evolution(z_new, du, z_yield)
+            # The exact solution stays inside the yield surface, so clipping
+            # only keeps a Newton overshoot from leaving it.
+            z_new = np.clip(z_new - (z_new - z - du * phi) / slope, -z_yield, z_yield)
+        phi, slope = self._evolution(z_new, du, z_yield)
+        return z_new, phi / slope
+
+
+class HystereticNewmarkIntegrator:
+    """Newmark-beta for the soil-structure stack with hysteretic stories.
+
+    The equation of motion is solved by Newton-Raphson each step. Unlike
+    :class:`NewmarkIntegrator` it keeps the floor rotations as (massless)
+    unknowns, because condensing them out is only exact for a linear stack:
+    the state is ``[v_1, theta_1, ..., v_N, theta_N, u_f, theta_f]``. The Newton
+    matrix is then the block-tridiagonal tangent bordered by the two
+    foundation DOFs, factorised in O(N) by cyclic reduction plus a Schur
+    complement. While every story is (nearly) elastic the initial tangent's
+    factorisation is reused, so an elastic step costs two solves.
+
+    ``EI`` and ``GA_s`` are the rigidities of :func:`shear_flexural_blocks`,
+    ``floor_mass``, ``z`` and the soil terms are as in
+    :func:`assemble_ssi_matrices`, ``rayleigh`` is the structure's
+    ``(alpha, beta)`` and ``law`` a :class:`BilinearHysteresis` or
+    :class:`BoucWenHysteresis`. :meth:`step_inplace` takes and returns state in
+    the ``[v, u_f, theta_f]`` coordinates of the linear integrator.
+    """
+
+    def __init__(self, EI, GA_s, story_height, floor_mass, z, m0, I0, k_h, k_r, c_h, c_r,
+                 rayleigh, law, dt, gamma=0.5, beta=0.25, tol=1e-8, max_iter=30):
+        m = np.asarray(floor_mass, dtype=float)
+        z = np.asarray(z, dtype=float)
+        n = self.n = len(m)
+        self.law = law
+        self.dt = float(dt)
+        self.gamma = float(gamma)
+        self.beta = float(beta)
+        self.tol = tol
+        self.max_iter = max_iter
+
+        h = self.h = float(story_height)
+        EI = np.broadcast_to(np.asarray(EI, dtype=float), (n,))
+        GA_s = np.broadcast_to(np.asarray(GA_s, dtype=float), (n,))
+        self.K0 = shear_flexural_blocks(EI, GA_s, h, n)
+        self.k_s = 12.0 * EI / ((1.0 + 12.0 * EI / (GA_s * h * h)) * h ** 3)
+        self.z_yield = law.yield_drift * h
+        self._plastic_stiffness = (1.0 - law.post_yield_ratio) * self.k_s
+        b = np.array([-1.0, -0.5 * h, 1.0, -0.5 * h])
+        self._bb = np.outer(b, b)
+
+        mass_blocks = np.zeros((n, 2, 2))
+        mass_blocks[:, 0, 0] = m
+        no_coupling = np.zeros((n - 1, 2, 2))
+        border = np.zeros((2 * n, 2))
+        border[0::2, 0] = m
+        border[0::2, 1] = m * z
+        first_moment = float((m * z).sum())
+        self.M = BorderedMatrix(BlockTridiagonal(mass_blocks, no_coupling), border,
+                                [[float(m.sum()) + m0, first_moment],
+                                 [first_moment, float((m * z * z).sum()) + I0]])
+        alpha_r, beta_r = rayleigh
+        self.C = BorderedMatrix(
+            BlockTridiagonal(alpha_r * mass_blocks + beta_r * self.K0.diag,
+                             beta_r * self.K0.lower),
+            np.zeros((2 * n, 2)), np.diag([c_h, c_r]))
+        self._k_foundation = np.array([k_h, k_r], dtype=float)
+
+        dt, beta, gamma = self.dt, self.beta, self.gamma
+        self.c0 = 1.0 / (beta * dt * dt)
+        self.c1 = gamma / (beta * dt)
+        self.c2 = 1.0 / (beta * dt)
+        self.c3 = 1.0 / (2.0 * beta) - 1.0
+        self.c4 = gamma / beta - 1.0
+        self.c5 = dt * (gamma / (2.0 * beta) - 1.0)
+        self._build()
+
+        size = 2 * n + 2
+        self._x = np.zeros(size)
+        self._xd = np.zeros(size)
+        self._xdd = np.zeros(size)
+        self._force = np.zeros(size)
+        self.z = np.zeros(n)            # hysteretic displacement per story
+        self._sway = np.zeros(n)        # shear sway at the last converged step
+        self.iterations = 0             # Newton iterations of the last step
+
+    def _build(self):
+        """Initial-tangent Newton matrix pieces and its cached factorisation."""
+        self._J_diag = self.K0.diag + self.c0 * self.M.core.diag + self.c1 * self.C.core.diag
+        self._J_lower = self.K0.lower + self.c1 * self.C.core.lower
+        self._J_border = self.c0 * self.M.border
+        self._J_corner = (self.c0 * self.M.corner + self.c1 * self.C.corner
+                          + np.diag(self._k_foundation))
+        self._elastic_factor = self._jacobian(None).factor()
+
+    def set_foundation(self, k_h, k_r, c_h, c_r):
+        """Swap the soil springs and dashpots, keeping the dynamic state."""
+        self._k_foundation[:] = (k_h, k_r)
+        self.C.corner[:] = np.diag([c_h, c_r])
+        self._build()
+
+    def _jacobian(self, softening):
+        """Newton matrix with story ``e``'s tangent lowered by ``softening[e] b b^T``."""
+        diag, lower = self._J_diag, self._J_lower
+        if softening is not None:
+            bb = softening[:, None, None] * self._bb
+            diag = diag - bb[:, 2:, 2:]
+            diag[:-1] -= bb[1:, :2, :2]
+            lower = lower - bb[1:, 2:, :2]
+        return BorderedMatrix(BlockTridiagonal(diag, lower), self._J_border, self._J_corner)
+
+    def _shear_sway(self, x):
+        nodes = x[:2 * self.n].reshape(self.n, 2)
+        below = np.zeros_like(nodes)
+        below[1:] = nodes[:-1]
+        return nodes[:, 0] - below[:, 0] - 0.5 * self.h * (below[:, 1] + nodes[:, 1])
+
+    def _restoring_force(self, x, plastic):
+        """Internal force: elastic stack and soil springs, less the yielded shear."""
+        n2 = 2 * self.n
+        r = np.empty_like(x)
+        r[:n2] = self.K0.matvec(x[:n2])
+        r[n2:] = self._k_foundation * x[n2:]
+        nodes = r[:n2].reshape(self.n, 2)
+        half_h = 0.5 * self.h
+        nodes[:, 0] -= plastic
+        nodes[:, 1] += half_h * plastic
+        nodes[:-1, 0] += plastic[1:]
+        nodes[:-1, 1] += half_h * plastic[1:]
+        return r
+
+    @property
+    def story_shears(self):
+        """``(N,)`` shear carried by each story at the last step (N)."""
+        a = self.law.post_yield_ratio
+        return self.k_s * (a * self._sway + (1.0 - a) * self.z)
+
+    def step_inplace(self, u, v, a, F_next):
+        """Advance one step, overwriting ``u``, ``v``, ``a`` (``[v, u_f, theta_f]``).
 
-        F_eff = (F_next
-                 + self.M @ (self.c0 * u + self.c2 * v + self.c3 * a)
-                 + self.C @ (self.c1 * u + self.c4 * v + self.c5 * a))
-        u_next = self._K_eff_inv @ F_eff
-        a_next = self.c0 * (u_next - u) - self.c2 * v - self.c3 * a
-        v_next = v + self.c6 * a + self.c7 * a_next
-        return u_next, v_next, a_next
+        The integrator keeps the full state itself, so ``u``, ``v`` and ``a``
+        must be the arrays it last wrote (or zeros before the first step).
+        """
+        n, n2 = self.n, 2 * self.n
+        c0, c1 = self.c0, self.c1
+        x_old, xd_old, xdd_old = self._x, self._xd, self._xdd
+        force = self._force
+        force[0:n2:2] = F_next[:n]
+        force[n2:] = F_next[n:]
+        accel_history = self.c2 * xd_old + self.c3 * xdd_old
+        velocity_history = self.c4 * xd_old + self.c5 * xdd_old
+        law, z_yield = self.law, self.z_yield
+
+        x = x_old.copy()
+        previous = np.inf
+        for iteration in range(1, self.max_iter + 1):
+            dx = x - x_old
+            sway = self._shear_sway(x)
+            z, dz_du = law.update(self.z, sway - self._sway, z_yield)
+            residual = (self.M.matvec(c0 * dx - accel_history)
+                        + self.C.matvec(c1 * dx - velocity_history)
+                        + self._restoring_force(x, self._plastic_stiffness * (sway - z))
+                        - force)
+            softening = self._plastic_stiffness * (1.0 - dz_du)
+            # Nearly elastic stories: the initial tangent still converges fast.
+            if np.all(np.abs(softening) <= 1e-3 * self.k_s):
+                factor = self._elastic_factor
+            else:
+                factor = self._jacobian(softening).factor()
+            correction = factor.solve(-residual)
+            x += correction
+            # Converged once the correction is negligible next to both the
+            # step's displacement increment and the yield sway, or once it
+            # stops shrinking at the roundoff level of a tall stack.
+            size = np.max(np.abs(correction))
+            if (size <= self.tol * max(z_yield, np.max(np.abs(dx)))
+                    or (size >= previous and size <= 1e-6 * max(z_yield, np.max(np.abs(x))))):
+                break
+            previous = size
+        self.iterations = iteration
+
+        sway = self._shear_sway(x)
+        self.z, _ = law.update(self.z, sway - self._sway, z_yield)
+        self._sway = sway
+        dx = x - x_old
+        self._xdd = c0 * dx - accel_history
+        self._xd = c1 * dx - velocity_history
+        self._x = x
+        for state, full in ((u, self._x), (v, self._xd), (a, self._xdd)):
+            state[:n] = full[0:n2:2]
+            state[n:] = full[n2:]
+
+
+def hysteretic_integrator(building, soil, law, banded=False):
+    """:class:`HystereticNewmarkIntegrator` for a building on ``soil``.
+
+    Damping matches :func:`build_ssi_system` (``banded`` only selects how the
+    Rayleigh anchor modes are computed).
+    """
+    m0, I0 = foundation_mass(building)
+    k_h, k_r = soil_stiffness(building, soil)
+    c_h, c_r = soil_damping(building, soil)
+    return HystereticNewmarkIntegrator(
+        flexural_rigidity(building), shear_rigidity(building), building.story_height,
+        floor_masses(building), floor_heights(building), m0, I0, k_h, k_r, c_h, c_r,
+        damping_coefficients(building, fixed_base_modes(building, banded=banded)),
+        law, building.dt)
+
+
+# ---------------------------------------------------------------------------
+# Mode superposition (truncated modal time integration)
+# ---------------------------------------------------------------------------
+#
+# Projected onto its mass-normalised modes, the system splits into independent
+# oscillators ``q'' + 2 zeta omega q' + omega^2 q = p(t)`` with ``p = Phi^T F``.
+# Earthquake response is carried by the first few modes, so keeping only those
+# and solving each oscillator exactly (for a load that varies linearly over a
+# step, as in Nigam & Jennings) replaces an ``n``-DOF implicit solve per step
+# with a handful of 2x2 updates. Damping is taken as the diagonal of
+# ``Phi^T C Phi`` -- exact for Rayleigh damping, the usual classical-damping
+# approximation once soil dashpots make ``C`` non-proportional.
+
+def _expm(A):
+    """Matrix exponential of a stack of small matrices (scaling and squaring)."""
+    A = np.asarray(A, dtype=float)
+    norm = np.abs(A).sum(axis=-2).max(axis=-1)
+    squarings = np.maximum(0, np.ceil(np.log2(np.maximum(norm, 1e-300) / 0.5))).astype(int)
+    X = A / (2.0 ** squarings)[..., None, None]
+    # Taylor series; with ||X|| <= 1/2 eighteen terms are far below round-off.
+    E = np.broadcast_to(np.eye(A.shape[-1]), A.shape).copy()
+    term = E.copy()
+    for j in range(1, 18):
+        term = term @ X / j
+        E += term
+    for i in range(int(squarings.max(initial=0))):
+        E = np.where((i < squarings)[..., None, None], E @ E, E)
+    return E
+
+
+def sdof_recurrence(omega, zeta, dt):
+    """Exact one-step recurrence for ``q'' + 2 zeta omega q' + omega^2 q = p(t)``.
+
+    With ``p`` varying linearly over each step (the Nigam-Jennings
+    assumption) the state ``x = [q, q']`` advances exactly as
+
+        x_{i+1} = A x_i + B0 p_i + B1 p_{i+1}
+
+    for any damping (under-, critically, or over-damped). ``omega`` and
+    ``zeta`` broadcast together; returns ``A`` of shape ``(..., 2, 2)`` and
+    ``B0``, ``B1`` of shape ``(..., 2)``. The coefficients come from the
+    exponential of the system augmented with the load and its slope.
+    """
+    omega, zeta = np.broadcast_arrays(np.asarray(omega, dtype=float),
+                                      np.asarray(zeta, dtype=float))
+    aug = np.zeros(omega.shape + (4, 4))
+    aug[..., 0, 1] = 1.0
+    aug[..., 1, 0] = -omega ** 2
+    aug[..., 1, 1] = -2.0 * zeta * omega
+    aug[..., 1, 2] = 1.0    # load p enters the acceleration
+    aug[..., 2, 3] = 1.0    # p' = slope, constant over the step
+    E = _expm(aug * dt)
+    A = E[..., :2, :2]
+    slope = E[..., :2, 3] / dt
+    return A, E[..., :2, 2] - slope, slope
+
+
+class _BlockedRecurrence:
+    """``x_{i+1} = A x_i + B0 p_i + B1 p_{i+1}`` for many oscillators at once.
+
+    The record is cut into ``nb`` blocks of ``L ~ sqrt(T)`` steps. The state at
+    the start of every block is found first (block-end responses from rest are
+    one matrix product with the load, then a short carry across blocks), after
+    which :meth:`scan` steps all blocks side by side. Both Python loops are
+    ``O(sqrt(T))`` and nothing of size ``T x S`` is needed unless the caller
+    stores it. Oscillators run along the last axis, flattened to ``S``.
+    """
+
+    def __init__(self, A, B0, B1, p):
+        p = np.asarray(p, dtype=float)
+        T = p.shape[-1]
+        self.lead = np.broadcast_shapes(np.shape(A)[:-2], np.shape(B0)[:-1],
+                                        np.shape(B1)[:-1], p.shape[:-1])
+        S = self.size = math.prod(self.lead)
+        self.num_steps = n = T - 1
+        self.block = L = max(1, math.isqrt(n))
+        self.num_blocks = nb = -(-n // L)
+
+        A = np.broadcast_to(A, self.lead + (2, 2)).reshape(S, 2, 2)
+        B0 = np.broadcast_to(B0, self.lead + (2,)).reshape(S, 2)
+        B1 = np.broadcast_to(B1, self.lead + (2,)).reshape(S, 2)
+        self._coef = (A[:, 0, 0], A[:, 0, 1], A[:, 1, 0], A[:, 1, 1],
+                      B0[:, 0], B0[:, 1], B1[:, 0], B1[:, 1])
+
+        # One load shared by every oscillator (the usual ground-motion case)
+        # stays a single column.
+        shared = math.prod(p.shape[:-1]) == 1
+        load = p.reshape(1, T) if shared else np.broadcast_to(p, self.lead + (T,)).reshape(S, T)
+        padded = np.zeros((nb * L + 1, load.shape[0]))
+        padded[:T] = load.T
+        self._p0 = padded[:-1].reshape(nb, L, -1)
+        self._p1 = padded[1:].reshape(nb, L, -1)
+
+        # Block-end response from rest: x_L = sum_i A^(L-1-i) (B0 p_i + B1 p_(i+1)).
+        powers = np.empty((L, S, 2, 2))
+        powers[0] = np.eye(2)
+        for i in range(1, L):
+            powers[i] = powers[i - 1] @ A
+        H0 = (powers[::-1] @ B0[:, :, None])[..., 0]
+        H1 = (powers[::-1] @ B1[:, :, None])[..., 0]
+        if shared:
+            ends = (self._p0[..., 0] @ H0.reshape(L, 2 * S)
+                    + self._p1[..., 0] @ H1.reshape(L, 2 * S)).reshape(nb, S, 2)
+        else:
+            ends = (np.einsum('kis,isr->ksr', self._p0, H0)
+                    + np.einsum('kis,isr->ksr', self._p1, H1))
+
+        A_L = powers[-1] @ A
+        starts = np.zeros((nb, S, 2))
+        for k in range(1, nb):
+            starts[k] = (A_L @ starts[k - 1][:, :, None])[..., 0] + ends[k - 1]
+        self._starts = starts
+
+    def scan(self, visit):
+        """Step every block from its start state, calling ``visit(j, q, v)``.
+
+        ``q`` and ``v`` are ``(nb, S)`` arrays holding step ``k L + j + 1`` of
+        block ``k``; they are reused, so copy anything that must be kept.
+        Steps past the end of the record (padding in the last block) are
+        included and left to ``visit`` to ignore.
+        """
+        a00, a01, a10, a11, b00, b01, b10, b11 = self._coef
+        q = self._starts[..., 0].copy()
+        v = self._starts[..., 1].copy()
+        nxt = np.empty_like(q)
+        tmp = np.empty_like(q)
+        for j in range(self.block):
+            p0, p1 = self._p0[:, j], self._p1[:, j]
+            np.multiply(a00, q, out=nxt)
+            np.multiply(a01, v, out=tmp)
+            nxt += tmp
+            np.multiply(b00, p0, out=tmp)
+            nxt += tmp
+            np.multiply(b10, p1, out=tmp)
+            nxt += tmp
+            v *= a11
+            np.multiply(a10, q, out=tmp)
+            v += tmp
+            np.multiply(b01, p0, out=tmp)
+            v += tmp
+            np.multiply(b11, p1, out=tmp)
+            v += tmp
+            q, nxt = nxt, q
+            visit(j, q, v)
+
+
+def sdof_response_history(A, B0, B1, p):
+    """State history ``x_i = [q_i, q'_i]`` of stacked oscillators from rest.
+
+    ``A``, ``B0``, ``B1`` are from :func:`sdof_recurrence` with leading shape
+    ``S``; ``p`` has shape ``S + (T,)`` or is a single ``(T,)`` load shared by
+    all of them. Returns ``S + (T, 2)`` with ``x_0 = 0``. The exact recurrence
+    is evaluated block-wise in time (see :class:`_BlockedRecurrence`), so the
+    Python-level work is ``O(sqrt(T))`` steps, vectorised across oscillators.
+    """
+    p = np.asarray(p, dtype=float)
+    T = p.shape[-1]
+    if T < 2:
+        lead = np.broadcast_shapes(np.shape(A)[:-2], p.shape[:-1])
+        return np.zeros(lead + (T, 2))
+    rec = _BlockedRecurrence(A, B0, B1, p)
+    nb, L, S, n = rec.num_blocks, rec.block, rec.size, rec.num_steps
+    blocks = np.empty((nb, L, 2, S))
+
+    def store(j, q, v):
+        blocks[:, j, 0] = q
+        blocks[:, j, 1] = v
+
+    rec.scan(store)
+    out = np.zeros(rec.lead + (T, 2))
+    out.reshape(S, T, 2)[:, 1:] = blocks.reshape(nb * L, 2, S)[:n].transpose(2, 0, 1)
+    return out
+
+
+def sdof_peak_displacement(A, B0, B1, p):
+    """Peak ``|q|`` of stacked oscillators from rest, without forming histories.
+
+    Same arguments as :func:`sdof_response_history`; returns shape ``S``. Only
+    ``(sqrt(T), S)``-sized work arrays are used, so many oscillators can be
+    run against a long record at once.
+    """
+    p = np.asarray(p, dtype=float)
+    if p.shape[-1] < 2:
+        return np.zeros(np.broadcast_shapes(np.shape(A)[:-2], p.shape[:-1]))
+    rec = _BlockedRecurrence(A, B0, B1, p)
+    nb, S = rec.num_blocks, rec.size
+    # Steps of the last block beyond the record are padding.
+    valid_in_last = rec.num_steps - (nb - 1) * rec.block
+    peak = np.zeros((nb, S))
+    magnitude = np.empty((nb, S))
+
+    def track(j, q, v):
+        rows = nb if j < valid_in_last else nb - 1
+        np.abs(q[:rows], out=magnitude[:rows])
+        np.maximum(peak[:rows], magnitude[:rows], out=peak[:rows])
+
+    rec.scan(track)
+    return peak.max(axis=0).reshape(rec.lead)
+
+
+@dataclass
+class ModalTruncationReport:
+    """How far a truncated modal solution is from the full Newmark one.
+
+    ``mass_ratio`` is the share of the effective (participating) mass the kept
+    modes carry; the errors compare every DOF over the whole record.
+    """
+    num_modes: int
+    mass_ratio: float
+    peak_displacement: float
+    max_error: float
+    relative_error: float
+
+
+class ModalIntegrator:
+    """Mode-superposition time integrator on the lowest ``num_modes`` modes.
+
+    Each kept mode is advanced with the exact piecewise-linear recurrence of
+    :func:`sdof_recurrence`; DOF responses are recovered on demand as
+    ``Phi q``. :meth:`step` advances one step for interactive use, while
+    :meth:`run_ground_motion` computes a whole earthquake history in one
+    vectorised pass. ``modal`` may be a precomputed :class:`ModalResult` for
+    the same ``M``, ``K`` and ``influence``.
+    """
+
+    def __init__(self, M, C, K, dt, num_modes=5, influence=None, modal=None):
+        self.M = _as_matrix(M)
+        self.C = _as_matrix(C)
+        self.K = _as_matrix(K)
+        self.dt = float(dt)
+        n = self.M.shape[0]
+        self.influence = np.ones(n) if influence is None else np.asarray(influence, dtype=float)
+        if modal is None:
+            modal = modal_analysis(self.M, self.K, self.influence, num_modes=num_modes)
+
+        k = min(num_modes, len(modal.frequencies))
+        self.num_modes = k
+        self.mode_shapes = modal.mode_shapes[:, :k]
+        self.frequencies = modal.frequencies[:k]
+        self.participation = modal.participation[:k]
+        modal_c = np.einsum('ij,ij->j', self.mode_shapes, self.C @ self.mode_shapes)
+        self.damping_ratios = modal_c / (2.0 * np.maximum(self.frequencies, 1e-30))
+        total_mass = float(self.influence @ (self.M @ self.influence))
+        self.mass_ratio = float(np.sum(modal.effective_mass[:k])) / total_mass
+
+        self._A, self._B0, self._B1 = sdof_recurrence(self.frequencies, self.damping_ratios, self.dt)
+        self.reset()
+
+    def reset(self):
+        """Return to rest with zero load."""
+        self.q = np.zeros(self.num_modes)
+        self.qd = np.zeros(self.num_modes)
+        self._p = np.zeros(self.num_modes)
+
+    def modal_force(self, F):
+        """Project a DOF load vector onto the kept modes (``Phi^T F``)."""
+        return self.mode_shapes.T @ np.asarray(F, dtype=float)
+
+    def step(self, F_next):
+        """Advance one step under the DOF load vector ``F_next`` (end of step)."""
+        p_next = self.modal_force(F_next)
+        A, B0, B1, p = self._A, self._B0, self._B1, self._p
+        q = A[:, 0, 0] * self.q + A[:, 0, 1] * self.qd + B0[:, 0] * p + B1[:, 0] * p_next
+        qd = A[:, 1, 0] * self.q + A[:, 1, 1] * self.qd + B0[:, 1] * p + B1[:, 1] * p_next
+        self.q, self.qd, self._p = q, qd, p_next
+
+    @property
+    def displacement(self):
+        """Current DOF displacements recovered from the kept modes."""
+        return self.mode_shapes @ self.q
+
+    @property
+    def velocity(self):
+        """Current DOF velocities recovered from the kept modes."""
+        return self.mode_shapes @ self.qd
+
+    def run_ground_motion(self, ground_motion, duration):
+        """Modal history from rest under base acceleration ``a_g(t)``.
+
+        Returns ``(times, states)`` with ``states`` of shape ``(T, k, 2)``
+        holding ``[q, q']`` per mode. The modal earthquake load is
+        ``-participation * a_g``, so no DOF-sized load is ever formed.
+        """
+        times, accels = ground_motion.sample(self.dt, duration)
+        p = -self.participation[:, None] * accels[None, :]
+        states = sdof_response_history(self._A, self._B0, self._B1, p)
+        return times, np.swapaxes(states, 0, 1)
+
+    def recover(self, states):
+        """DOF displacement history ``(T, n)`` from a modal state history."""
+        return states[..., 0] @ self.mode_shapes.T
+
+    def compare_with_newmark(self, ground_motion, duration):
+        """Truncation error against a full :class:`NewmarkIntegrator` run.
+
+        Both solutions start from rest under the same ``ground_motion`` and
+        time step; returns a :class:`ModalTruncationReport`.
+        """
+        times, states = self.run_ground_motion(ground_motion, duration)
+        modal_u = self.recover(states)
+        _, accels = ground_motion.sample(self.dt, duration)
+
+        reference = NewmarkIntegrator(self.M, self.C, self.K, self.dt)
+        pattern = seismic_force(self.M, self.influence, 1.0)
+        n = len(pattern)
+        u, v, a = np.zeros(n), np.zeros(n), np.zeros(n)
+        load = np.empty(n)
+        newmark_u = np.zeros_like(modal_u)
+        for i in range(1, len(times)):
+            np.multiply(pattern, accels[i], out=load)
+            reference.step_inplace(u, v, a, load)
+            newmark_u[i] = u
+
+        peak = float(np.max(np.abs(newmark_u)))
+        err = float(np.max(np.abs(modal_u - newmark_u)))
+        return ModalTruncationReport(self.num_modes, self.mass_ratio, peak, err,
+                                     err / peak if peak > 0 else 0.0)
 
 
 # ---------------------------------------------------------------------------
@@ -576,6 +2082,7 @@ MEDIUM_SOIL = SoilProfile(shear_wave_velocity=250.0)
 SOFT_SOIL = SoilProfile(shear_wave_velocity=150.0)
 
 
+@_shared
 def floor_heights(building):
     """Heights of each floor above the base (m), length ``N``."""
     return np.arange(1, building.num_stories + 1) * building.story_height
@@ -637,8 +2144,12 @@ def assemble_ssi_matrices(M_s, C_s, K_s, floor_mass, z, m0, I0, k_h, k_r, c_h, c
     DOF order is ``[v_1..v_N, u_f, theta_f]`` where ``v_i`` are floor distortions
     relative to the base, ``u_f`` is foundation sway and ``theta_f`` rocking.
     Returns ``(M, C, K, influence)``; the seismic load is ``-M @ influence * a_g``
-    with ``influence`` a unit in the sway DOF.
+    with ``influence`` a unit in the sway DOF. If the structural matrices are
+    banded the result is a set of :class:`BorderedMatrix` with the two
+    foundation DOFs as the border.
     """
+    if isinstance(K_s, BandedMatrix):
+        return _assemble_banded_ssi(M_s, C_s, K_s, floor_mass, z, m0, I0, k_h, k_r, c_h, c_r)
     m = np.asarray(floor_mass, dtype=float)
     z = np.asarray(z, dtype=float)
     n = len(m)
@@ -675,12 +2186,49 @@ def assemble_ssi_matrices(M_s, C_s, K_s, floor_mass, z, m0, I0, k_h, k_r, c_h, c
     return M, C, K, influence
 
 
-def build_ssi_system(building, soil):
-    """Convenience: full SSI ``(M, C, K, influence)`` for a building on soil."""
-    M_s = assemble_mass_matrix(floor_masses(building))
-    K_s = structural_stiffness_matrix(building)
-    modal = modal_analysis(M_s, K_s)
-    C_s = damping_matrix(building, M_s, K_s, modal)
+def _assemble_banded_ssi(M_s, C_s, K_s, floor_mass, z, m0, I0, k_h, k_r, c_h, c_r):
+    """Banded counterpart of :func:`assemble_ssi_matrices` (same DOF order)."""
+    m = np.asarray(floor_mass, dtype=float)
+    z = np.asarray(z, dtype=float)
+    n = len(m)
+    m_total = float(m.sum()) + m0
+    first_moment = float((m * z).sum())
+    second_moment = float((m * z * z).sum()) + I0
+
+    M = BorderedMatrix(M_s, np.column_stack([m, m * z]),
+                       [[m_total, first_moment], [first_moment, second_moment]])
+    K = BorderedMatrix(K_s, np.zeros((n, 2)), np.diag([k_h, k_r]))
+    C = BorderedMatrix(C_s, np.zeros((n, 2)), np.diag([c_h, c_r]))
+
+    influence = np.zeros(n + 2)
+    influence[n] = 1.0
+    return M, C, K, influence
+
+
+@_shared
+def fixed_base_mass_matrix(building, banded=False):
+    """Lumped mass matrix of the stack alone, dense or as a :class:`BandedMatrix`."""
+    m = floor_masses(building)
+    return BandedMatrix(diagonal=m) if banded else assemble_mass_matrix(m)
+
+
+@_shared
+def fixed_base_modes(building, num_modes=3, banded=False):
+    """Lowest fixed-base modes (by default enough for the Rayleigh anchors)."""
+    return modal_analysis(fixed_base_mass_matrix(building, banded=banded),
+                          structural_stiffness_matrix(building, banded=banded),
+                          num_modes=num_modes)
+
+
+def build_ssi_system(building, soil, banded=False):
+    """Convenience: full SSI ``(M, C, K, influence)`` for a building on soil.
+
+    ``banded=True`` keeps every matrix in banded storage (no dense ``N x N``
+    block is ever formed during time stepping).
+    """
+    M_s = fixed_base_mass_matrix(building, banded=banded)
+    K_s = structural_stiffness_matrix(building, banded=banded)
+    C_s = damping_matrix(building, M_s, K_s, fixed_base_modes(building, banded=banded))
 
     m = floor_masses(building)
     z = floor_heights(building)
@@ -699,16 +2247,18 @@ def structural_force_to_ssi(force_floor, z):
 
     A horizontal force on floor ``i`` does work through that floor's absolute
     motion ``x_i = u_f + z_i*theta_f + v_i``, so it contributes to the sway and
-    rocking DOFs as well: ``Q = [F_1..F_N, sum F_i, sum z_i F_i]``.
+    rocking DOFs as well: ``Q = [F_1..F_N, sum F_i, sum z_i F_i]``. Floors
+    run along the last axis, so batches of loads map in one call.
     """
     F = np.asarray(force_floor, dtype=float)
     z = np.asarray(z, dtype=float)
-    return np.concatenate([F, [float(F.sum()), float((z * F).sum())]])
+    return np.concatenate([F, F.sum(axis=-1, keepdims=True),
+                           (z * F).sum(axis=-1, keepdims=True)], axis=-1)
 
 
 def seismic_force(M, influence, ground_acceleration):
     """Effective earthquake force ``-M @ influence * a_g`` for the given system."""
-    return -np.asarray(M, dtype=float) @ np.asarray(influence, dtype=float) * ground_acceleration
+    return -(_as_matrix(M) @ np.asarray(influence, dtype=float)) * ground_acceleration
 
 
 # ---------------------------------------------------------------------------
@@ -753,6 +2303,34 @@ class WindLoad:
         gust_factor = (1.0 + self.turbulence_intensity * self._fluctuation(t)) ** 2
         return self._mean_force * gust_factor
 
+    def gust_factors(self, times):
+        """Gust multiplier ``(1 + I u(t))^2`` of the mean force at each of ``times``."""
+        times = np.asarray(times, dtype=float)
+        phases = times[..., None] * self._omega + self._phase
+        fluctuation = self._amp * np.cos(phases).sum(axis=-1)
+        return (1.0 + self.turbulence_intensity * fluctuation) ** 2
+
+    def force_history(self, times):
+        """Per-floor forces at every one of ``times``: a ``(T, N)`` array (N).
+
+        The same values as calling :meth:`force_at` per time, from one
+        broadcast evaluation.
+        """
+        return self.gust_factors(times)[:, None] * self._mean_force
+
+    def force_chunks(self, dt, duration, chunk_steps=4096, start=0.0):
+        """Stream the force history at ``t = start + i dt`` over ``duration``.
+
+        Yields ``(times, forces)`` pairs of at most ``chunk_steps`` rows, so an
+        hours-long storm can be fed to a (batch) integrator with memory bounded
+        by one chunk. Times are computed from the step index, so the chunks
+        join up exactly.
+        """
+        num_samples = int(math.floor(duration / dt + 1e-9)) + 1
+        for first in range(0, num_samples, chunk_steps):
+            times = start + np.arange(first, min(first + chunk_steps, num_samples)) * dt
+            yield times, self.force_history(times)
+
 
 def wind_speed_profile(z, reference_speed, z_ref=10.0, exponent=0.16):
     """Power-law mean wind speed at height ``z`` (m/s)."""
@@ -764,17 +2342,80 @@ def wind_speed_profile(z, reference_speed, z_ref=10.0, exponent=0.16):
 # Ground motion (harmonic, synthetic Kanai-Tajimi, recorded)
 # ---------------------------------------------------------------------------
 
+@dataclass
+class ResponseSpectrum:
+    """Elastic response spectrum of one ground-motion record.
+
+    ``Sd`` is the peak relative displacement (m) of each linear oscillator,
+    shape ``(len(zetas), len(periods))``. ``Sv`` and ``Sa`` are the
+    pseudo-velocity ``omega Sd`` and pseudo-acceleration ``omega^2 Sd``.
+    """
+    periods: np.ndarray
+    zetas: np.ndarray
+    Sd: np.ndarray
+
+    @property
+    def Sv(self):
+        return (2.0 * np.pi / self.periods) * self.Sd
+
+    @property
+    def Sa(self):
+        return (2.0 * np.pi / self.periods) ** 2 * self.Sd
+
+
 class GroundMotion:
     """Base class: a ground-acceleration history, callable as ``a_g(t)`` (m/s^2)."""
 
     def __call__(self, t):
         raise NotImplementedError
 
+    def at(self, times):
+        """Accelerations at an array of ``times`` (same shape), in one call.
+
+        Subclasses override this with a vectorised evaluation; the fallback
+        just calls the motion once per time. A scalar time gives a float.
+        """
+        times = np.asarray(times, dtype=float)
+        if times.ndim == 0:
+            return float(self(float(times)))
+        return np.array([self(float(t)) for t in times.ravel()]).reshape(times.shape)
+
     def sample(self, dt, duration):
         """Return ``(times, accelerations)`` sampled at ``dt`` over ``duration``."""
         times = np.arange(0.0, duration + dt, dt)
-        accels = np.array([self(float(t)) for t in times])
-        return times, accels
+        return times, self.at(times)
+
+    def _uniform_record(self, dt):
+        """``(dt, accelerations)`` on a uniform grid for spectral analysis."""
+        if dt is None:
+            raise ValueError("dt is required for a motion without a sampled record")
+        duration = getattr(self, "duration", None)
+        if duration is None:
+            raise ValueError("response spectra need a finite-duration motion")
+        return float(dt), self.sample(dt, duration)[1]
+
+    def response_spectrum(self, periods, zetas=0.05, dt=None):
+        """Elastic response spectrum over ``periods`` (s) and damping ratios ``zetas``.
+
+        Every oscillator is advanced with the exact piecewise-linear recurrence
+        of :func:`sdof_recurrence`, all of them together, so hundreds of periods
+        cost little more than one. Sampled records use their own time step
+        unless ``dt`` is given. Results are cached per record and arguments.
+        Returns a :class:`ResponseSpectrum`.
+        """
+        periods = np.atleast_1d(np.asarray(periods, dtype=float))
+        zetas = np.atleast_1d(np.asarray(zetas, dtype=float))
+        if np.any(periods <= 0.0):
+            raise ValueError("periods must be positive")
+        key = (dt, periods.tobytes(), zetas.tobytes())
+        cache = self.__dict__.setdefault("_spectra", {})
+        if key not in cache:
+            step, accels = self._uniform_record(dt)
+            omega = 2.0 * np.pi / periods
+            A, B0, B1 = sdof_recurrence(omega[None, :], zetas[:, None], step)
+            Sd = sdof_peak_displacement(A, B0, B1, -np.asarray(accels, dtype=float))
+            cache[key] = ResponseSpectrum(periods, zetas, Sd)
+        return cache[key]
 
 
 class HarmonicGroundMotion(GroundMotion):
@@ -790,8 +2431,107 @@ class HarmonicGroundMotion(GroundMotion):
             return 0.0
         return self.peak * math.sin(self.omega * t)
 
+    def at(self, times):
+        times = np.asarray(times, dtype=float)
+        t = np.atleast_1d(times)
+        accels = self.peak * np.sin(self.omega * t)
+        if self.duration is not None:
+            accels[(t < 0.0) | (t > self.duration)] = 0.0
+        return float(accels[0]) if times.ndim == 0 else accels
+
+
+class _SampledGroundMotion(GroundMotion):
+    """A motion stored as samples, linearly interpolated and zero outside ``[start, end]``.
+
+    On a uniform grid a query finds its interval by index arithmetic, O(1),
+    instead of a search through the whole record.
+    """
+
+    _sample_times = None
+
+    def _set_record(self, times, accels, start, end):
+        self._accels = accels
+        self._start = float(start)
+        self._end = float(end)
+        self._t0 = float(times[0]) if len(times) else 0.0
+        self._step = None
+        self._sample_times = times
+        steps = np.diff(times)
+        if len(steps) and steps[0] > 0 and np.allclose(steps, steps[0], rtol=1e-9, atol=0.0):
+            self._step = float(steps[0])
+
+    def _set_uniform_record(self, t0, step, accels, start, end):
+        """Like :meth:`_set_record` for samples at ``t0 + i step``, with no time array."""
+        self._accels = accels
+        self._start = float(start)
+        self._end = float(end)
+        self._t0 = float(t0)
+        self._step = float(step)
+        self._sample_times = None
+
+    @property
+    def _times(self):
+        if self._sample_times is None:
+            return self._t0 + np.arange(len(self._accels)) * self._step
+        return self._sample_times
+
+    def __call__(self, t):
+        if t < self._start or t > self._end:
+            return 0.0
+        if self._step is None:
+            return float(np.interp(t, self._times, self._accels))
+        x = (t - self._t0) / self._step
+        i = min(int(x), len(self._accels) - 2)
+        a0 = self._accels[i]
+        return float(a0 + (x - i) * (self._accels[i + 1] - a0))
+
+    def at(self, times):
+        times = np.asarray(times, dtype=float)
+        t = np.atleast_1d(times)
+        outside = (t < self._start) | (t > self._end)
+        if self._step is None:
+            accels = np.interp(t, self._times, self._accels)
+        else:
+            x = (t - self._t0) / self._step
+            i = np.clip(x.astype(np.int64), 0, len(self._accels) - 2)
+            a0 = self._accels[i]
+            accels = a0 + (x - i) * (self._accels[i + 1] - a0)
+        accels[outside] = 0.0
+        return float(accels[0]) if times.ndim == 0 else accels
+
+
+def _cosine_series(amp, phase, omega0, d_omega, dt, num_samples):
+    """``sum_k amp_k cos((omega0 + k d_omega) t_j + phase_k)`` at ``t_j = j dt``.
+
+    The sum over an evenly spaced frequency grid is a chirp-z transform of the
+    complex amplitudes, evaluated with Bluestein's algorithm: writing
+    ``jk = (j^2 + k^2 - (j - k)^2) / 2`` turns it into a convolution, done with
+    FFTs. That costs O((T + K) log(T + K)) work and O(T + K) memory instead of
+    the ``T x K`` phase matrix of direct summation, and gives the same values
+    to round-off. The grid need not line up with the FFT bins.
+    """
+    K = len(amp)
+    T = int(num_samples)
+    theta = d_omega * dt
+    L = 1 << (T + K - 2).bit_length()  # >= T + K - 1: no circular wrap-around
 
-class SyntheticGroundMotion(GroundMotion):
+    def chirp(m):
+        # m*m in integers keeps the (large) phase exact before scaling.
+        return np.exp(0.5j * theta * (m * m).astype(float))
+
+    k = np.arange(K, dtype=np.int64)
+    a = np.zeros(L, dtype=complex)
+    a[:K] = amp * np.exp(1j * np.asarray(phase)) * chirp(k)
+    m = np.arange(-(K - 1), T, dtype=np.int64)
+    b = np.zeros(L, dtype=complex)
+    b[m % L] = np.conj(chirp(m))
+    conv = np.fft.ifft(np.fft.fft(a) * np.fft.fft(b))[:T]
+
+    j = np.arange(T, dtype=np.int64)
+    return (np.exp(1j * omega0 * dt * j) * chirp(j) * conv).real
+
+
+class SyntheticGroundMotion(_SampledGroundMotion):
     """Stochastic ground motion from the Kanai-Tajimi spectrum.
 
     White noise is shaped by the Kanai-Tajimi power spectral density (soil filter
@@ -819,15 +2559,14 @@ class SyntheticGroundMotion(GroundMotion):
 
         times = np.arange(0.0, duration + dt, dt)
         # Spectral representation: sum_k amp_k cos(omega_k t + phase_k).
-        signal = (amp[None, :] * np.cos(np.outer(times, omega) + phase[None, :])).sum(axis=1)
+        signal = _cosine_series(amp, phase, omega[0], d_omega, dt, len(times))
         signal *= self._envelope(times, duration)
 
         peak = np.max(np.abs(signal))
         if peak > 0:
             signal *= (pga_g * GRAVITY) / peak
 
-        self._times = times
-        self._accels = signal
+        self._set_record(times, signal, 0.0, duration)
 
     @staticmethod
     def _envelope(t, duration, rise_frac=0.15, decay_frac=0.55):
@@ -840,52 +2579,163 @@ class SyntheticGroundMotion(GroundMotion):
         env[decaying] = np.exp(-(t[decaying] - t2) / (0.25 * duration))
         return env
 
-    def __call__(self, t):
-        if t < 0.0 or t > self.duration:
-            return 0.0
-        return float(np.interp(t, self._times, self._accels))
+    def _uniform_record(self, dt):
+        if dt is None:
+            return self._step, self._accels
+        return super()._uniform_record(dt)
 
 
-class RecordedGroundMotion(GroundMotion):
+class RecordedGroundMotion(_SampledGroundMotion):
     """A recorded accelerogram, linearly interpolated and optionally rescaled."""
 
     def __init__(self, times, accelerations, scale_to_pga_g=None):
-        self._times = np.asarray(times, dtype=float)
-        self._accels = np.asarray(accelerations, dtype=float)
+        times = np.asarray(times, dtype=float)
+        accels = self._scaled(np.asarray(accelerations, dtype=float), scale_to_pga_g)
+        self.duration = float(times[-1]) if len(times) else 0.0
+        self._set_record(times, accels, times[0] if len(times) else 0.0, self.duration)
+
+    @classmethod
+    def uniform(cls, accelerations, dt, start=0.0, scale_to_pga_g=None):
+        """A record sampled every ``dt`` from ``start``, without a time array.
+
+        The samples are used as given (a memory-mapped array stays mapped)
+        unless ``scale_to_pga_g`` asks for a rescaled copy.
+        """
+        self = cls.__new__(cls)
+        accels = cls._scaled(np.asanyarray(accelerations, dtype=float), scale_to_pga_g)
+        self.duration = float(start + (len(accels) - 1) * dt) if len(accels) else 0.0
+        self._set_uniform_record(start, dt, accels, start, self.duration)
+        return self
+
+    @staticmethod
+    def _scaled(accels, scale_to_pga_g):
         if scale_to_pga_g is not None:
-            peak = np.max(np.abs(self._accels))
+            peak = np.max(np.abs(accels))
             if peak > 0:
-                self._accels = self._accels * (scale_to_pga_g * GRAVITY) / peak
-        self.duration = float(self._times[-1]) if len(self._times) else 0.0
-
-    def __call__(self, t):
-        if t < self._times[0] or t > self._times[-1]:
-            return 0.0
-        return float(np.interp(t, self._times, self._accels))
+                accels = accels * (scale_to_pga_g * GRAVITY) / peak
+        return accels
+
+    def _uniform_record(self, dt):
+        if dt is None and self._step is not None:
+            return self._step, self._accels
+        steps = np.diff(self._times)
+        if dt is None and len(steps) and np.allclose(steps, steps[0]):
+            return float(steps[0]), self._accels
+        if dt is None:
+            # Irregularly sampled: resample at the typical spacing.
+            dt = float(np.median(steps))
+        return super()._uniform_record(dt)
 
     @classmethod
     def from_file(cls, path, dt=None, time_column=0, accel_column=1,
                   units_g=False, scale_to_pga_g=None):
-        """Load an accelerogram from a whitespace/CSV text file.
+        """Load an accelerogram from a text file (see :func:`parse_accelerogram`).
 
-        Two-column files are read as ``(time, accel)``; single-column files need
-        an explicit ``dt``. ``units_g=True`` converts a record stored in g to
-        m/s^2.
+        ``units_g=True`` converts a record stored in g to m/s^2, and
+        ``units_g=None`` takes the units from the file header (m/s^2 if it
+        does not say). By default the samples are read as m/s^2.
         """
-        data = np.loadtxt(path)
-        if data.ndim == 1:
-            if dt is None:
-                raise ValueError("single-column record requires dt")
-            accels = data
-            times = np.arange(len(accels)) * dt
-        else:
-            times = data[:, time_column]
-            accels = data[:, accel_column]
-        if units_g:
+        with open(path) as f:
+            text = f.read()
+        times, step, accels, in_g = parse_accelerogram(text, dt, time_column, accel_column)
+        if units_g if units_g is not None else in_g:
             accels = accels * GRAVITY
+        if times is None:
+            return cls.uniform(accels, step, scale_to_pga_g=scale_to_pga_g)
         return cls(times, accels, scale_to_pga_g=scale_to_pga_g)
 
 
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[EeDd][-+]?\d+)?")
+_HEADER_NPTS_DT = (
+    # PEER NGA: "NPTS=  5115, DT=   .0050 SEC" (and "DT=.005 NPTS=5115").
+    re.compile(r"NPTS\s*[=:]\s*(?P<npts>\d+)\s*,?\s*DT\s*[=:]\s*(?P<dt>" + _NUMBER.pattern + ")", re.I),
+    re.compile(r"DT\s*[=:]\s*(?P<dt>" + _NUMBER.pattern + r")\s*\w*\s*,?\s*NPTS\s*[=:]\s*(?P<npts>\d+)",
+               re.I),
+    # Newer PEER files: "5115    0.0050    NPTS, DT".
+    re.compile(r"(?P<npts>\d+)\s+(?P<dt>" + _NUMBER.pattern + r")\s+NPTS\s*,\s*DT", re.I),
+)
+_HEADER_DT = re.compile(r"\b(?:DT|time\s+step)\s*[=:]\s*(?P<dt>" + _NUMBER.pattern + ")", re.I)
+_HEADER_UNITS_G = re.compile(r"\bunits?\s+(?:of\s+)?g\b|\(g\)|\bin\s+g\b", re.I)
+
+
+def _is_data_line(line):
+    """True if ``line`` holds only numbers and separators (no header text)."""
+    return bool(_NUMBER.search(line)) and not _NUMBER.sub("", line).strip(" \t,;")
+
+
+def _is_time_table(rows, columns, time_column, npts):
+    """Whether number rows read as a ``(time, accel, ...)`` table, not row-wise samples.
+
+    Row-wise samples (as in PEER files) usually end with a short row, and
+    their first column is not a clock; a table has equal rows, one per
+    ``NPTS`` sample if the header gives it, and a strictly increasing time
+    column.
+    """
+    if columns < 2 or len(rows) < 2 or time_column >= columns:
+        return False
+    if any(len(row) != columns for row in rows):
+        return False
+    if npts is not None and len(rows) != npts:
+        return False
+    times = np.array([row[time_column] for row in rows], dtype=float)
+    return bool(np.all(np.diff(times) > 0.0))
+
+
+def parse_accelerogram(text, dt=None, time_column=0, accel_column=1):
+    """Parse an accelerogram text file into ``(times, dt, accels, units_g)``.
+
+    Understands:
+
+      * headered strong-motion files (e.g. PEER ``.AT2``): free-text header
+        lines giving ``DT`` (and usually ``NPTS``), then the samples in
+        fixed-width columns read row by row (Fortran ``D`` exponents and numbers that run
+        into each other are handled);
+      * two-column ``(time, accel)`` files (whitespace, comma or semicolon
+        separated), with any header lines skipped -- even if the header
+        mentions a ``DT``, a table whose rows all have the same number of
+        columns and whose ``time_column`` increases is read as a table;
+      * single-column files, which need ``dt``.
+
+    Uniform records come back as ``times=None`` with their ``dt``; otherwise
+    ``dt`` is None. ``units_g`` reports whether the header says the record is
+    in g.
+    """
+    lines = text.splitlines()
+    first = next((i for i, line in enumerate(lines) if _is_data_line(line)), len(lines))
+    header = "\n".join(lines[:first])
+    units_g = bool(_HEADER_UNITS_G.search(header))
+    npts = header_dt = None
+    for pattern in _HEADER_NPTS_DT:
+        match = pattern.search(header)
+        if match:
+            npts = int(match.group("npts"))
+            break
+    match = match or _HEADER_DT.search(header)
+    if match:
+        header_dt = float(match.group("dt").replace("D", "E").replace("d", "e"))
+
+    body = "\n".join(lines[first:]).replace("D", "E").replace("d", "e")
+    rows = [row for row in (_NUMBER.findall(line) for line in body.splitlines()) if row]
+    values = np.array([value for row in rows for value in row], dtype=float)
+    columns = len(rows[0]) if rows else 1
+    if header_dt is not None and _is_time_table(rows, columns, time_column, npts):
+        header_dt = None
+    if header_dt is not None:
+        # The header fixes the sampling: every number is a sample, row by row.
+        if npts is not None:
+            if len(values) < npts:
+                raise ValueError(f"record has {len(values)} samples, header says NPTS={npts}")
+            values = values[:npts]
+        return None, header_dt, values, units_g
+
+    if columns == 1:
+        if dt is None:
+            raise ValueError("single-column record requires dt")
+        return None, float(dt), values, units_g
+    data = values[:len(values) // columns * columns].reshape(-1, columns)
+    return data[:, time_column], None, data[:, accel_column], units_g
+
+
 # ---------------------------------------------------------------------------
 # Flood load (hydrostatic surge + buoyancy)
 # ---------------------------------------------------------------------------
@@ -897,22 +2747,17 @@ def flood_lateral_force(building, water_level, water_density=1000.0):
     ``rho g (h_w - z)`` integrated over each story's submerged strip, lumped to
     that story's upper floor node. (A uniformly surrounding flood cancels
     laterally; the destabilising case is the one-sided head modelled here.)
+
+    ``water_level`` may be an array of levels, e.g. a surge history of length
+    ``T``; the result then has shape ``(T, N)``.
     """
-    n = building.num_stories
     h = building.story_height
-    width = building.footprint_length
-    F = np.zeros(n)
-    for i in range(n):
-        z_bottom = i * h
-        z_top = (i + 1) * h
-        submerged_top = min(z_top, water_level)
-        if submerged_top <= z_bottom:
-            continue
-        seg = submerged_top - z_bottom
-        # integral of (water_level - z) dz from z_bottom to submerged_top
-        pressure_integral = (water_level - z_bottom) * seg - 0.5 * seg * seg
-        F[i] = water_density * GRAVITY * width * pressure_integral
-    return F
+    z_bottom = np.arange(building.num_stories) * h
+    head = np.asarray(water_level, dtype=float)[..., None] - z_bottom
+    seg = np.clip(head, 0.0, h)   # submerged height of each story's strip
+    # integral of (water_level - z) dz from z_bottom to z_bottom + seg
+    pressure_integral = head * seg - 0.5 * seg * seg
+    return water_density * GRAVITY * building.footprint_length * pressure_integral
 
 
 def flood_buoyancy(building, water_level, water_density=1000.0, displacement_fraction=0.9):
@@ -921,30 +2766,102 @@ def flood_buoyancy(building, water_level, water_density=1000.0, displacement_fra
     Returns ``(uplift_N, submerged_volume_m3)``. Uplift reduces the effective
     gravity load on the foundation (and hence overturning resistance / soil
     confinement); ``displacement_fraction`` accounts for the building not being
-    a solid block.
+    a solid block. An array of water levels gives arrays of the same shape.
     """
-    submerged_height = max(0.0, min(water_level, building.total_height))
+    submerged_height = np.clip(water_level, 0.0, building.total_height)
     volume = (building.footprint_length * building.footprint_width
               * submerged_height * displacement_fraction)
     uplift = water_density * GRAVITY * volume
+    if np.ndim(volume) == 0:
+        return float(uplift), float(volume)
     return uplift, volume
 
 
+class FloodLoad:
+    """Flood loads on one building, cached by water level.
+
+    Levels are rounded to ``resolution`` (m) before evaluation, and the
+    per-floor force of the last ``cache_size`` distinct rounded levels is
+    kept. An interactive flood that creeps up a few millimetres a frame, or a
+    long surge history that revisits the same levels, then reuses the same
+    vectors instead of re-integrating. The default 1 cm resolution moves the
+    level by at most 5 mm.
+    """
+
+    def __init__(self, building, water_density=1000.0, resolution=0.01, cache_size=256):
+        self.building = building
+        self.water_density = water_density
+        self.resolution = float(resolution)
+        self.cache_size = int(cache_size)
+        self._forces = OrderedDict()
+
+    def _quantise(self, water_level):
+        return np.rint(np.asarray(water_level, dtype=float) / self.resolution).astype(np.int64)
+
+    def lateral_force(self, water_level):
+        """Per-floor force at one level (N), a read-only cached array."""
+        key = int(self._quantise(water_level))
+        force = self._forces.get(key)
+        if force is None:
+            force = flood_lateral_force(self.building, key * self.resolution, self.water_density)
+            force.flags.writeable = False
+            self._forces[key] = force
+            if len(self._forces) > self.cache_size:
+                self._forces.popitem(last=False)
+        else:
+            self._forces.move_to_end(key)
+        return force
+
+    def lateral_force_history(self, water_levels):
+        """``(..., N)`` per-floor forces for levels of any shape, like :func:`flood_lateral_force`.
+
+        Each distinct rounded level is integrated once.
+        """
+        keys, inverse = np.unique(self._quantise(water_levels), return_inverse=True)
+        forces = flood_lateral_force(self.building, keys * self.resolution, self.water_density)
+        return forces[inverse].reshape(np.shape(water_levels) + (-1,))
+
+    def buoyancy(self, water_level, displacement_fraction=0.9):
+        """:func:`flood_buoyancy` at the rounded level(s)."""
+        level = self._quantise(water_level) * self.resolution
+        return flood_buoyancy(self.building, level, self.water_density, displacement_fraction)
+
+
 # ---------------------------------------------------------------------------
 # Progressive collapse (drift-based failure, hinging, redistribution)
 # ---------------------------------------------------------------------------
 
+def _story_change_vectors(num_nodes, story, delta):
+    """``(W, lam)`` with ``delta`` placed at element ``story`` equal to ``W diag(lam) W^T``.
+
+    ``delta`` (4x4, DOFs ``[v1, th1, v2, th2]``) is factored over its
+    non-zero eigenpairs. ``W`` is ``(num_nodes, 2, r)`` over the ``[v, theta]``
+    DOFs of every floor node and non-zero only at the story's own nodes.
+    """
+    if story == 0:      # the base end is fixed: only the top node moves
+        delta, nodes = delta[2:, 2:], [0]
+    else:
+        nodes = [story - 1, story]
+    lam, G = np.linalg.eigh(delta)
+    keep = np.abs(lam) > 1e-12 * np.abs(lam).max()
+    lam, G = lam[keep], G[:, keep]
+    W = np.zeros((num_nodes, 2, lam.size))
+    W[nodes] = G.reshape(len(nodes), 2, lam.size)
+    return W, lam
+
+
 def story_drifts(structural_displacements, story_height):
     """Inter-story drift ratios from floor distortions relative to the base.
 
     ``drift_i = (v_i - v_{i-1}) / h`` with ``v_0 = 0`` (the base). The input is
     the structural part of the state (``q[:N]`` for the SSI system), since
-    rigid-body sway and rocking do not strain the structure.
+    rigid-body sway and rocking do not strain the structure. Floors run along
+    the last axis, so a ``(B, N)`` batch gives ``(B, N)`` drifts.
     """
     v = np.asarray(structural_displacements, dtype=float)
     inter_story = np.empty_like(v)
-    inter_story[0] = v[0]
-    inter_story[1:] = v[1:] - v[:-1]
+    inter_story[..., 0] = v[..., 0]
+    inter_story[..., 1:] = v[..., 1:] - v[..., :-1]
     return inter_story / story_height
 
 
@@ -968,7 +2885,11 @@ class ProgressiveCollapse:
     every story has hinged.
     """
 
-    def __init__(self, building, residual_stiffness=0.05, collapse_drift=0.10):
+    # Past this many accumulated columns of local change the rotation block
+    # is refactorised rather than corrected.
+    max_update_rank = 16
+
+    def __init__(self, building, residual_stiffness=0.05, collapse_drift=0.10, banded=False):
         self.story_height = building.story_height
         self.num_stories = building.num_stories
         self._EI0 = np.full(self.num_stories, flexural_rigidity(building))
@@ -978,22 +2899,88 @@ class ProgressiveCollapse:
         self.collapse_drift = collapse_drift
         self.failed = np.zeros(self.num_stories, dtype=bool)
         self.is_collapsed = False
+        self.banded = banded
+        # Failures already handed out by stiffness_update().
+        self._reported = np.zeros(self.num_stories, dtype=bool)
+        # The uncondensed [v, theta] stiffness as of the reported failures:
+        # reference blocks plus a local change W diag(lam) W^T, and a solver
+        # for its rotation block (see stiffness_update).
+        self._blocks = None
 
     def _factors(self):
         return np.where(self.failed, self.residual_stiffness, 1.0)
 
+    def _rebase(self):
+        """Assemble the reference blocks from the failures reported so far."""
+        factors = np.where(self._reported, self.residual_stiffness, 1.0)
+        self._blocks = shear_flexural_blocks(self._EI0 * factors, self._GA0 * factors,
+                                             self.story_height, self.num_stories)
+        self._W = np.zeros((2 * self.num_stories, 0))
+        self._lam = np.zeros(0)
+        self._Krr = self._blocks._internal()
+
+    def stiffness_update(self):
+        """Stiffness change from stories that failed since the last call.
+
+        Returns ``(U, D)`` such that ``K_new = K_old + U D U^T`` on the
+        condensed floor DOFs, or None if nothing new failed. A hinge scales one
+        Timoshenko element, a rank-2 change ``W diag(lam) W^T`` of the
+        ``[v, theta]`` system local to the story's two nodes, and condensing
+        the rotations keeps it rank 2, so ``U`` has two columns per story:
+        ``U = W_v - K_vr K_rr^-1 W_r`` and ``D = (diag(lam)^-1 + W_r^T K_rr^-1 W_r)^-1``.
+
+        The stiffness is not reassembled for this. ``K_rr`` is solved with
+        the factor from the last assembly plus a Woodbury correction for the
+        local changes since then, and ``K_vr`` is applied as the assembled
+        blocks plus the same local terms; only after ``max_update_rank``
+        columns of change (or an ill-conditioned correction) are the blocks
+        assembled and ``K_rr`` factorised again.
+        """
+        new = np.flatnonzero(self.failed & ~self._reported)
+        if not new.size:
+            return None
+        if self._blocks is None:
+            self._rebase()
+        n = self.num_stories
+        changes = [_story_change_vectors(n, story, (self.residual_stiffness - 1.0) *
+                                         timoshenko_story_element(self._EI0[story], self._GA0[story],
+                                                                  self.story_height))
+                   for story in new]
+        W = np.concatenate([w for w, _ in changes], axis=2)
+        lam = np.concatenate([l for _, l in changes])
+        r = lam.size
+
+        # K_vr K_rr^-1 W_r with the current K = blocks + W_acc diag(lam_acc) W_acc^T.
+        Krr_inv_Wr = self._Krr.solve(W[:, 1])
+        X = np.zeros((n, 2, r))
+        X[:, 1] = Krr_inv_Wr
+        X = X.reshape(2 * n, r)
+        KX = self._blocks.matvec(X) + self._W @ (self._lam[:, None] * (self._W.T @ X))
+        U = W[:, 0] - KX.reshape(n, 2, r)[:, 0]
+        D = np.linalg.inv(np.diag(1.0 / lam) + W[:, 1].T @ Krr_inv_Wr)
+
+        self._reported[new] = True
+        self._W = np.hstack([self._W, W.reshape(2 * n, r)])
+        self._lam = np.concatenate([self._lam, lam])
+        Krr = _update_factor(self._Krr, W[:, 1], np.diag(lam), self.max_update_rank)
+        if Krr is None:
+            self._rebase()
+        else:
+            self._Krr = Krr
+        return U, D
+
     def stiffness_matrix(self):
         """Current structural stiffness with failed stories softened to hinges."""
         factors = self._factors()
         return assemble_shear_flexural_stiffness(
             self._EI0 * factors, self._GA0 * factors,
-            self.story_height, self.num_stories)
+            self.story_height, self.num_stories, banded=self.banded)
 
     def update(self, structural_displacements):
         """Update failure state from the current deflection.
 
-        Returns ``True`` if any story newly failed (so the caller should rebuild
-        the stiffness matrix and refactorise the integrator).
+        Returns ``True`` if any story newly failed (so the caller should apply
+        :meth:`stiffness_update`, or rebuild the stiffness and refactorise).
         """
         drifts = np.abs(story_drifts(structural_displacements, self.story_height))
         over_capacity = drifts > self.capacity
@@ -1004,3 +2991,53 @@ class ProgressiveCollapse:
         if np.any(drifts > self.collapse_drift) or self.failed.all():
             self.is_collapsed = True
         return changed
+
+
+class BatchProgressiveCollapse:
+    """Vectorised :class:`ProgressiveCollapse` over a batch of buildings.
+
+    Built from one :class:`ProgressiveCollapse` per building (all with the
+    same story count); failure flags are a ``(B, N)`` mask and collapse a
+    ``(B,)`` mask. Buildings that have already collapsed are frozen: their
+    flags no longer change.
+    """
+
+    def __init__(self, collapses):
+        collapses = list(collapses)
+        self.num_stories = collapses[0].num_stories
+        self.story_height = np.array([c.story_height for c in collapses])
+        self.capacity = np.array([c.capacity for c in collapses])
+        self.collapse_drift = np.array([c.collapse_drift for c in collapses])
+        self.residual_stiffness = np.array([c.residual_stiffness for c in collapses])
+        self._EI0 = np.stack([c._EI0 for c in collapses])
+        self._GA0 = np.stack([c._GA0 for c in collapses])
+        self.banded = collapses[0].banded
+        self.failed = np.stack([c.failed for c in collapses])
+        self.is_collapsed = np.array([c.is_collapsed for c in collapses])
+
+    def update(self, structural_displacements):
+        """Update from ``(B, N)`` distortions; returns the ``(B,)`` newly-failed mask."""
+        drifts = np.abs(story_drifts(structural_displacements, self.story_height[:, None]))
+        live = ~self.is_collapsed
+        over_capacity = (drifts > self.capacity[:, None]) & live[:, None]
+        changed = (over_capacity & ~self.failed).any(axis=1)
+        self.failed |= over_capacity
+
+        runaway = (drifts > self.collapse_drift[:, None]).any(axis=1) | self.failed.all(axis=1)
+        self.is_collapsed |= runaway & live
+        return changed
+
+    def stiffness_matrices(self, index):
+        """Softened structural stiffness of the buildings at ``index``.
+
+        A ``(k, N, N)`` stack, or a list of banded matrices if the collapse
+        models use banded storage.
+        """
+        index = np.atleast_1d(np.asarray(index))
+        factors = np.where(self.failed[index], self.residual_stiffness[index, None], 1.0)
+        matrices = [
+            assemble_shear_flexural_stiffness(self._EI0[i] * f, self._GA0[i] * f,
+                                              self.story_height[i], self.num_stories,
+                                              banded=self.banded)
+            for i, f in zip(index, factors)]
+        return matrices if self.banded else np.stack(matrices)
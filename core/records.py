@@ -0,0 +1,165 @@
+"""A library of recorded accelerograms backed by a binary cache.
+
+Strong-motion records usually come as text (PEER ``.AT2`` and similar
+headered files, or plain one/two-column tables), and parsing thousands of
+them on every run is slow. :class:`AccelerogramLibrary` parses each record
+once with :func:`physics.parse_accelerogram` and saves the samples in m/s^2
+as a raw little-endian float64 file. Later opens memory-map that file, so
+opening a record reads no samples at all. A small JSON index keeps each record's step,
+length and PGA, so a whole library can be scanned without touching the
+sample data. A cached record is converted again when its source file's size
+or modification time changes.
+"""
+
+import json
+import mmap
+import os
+
+import numpy as np
+
+from core import physics
+
+RECORD_SUFFIXES = (".at2", ".acc", ".dat", ".txt", ".csv")
+INDEX_NAME = "index.json"
+
+
+class AccelerogramLibrary:
+    """The accelerogram text files in ``root``, opened through a binary cache.
+
+    ``cache_dir`` defaults to ``root/.cache``. ``dt`` is used for files that
+    do not state their sampling. ``units_g`` is as in
+    :meth:`physics.RecordedGroundMotion.from_file`, except that the library's
+    default, None, takes each record's units from its header.
+    """
+
+    def __init__(self, root, cache_dir=None, dt=None, units_g=None):
+        self.root = os.fspath(root)
+        if cache_dir is None:
+            cache_dir = os.path.join(self.root, ".cache")
+        self.cache_dir = os.fspath(cache_dir)
+        self.dt = dt
+        self.units_g = units_g
+        self._index = None
+
+    def names(self):
+        """Record file names in the library, sorted."""
+        return sorted(entry.name for entry in os.scandir(self.root)
+                      if entry.is_file() and entry.name.lower().endswith(RECORD_SUFFIXES))
+
+    def __iter__(self):
+        return iter(self.names())
+
+    def __len__(self):
+        return len(self.names())
+
+    def __contains__(self, name):
+        return os.path.isfile(os.path.join(self.root, name))
+
+    def info(self, name):
+        """Cached metadata of one record: ``dt`` (None if irregular), ``npts``,
+        ``duration`` (s) and ``pga`` (m/s^2)."""
+        entry = self._entry(name)
+        return {key: entry[key] for key in ("dt", "npts", "duration", "pga")}
+
+    def open(self, name, scale_to_pga_g=None):
+        """The record ``name`` as a :class:`physics.RecordedGroundMotion`.
+
+        The samples stay memory-mapped unless ``scale_to_pga_g`` asks for a
+        rescaled copy.
+        """
+        entry = self._entry(name)
+        data = self._map(name, entry)
+        if entry["dt"] is not None:
+            return physics.RecordedGroundMotion.uniform(data, entry["dt"], entry["start"],
+                                                        scale_to_pga_g=scale_to_pga_g)
+        return physics.RecordedGroundMotion(data[0], data[1], scale_to_pga_g=scale_to_pga_g)
+
+    def build(self):
+        """Convert every record whose cache is missing or stale; returns how many."""
+        index = self._load_index()
+        stale = [name for name in self.names() if not self._is_fresh(name, index.get(name))]
+        for name in stale:
+            index[name] = self._convert(name)
+        if stale:
+            self._save_index()
+        return len(stale)
+
+    # -- cache -----------------------------------------------------------------
+
+    def _cache_path(self, name):
+        return os.path.join(self.cache_dir, name + ".f8")
+
+    def _map(self, name, entry):
+        """The cached samples as a read-only array over a memory map."""
+        if not entry["npts"]:
+            return np.empty((0,) if entry["dt"] is not None else (2, 0))
+        # Sizes come from the index, so there is no file header to parse.
+        with open(self._cache_path(name), "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = np.frombuffer(buffer, dtype="<f8")
+        return data if entry["dt"] is not None else data.reshape(2, -1)
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(os.path.join(self.cache_dir, INDEX_NAME)) as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        path = os.path.join(self.cache_dir, INDEX_NAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(self._index, f, indent=1, sort_keys=True)
+        os.replace(path + ".tmp", path)
+
+    def _is_fresh(self, name, entry):
+        if entry is None:
+            return False
+        try:
+            stat = os.stat(os.path.join(self.root, name))
+        except OSError:
+            return False
+        return (stat.st_mtime_ns == entry["mtime_ns"] and stat.st_size == entry["size"]
+                and os.path.exists(self._cache_path(name)))
+
+    def _entry(self, name):
+        index = self._load_index()
+        entry = index.get(name)
+        if not self._is_fresh(name, entry):
+            entry = index[name] = self._convert(name)
+            self._save_index()
+        return entry
+
+    def _convert(self, name):
+        """Parse one text record and write its binary cache; returns its index entry."""
+        source = os.path.join(self.root, name)
+        stat = os.stat(source)
+        with open(source) as f:
+            times, dt, accels, in_g = physics.parse_accelerogram(f.read(), self.dt)
+        if self.units_g if self.units_g is not None else in_g:
+            accels = accels * physics.GRAVITY
+        start = 0.0
+        if times is not None:
+            steps = np.diff(times)
+            if len(steps) and steps[0] > 0 and np.allclose(steps, steps[0], rtol=1e-9, atol=0.0):
+                start, dt, times = float(times[0]), float(steps[0]), None
+        data = accels if times is None else np.stack([times, accels])
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(name)
+        with open(path + ".tmp", "wb") as f:
+            f.write(np.ascontiguousarray(data, dtype="<f8").tobytes())
+        os.replace(path + ".tmp", path)
+        npts = len(accels)
+        duration = (npts - 1) * dt if times is None else float(times[-1] - times[0])
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "dt": dt,
+            "start": start,
+            "npts": npts,
+            "duration": float(duration) if npts else 0.0,
+            "pga": float(np.max(np.abs(accels))) if npts else 0.0,
+        }
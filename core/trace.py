@@ -0,0 +1,183 @@
+"""Named timing spans for finding out where a frame's time goes.
+
+Code reports into the shared :data:`tracer` with ``with tracer.span("name"):``
+or the :meth:`Tracer.traced` decorator. While the tracer is disabled (the
+default) a span is a single attribute check, so the instrumentation can stay
+in the hot paths. Once enabled it records:
+
+* a rolling per-frame breakdown: the time each span name took in each of
+  the last ``history`` frames, delimited by :meth:`Tracer.end_frame`, for an
+  on-screen overlay;
+* the individual spans, with the thread they ran on, in a bounded buffer
+  that :meth:`Tracer.save_chrome_trace` writes out as Chrome trace-event
+  JSON (open it in Perfetto or ``chrome://tracing``).
+
+Spans may nest and may run on several threads (the physics worker reports
+into the same tracer as the main loop). Breakdown times are inclusive, so a
+parent span counts its children too.
+"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+
+class _NullSpan:
+    """What :meth:`Tracer.span` returns while disabled: does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class Tracer:
+    """Collects named spans into per-frame totals and a trace-event buffer.
+
+    ``history`` is how many frames the rolling breakdown covers and
+    ``max_events`` how many spans the trace buffer keeps (the oldest are
+    dropped first).
+    """
+
+    def __init__(self, enabled=False, history=120, max_events=100_000):
+        self.enabled = enabled
+        self.history = int(history)
+        self._events = collections.deque(maxlen=int(max_events))
+        self._frames = collections.deque(maxlen=self.history)
+        self._current = {}
+        self._frame_start = time.perf_counter_ns()
+        self._origin = self._frame_start
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    # -- Recording ----------------------------------------------------------
+
+    def span(self, name):
+        """Context manager timing its body as the span ``name``."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def traced(self, name=None):
+        """Decorator timing every call of a function as a span.
+
+        ``name`` defaults to the function's qualified name.
+        """
+        def decorate(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(span_name, start, time.perf_counter_ns())
+            return wrapper
+        return decorate
+
+    def record(self, name, start_ns, end_ns):
+        """Add a finished span (``perf_counter_ns`` times) from the calling thread."""
+        thread = threading.current_thread()
+        with self._lock:
+            self._current[name] = self._current.get(name, 0) + (end_ns - start_ns)
+            self._events.append((name, start_ns, end_ns - start_ns, thread.ident))
+            self._threads.setdefault(thread.ident, thread.name)
+
+    def end_frame(self):
+        """Close the current frame: its span totals join the rolling breakdown.
+
+        The frame's own wall-clock time is recorded under ``"frame"``. Call
+        once per frame from the main loop.
+        """
+        now = time.perf_counter_ns()
+        if not self.enabled:
+            self._frame_start = now
+            return
+        with self._lock:
+            totals, self._current = self._current, {}
+            totals["frame"] = now - self._frame_start
+            self._frames.append(totals)
+        self._frame_start = now
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+            self._frames.clear()
+            self._current = {}
+        self._frame_start = time.perf_counter_ns()
+
+    # -- Reading ------------------------------------------------------------
+
+    def breakdown(self):
+        """``[(name, mean_ms, max_ms)]`` per span over the rolling window.
+
+        Means are over all frames in the window (a span absent from a frame
+        counts as 0 there), slowest first, with ``"frame"`` leading.
+        """
+        frames = list(self._frames)
+        if not frames:
+            return []
+        totals, peaks = {}, {}
+        for frame in frames:
+            for name, ns in frame.items():
+                totals[name] = totals.get(name, 0) + ns
+                peaks[name] = max(peaks.get(name, 0), ns)
+        rows = [(name, totals[name] / len(frames) / 1e6, peaks[name] / 1e6) for name in totals]
+        rows.sort(key=lambda row: (row[0] != "frame", -row[1]))
+        return rows
+
+    def frame_times(self):
+        """Wall-clock duration (ms) of each frame in the rolling window, oldest first."""
+        return [frame["frame"] / 1e6 for frame in list(self._frames)]
+
+    def chrome_trace(self):
+        """The buffered spans as a Chrome trace-event JSON object (a dict)."""
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        pid = os.getpid()
+        trace = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                  "args": {"name": name}} for tid, name in threads.items()]
+        for name, start, duration, tid in events:
+            trace.append({"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid,
+                          "tid": tid, "ts": (start - self._origin) / 1e3, "dur": duration / 1e3})
+        return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path):
+        """Write :meth:`chrome_trace` to ``path``; returns the number of spans."""
+        trace = self.chrome_trace()
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return sum(1 for event in trace["traceEvents"] if event["ph"] == "X")
+
+
+# The tracer the simulator reports into; enable it to start collecting.
+tracer = Tracer(enabled=bool(os.environ.get("SIM_TRACE")))
@@ -0,0 +1,174 @@
+"""Building physics on a background thread.
+
+Stepping the model and drawing the scene used to share the main loop, so a
+slow frame delayed the physics and the two costs added up. A
+:class:`PhysicsWorker` steps the building on its own thread, paced by a
+:class:`core.clock.FixedStepClock` against the wall clock. After each batch
+of steps it publishes a :class:`core.building_structure.BuildingSnapshot`.
+The snapshot holds write-protected copies of the state, so the renderer
+reads the latest one without locks while the worker keeps stepping its own live state: the live
+state is the back buffer, the published snapshot the front, and publishing
+swaps them with a single reference assignment.
+
+Anything that changes the simulation (a new building, a soil swap, starting
+a quake) must happen on the worker thread between steps: hand it over with
+:meth:`PhysicsWorker.submit`. State that the loads keep for themselves
+(the flood level, whether a quake is running) belongs to the worker too and
+reaches other threads only inside the published snapshots. numpy releases
+the GIL inside its larger kernels, so a thread, rather than a process,
+already overlaps most of the stepping with drawing, and the building never
+has to be pickled.
+"""
+
+import queue
+import threading
+import time
+
+from core.clock import FixedStepClock
+
+
+class PhysicsWorker:
+    """Steps ``building`` in the background and publishes snapshots of it.
+
+    ``loads(t)`` is called on the worker thread before every step with the
+    simulated time at the end of that step, and returns the
+    ``(ground_acceleration, wind_force, flood_force)`` arguments of
+    :meth:`Building.update_physics`. If ``loads`` also has a ``snapshot()``
+    method, each published snapshot carries its (immutable) result as
+    ``snapshot.loads``. ``time_scale`` and ``max_frame_time`` are passed to
+    the worker's :class:`FixedStepClock` (``self.clock``).
+    """
+
+    def __init__(self, building, loads, time_scale=1.0, max_frame_time=0.25):
+        self.building = building
+        self.loads = loads
+        self.clock = FixedStepClock(building.dt, time_scale, max_frame_time)
+        self._snapshot = self._take_snapshot()
+        self._commands = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+        self.error = None               # what stopped the thread, if it failed
+
+    @property
+    def snapshot(self):
+        """The most recently published :class:`BuildingSnapshot`.
+
+        Raises if the worker thread has died, so a failure in the physics
+        surfaces in the thread that draws rather than freezing the scene.
+        """
+        if self.error is not None:
+            raise RuntimeError("the physics worker stopped") from self.error
+        return self._snapshot
+
+    def interpolation_alpha(self, snapshot=None, now=None):
+        """How far to draw ``snapshot`` (default: the latest) past its previous step.
+
+        Grows from 0 when the snapshot is published to 1 one step of
+        simulated time later, so drawing ``floor_displacements(alpha)`` stays
+        smooth between publishes, one step behind the model.
+        """
+        snapshot = snapshot or self._snapshot
+        now = time.perf_counter() if now is None else now
+        elapsed = (now - snapshot.wall_time) * self.clock.time_scale
+        return min(1.0, max(0.0, elapsed / self.clock.step))
+
+    # -- Commands (run on the worker thread) ----------------------------------
+
+    def submit(self, command, *args):
+        """Run ``command(*args)`` on the worker thread before its next step."""
+        self._commands.put((command, args))
+        self._wake.set()
+
+    def set_building(self, building):
+        """Continue with ``building`` from the next step on."""
+        self.submit(self._install, building)
+
+    def set_time_scale(self, time_scale):
+        self.submit(setattr, self.clock, "time_scale", float(time_scale))
+
+    def _install(self, building):
+        self.building = building
+        self.clock.step = building.dt
+
+    def _run_commands(self):
+        ran = False
+        while True:
+            try:
+                command, args = self._commands.get_nowait()
+            except queue.Empty:
+                return ran
+            command(*args)
+            ran = True
+
+    # -- Stepping -------------------------------------------------------------
+
+    def advance(self, elapsed):
+        """Run pending commands and the steps due after ``elapsed`` wall-clock
+        seconds, then publish a snapshot; returns the number of steps run.
+
+        The worker thread calls this in a loop; call it directly to step
+        synchronously (the worker must not be running then).
+        """
+        changed = self._run_commands()
+        steps = 0
+        if not self.building.is_destroyed:
+            # A step is only taken from the clock when it runs, so the
+            # published sim_time stops with the building.
+            for t in self.clock.steps(elapsed):
+                self.building.update_physics(None, *self.loads(t))
+                steps += 1
+                if self.building.is_destroyed:
+                    break
+        if steps or changed:
+            self._snapshot = self._take_snapshot()
+        return steps
+
+    def _take_snapshot(self):
+        state = getattr(self.loads, "snapshot", None)
+        return self.building.snapshot(self.clock.time, state() if state is not None else None)
+
+    def start(self):
+        """Start stepping on a daemon thread (a no-op if already running)."""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="physics", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop the thread after its current batch of steps."""
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _run(self):
+        try:
+            self._loop()
+        except Exception as exc:
+            self.error = exc
+
+    def _loop(self):
+        last = time.perf_counter()
+        while not self._stopping:
+            self._wake.clear()
+            now = time.perf_counter()
+            self.advance(now - last)
+            last = now
+            # Sleep until the next step is due, or a command arrives.
+            clock = self.clock
+            if clock.time_scale > 0.0:
+                wait = (1.0 - clock.alpha) * clock.step / clock.time_scale
+            else:
+                wait = clock.max_frame_time
+            self._wake.wait(wait)
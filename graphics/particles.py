@@ -0,0 +1,136 @@
+"""Weather particles (rain, wind streaks) as struct-of-arrays numpy fields.
+
+A :class:`ParticleField` keeps every particle's position, velocity and
+streak vector in parallel arrays, so advecting and respawning them is a
+handful of vectorised operations however many there are, and
+:meth:`graphics.renderer.Renderer.render_rain_particles` /
+:meth:`~graphics.renderer.Renderer.render_wind_particles` rasterise the
+whole field in one batch.
+"""
+
+import numpy as np
+
+from config import settings
+from core import physics
+
+
+class ParticleField:
+    """Streak particles on a ``width`` x ``height`` screen (pixels).
+
+    Particle ``i`` is drawn from ``(x[i], y[i])`` to ``(x[i] + dx[i], y[i] + dy[i])``
+    and moves at ``(vx[i], vy[i])`` px/s. ``color`` is the RGBA the field is
+    drawn in. Subclasses decide where particles (re)spawn and when they
+    leave the screen.
+    """
+
+    def __init__(self, width, height, color, seed=None):
+        self.width = width
+        self.height = height
+        self.color = color
+        self.rng = np.random.default_rng(seed)
+        self._allocate(0)
+
+    def _allocate(self, count):
+        self.x, self.y, self.vx, self.vy, self.dx, self.dy = np.zeros((6, count))
+
+    def __len__(self):
+        return len(self.x)
+
+    def clear(self):
+        """Remove every particle."""
+        self._allocate(0)
+
+    def update(self, delta_time):
+        """Advect every particle and respawn those that left the screen."""
+        self.x += self.vx * delta_time
+        self.y += self.vy * delta_time
+        gone = np.flatnonzero(self._expired())
+        if gone.size:
+            self._respawn(gone, initial=False)
+
+    def streaks(self):
+        """``(N, 4)`` array of ``x0, y0, x1, y1`` per particle."""
+        return np.stack([self.x, self.y, self.x + self.dx, self.y + self.dy], axis=1)
+
+    def _spawn(self, count):
+        self._allocate(int(count))
+        self._respawn(np.arange(len(self)), initial=True)
+
+    def _expired(self):
+        raise NotImplementedError
+
+    def _respawn(self, index, initial):
+        raise NotImplementedError
+
+
+class RainField(ParticleField):
+    """Falling rain streaks, each in its own column, slanted ``slant`` px."""
+
+    def __init__(self, width, height, speed=(450.0, 700.0), length=(8.0, 16.0), slant=2.0,
+                 color=(190, 215, 235, 150), seed=None):
+        super().__init__(width, height, color, seed)
+        self.speed = speed
+        self.length = length
+        self.slant = slant
+
+    def spawn(self, count):
+        """Replace the field with ``count`` drops spread over the screen width."""
+        self._spawn(count)
+
+    def _expired(self):
+        return self.y > self.height
+
+    def _respawn(self, index, initial):
+        rng, n = self.rng, len(index)
+        if initial:
+            self.x[index] = rng.uniform(0.0, self.width, n)
+            self.vy[index] = rng.uniform(*self.speed, n)
+            self.dy[index] = rng.uniform(*self.length, n)
+            self.dx[index] = self.slant
+            self.y[index] = rng.uniform(-self.height / 4, 0.0, n)
+        else:
+            self.y[index] = rng.uniform(-self.height / 4, -self.dy[index])
+
+
+class WindField(ParticleField):
+    """Horizontal wind streaks moving with the mean wind at their height.
+
+    ``ground_y`` is the screen y of the ground the heights are measured
+    from. Streak speeds follow :func:`core.physics.wind_speed_profile`
+    (``speed`` is the speed at its 10 m reference height), with heights
+    below ``min_height`` (m) treated as ``min_height``; streaks are longer
+    the faster they move.
+    """
+
+    def __init__(self, width, height, ground_y=None, min_height=1.0,
+                 color=(220, 225, 235, 130), seed=None):
+        super().__init__(width, height, color, seed)
+        self.ground_y = height if ground_y is None else ground_y
+        self.min_height = min_height
+        self.speed = 0.0
+
+    def spawn(self, count, speed):
+        """Replace the field with ``count`` streaks in a wind of ``speed`` m/s."""
+        self.speed = float(speed)
+        self._spawn(count)
+
+    def _expired(self):
+        if self.speed >= 0.0:
+            return self.x > self.width + np.abs(self.dx)
+        return self.x < -np.abs(self.dx)
+
+    def _respawn(self, index, initial):
+        rng, n = self.rng, len(index)
+        m2p = settings.METERS_TO_PIXELS
+        y = rng.uniform(0.0, self.height, n)
+        z = np.maximum((self.ground_y - y) / m2p, self.min_height)
+        vx = np.copysign(physics.wind_speed_profile(z, abs(self.speed)) * m2p, self.speed)
+        length = np.maximum(8.0, np.abs(vx) * 0.06)
+        self.y[index] = y
+        self.vx[index] = vx
+        self.dx[index] = np.copysign(length, self.speed)
+        if self.speed >= 0.0:
+            self.x[index] = rng.uniform(-self.width / 4, 0.0, n) if initial else -length
+        else:
+            self.x[index] = (rng.uniform(self.width, self.width * 1.25, n) if initial
+                             else self.width + length)
@@ -2,8 +2,10 @@ import pygame
 from pygame import gfxdraw
 import random
 import math
+from collections import OrderedDict
 import numpy as np
 from config import settings  # For METERS_TO_PIXELS and colors
+from core.trace import tracer
 
 
 # ---------------------------------------------------------------------------
@@ -58,7 +60,10 @@ def aa_polygon(surface, points, color):
 
 
 def gradient_polygon(surface, points, top_color, bottom_color, alpha=255):
-    """Fill an arbitrary polygon with a vertical gradient (handles sheared shapes)."""
+    """Fill an arbitrary polygon with a vertical gradient (handles sheared shapes).
+
+    Returns the rect of ``surface`` drawn to.
+    """
     xs = [p[0] for p in points]
     ys = [p[1] for p in points]
     min_x, max_x = int(math.floor(min(xs))), int(math.ceil(max(xs)))
@@ -71,7 +76,36 @@ def gradient_polygon(surface, points, top_color, bottom_color, alpha=255):
     local = [(p[0] - min_x, p[1] - min_y) for p in points]
     aa_polygon(mask, local, (255, 255, 255, 255))
     grad.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-    surface.blit(grad, (min_x, min_y))
+    return surface.blit(grad, (min_x, min_y))
+
+
+def bounding_rect(points, pad=1):
+    """The integer rect covering ``points``, grown by ``pad`` pixels for anti-aliasing."""
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    left, top = int(math.floor(min(xs))) - pad, int(math.floor(min(ys))) - pad
+    return pygame.Rect(left, top, int(math.ceil(max(xs))) + pad + 1 - left,
+                       int(math.ceil(max(ys))) + pad + 1 - top)
+
+
+def union_rects(rects):
+    """The rect covering all of ``rects`` (None entries skipped), or None."""
+    rects = [r for r in rects if r]
+    return rects[0].unionall(rects[1:]) if rects else None
+
+
+def merge_rects(rects):
+    """Merge overlapping rects so each screen region appears once."""
+    merged = []
+    for rect in sorted((pygame.Rect(r) for r in rects if r), key=lambda r: (r.x, r.y)):
+        for i, other in enumerate(merged):
+            if rect.colliderect(other):
+                merged[i] = other.union(rect)
+                break
+        else:
+            merged.append(rect)
+    # A union can grow into a neighbour; repeat until nothing overlaps.
+    return merged if len(merged) == len([r for r in rects if r]) else merge_rects(merged)
 
 
 def radial_glow(radius, color, max_alpha):
@@ -132,8 +166,8 @@ class Cloud:
     def draw(self, surface):
         if self._sprite is None:
             self._build_sprite()
-        surface.blit(self._sprite, (self.rect.centerx - self._sprite.get_width() // 2,
-                                    self.rect.centery - self._sprite.get_height() // 2))
+        return surface.blit(self._sprite, (self.rect.centerx - self._sprite.get_width() // 2,
+                                           self.rect.centery - self._sprite.get_height() // 2))
 
 
 class BuildingFragment:
@@ -216,51 +250,8 @@ class BuildingFragment:
             gradient_polygon(surface, world_points_pixels, top, bottom)
             pts = [(int(round(x)), int(round(y))) for x, y in world_points_pixels]
             gfxdraw.aapolygon(surface, pts, scale_color(self.color, 0.45))
-
-
-class RainParticle:
-    def __init__(self, x_start, screen_height, speed_y, length, color=(190, 215, 235)):
-        self.x = x_start
-        self.y = random.randint(-screen_height // 4, 0)
-        self.screen_height = screen_height
-        self.speed_y = speed_y
-        self.length = length
-        self.color = color[:3]
-
-    def update(self, delta_time):
-        self.y += self.speed_y * delta_time
-        if self.y > self.screen_height:
-            self.y = random.randint(-self.screen_height // 4, -self.length)
-
-    def draw(self, surface):
-        pygame.draw.line(surface, self.color, (self.x, self.y), (self.x, self.y + self.length), 1)
-
-
-class WindParticle:
-    def __init__(self, screen_width, screen_height, velocity_mps):
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        self.velocity_x_pixels_s = velocity_mps * settings.METERS_TO_PIXELS
-
-        self.y = random.randint(0, screen_height)
-        self.x = random.randint(-screen_width // 4, 0) if self.velocity_x_pixels_s > 0 else random.randint(screen_width, screen_width + screen_width // 4)
-
-        self.length = max(8, abs(self.velocity_x_pixels_s) * 0.06)
-        self.color = (220, 225, 235)
-
-    def update(self, delta_time):
-        self.x += self.velocity_x_pixels_s * delta_time
-        if self.velocity_x_pixels_s > 0 and self.x > self.screen_width + self.length:
-            self.x = -self.length
-            self.y = random.randint(0, self.screen_height)
-        elif self.velocity_x_pixels_s < 0 and self.x < -self.length:
-            self.x = self.screen_width + self.length
-            self.y = random.randint(0, self.screen_height)
-
-    def draw(self, surface):
-        start_pos = (self.x, self.y)
-        end_pos = (self.x + self.length * math.copysign(1, self.velocity_x_pixels_s), self.y)
-        pygame.draw.line(surface, self.color, start_pos, end_pos, 1)
+            return bounding_rect(world_points_pixels)
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -274,8 +265,24 @@ class Renderer:
         self.width = screen.get_width()
         self.height = screen.get_height()
         self._backdrop_cache = {}  # biome_code -> pre-rendered sky/sun/hills surface
-        # Reusable transparent layer for alpha particle batches.
+        self._facade_cache = OrderedDict()  # building geometry -> baked facade
+        # Reusable transparent layer for alpha particle batches and overlays.
         self._fx_layer = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        # Particle coverage mask with a one-pixel border that takes the
+        # samples falling off screen, and the per-sample scratch arrays.
+        self._coverage = np.zeros((self.height + 2, self.width + 2), np.uint8)
+        self._streak_samples = (np.empty(0, np.float32), np.empty(0, np.float32),
+                                np.empty(0, np.int32))
+        self._flood_cache = OrderedDict()   # water level (px) -> baked water body
+        self._flood_ground = None           # the ground points the cache was baked over
+        # Dirty-rectangle state (see render_world and present).
+        self._background = None             # backdrop + ground for _background_key
+        self._ground_layer = None           # the ground alone, transparent elsewhere
+        self._background_key = None
+        self._needs_full_redraw = True
+        self._frame_is_full = True
+        self._dirty = []                    # regions drawn over the background last frame
+        self._erased = []                   # regions restored at the start of this frame
 
     # -- Backdrop (cached per biome) ----------------------------------------
 
@@ -328,74 +335,158 @@ class Renderer:
 
     # -- Top-level scene ----------------------------------------------------
 
+    @tracer.traced("render.world")
     def render_world(self, current_biome_code="Af", building_to_draw=None, building_x_position=None,
                      clouds=None, active_fragments=None, destruction_animation_playing=False,
                      liquefaction_effect_scale=0.0, wind_particles=None, rain_particles=None,
-                     flood_water_surface_y_px=None):
-        self.screen.blit(self._get_backdrop(current_biome_code), (0, 0))
-
-        if clouds:
-            self.render_clouds(clouds)
-
+                     flood_water_surface_y_px=None, interpolation_alpha=1.0, state=None):
+        """Draw the whole scene.
+
+        The sky, hills and ground are static, so they are baked into one
+        background per biome and terrain. A frame restores the background
+        only under the regions drawn last frame, then draws the moving parts
+        (clouds, particles, the building, water) again and remembers where.
+        :meth:`present` then shows just those regions. The whole screen is
+        redrawn when the background changes or after :meth:`invalidate`.
+
+        ``state`` is a :class:`core.building_structure.BuildingSnapshot` of
+        ``building_to_draw`` to draw instead of the building's live state
+        (e.g. from a :class:`core.worker.PhysicsWorker`).
+        """
         ground_points = self.biome_generator.generate_ground_points(
             current_biome_code, liquefaction_effect_scale=liquefaction_effect_scale)
-        self.render_ground(current_biome_code, ground_points)
+        background = self._get_background(current_biome_code, ground_points)
+
+        erased = merge_rects(self._dirty)
+        full = self._needs_full_redraw or (
+            sum(r.width * r.height for r in erased) > 0.6 * self.width * self.height)
+        if full:
+            self.screen.blit(background, (0, 0))
+        else:
+            for rect in erased:
+                self.screen.blit(background, rect, rect)
+        self._needs_full_redraw = False
+        self._frame_is_full = full
+        self._erased = erased
+        drawn = self._dirty = []
+
+        if clouds:
+            # Clouds pass behind the terrain: put the ground back over them.
+            rect = self.render_clouds(clouds)
+            if rect:
+                rect = rect.clip(self.screen.get_rect())
+                self.screen.blit(self._ground_layer, rect, rect)
+            drawn.append(rect)
 
         if wind_particles:
-            self.render_wind_particles(wind_particles)
+            drawn.append(self.render_wind_particles(wind_particles))
 
         if building_to_draw:
-            if building_to_draw.is_destroyed:
+            state = state or building_to_draw
+            if state.is_destroyed:
                 if destruction_animation_playing and active_fragments:
-                    self.render_fragments(active_fragments)
+                    drawn.append(self.render_fragments(active_fragments))
                 elif not destruction_animation_playing:
-                    self.render_static_rubble_pile(building_to_draw, building_x_position,
-                                                   current_biome_code, liquefaction_effect_scale)
+                    drawn.append(self.render_static_rubble_pile(
+                        building_to_draw, building_x_position, current_biome_code,
+                        liquefaction_effect_scale))
             else:
                 if building_x_position is not None:
-                    self.render_building(building_to_draw, building_x_position,
-                                         current_biome_code, liquefaction_effect_scale)
+                    drawn.append(self.render_building(building_to_draw, building_x_position,
+                                                      current_biome_code, liquefaction_effect_scale,
+                                                      interpolation_alpha, state))
 
         if rain_particles:
-            self.render_rain_particles(rain_particles)
+            drawn.append(self.render_rain_particles(rain_particles))
 
         if flood_water_surface_y_px is not None:
-            self.render_flood_water(flood_water_surface_y_px, ground_points)
+            drawn.append(self.render_flood_water(flood_water_surface_y_px, ground_points))
+
+        screen_rect = self.screen.get_rect()
+        drawn[:] = [rect.clip(screen_rect) for rect in drawn if rect]
+
+    def invalidate(self):
+        """Redraw the whole screen next frame (e.g. under a modal dialog)."""
+        self._needs_full_redraw = True
+
+    def present(self, overlay_rects=()):
+        """Show the frame drawn by :meth:`render_world` on the display.
+
+        ``overlay_rects`` are the regions drawn on top of the scene since
+        (UI, readouts). They are shown now and restored from the background
+        next frame like the scene's own regions. Only the regions that changed
+        are sent to the display, unless the whole screen was redrawn.
+        """
+        screen_rect = self.screen.get_rect()
+        self._dirty.extend(pygame.Rect(r).clip(screen_rect) for r in overlay_rects if r)
+        if self._frame_is_full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(merge_rects(self._erased + self._dirty))
+
+    def _get_background(self, biome_code, ground_points):
+        """The backdrop with the ground drawn in, rebuilt when either changes."""
+        key = self._background_key
+        if key is None or key[0] != biome_code or key[1] is not ground_points:
+            background = self._get_backdrop(biome_code).copy()
+            self.render_ground(biome_code, ground_points, background)
+            # The background's own ground pixels, with the terrain's coverage
+            # as alpha, to lay back over anything drawn behind the terrain.
+            mask = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            self.render_ground(biome_code, ground_points, mask)
+            mask.fill((255, 255, 255, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            ground = background.convert_alpha()
+            ground.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            self._ground_layer = ground
+            self._background = background
+            self._background_key = (biome_code, ground_points)
+            self._needs_full_redraw = True
+        return self._background
 
     # -- Ground -------------------------------------------------------------
 
-    def render_ground(self, biome_code, ground_points):
+    @tracer.traced("render.ground")
+    def render_ground(self, biome_code, ground_points, surface=None):
+        """Draw the terrain onto ``surface`` (default: the screen); returns its rect."""
+        surface = self.screen if surface is None else surface
         props = self.biome_generator.get_biome_properties(biome_code)
         ground = props["ground"]
         surface_color = scale_color(ground, 1.25)
         deep_color = scale_color(ground, 0.55)
 
-        gradient_polygon(self.screen, ground_points, surface_color, deep_color)
+        rect = gradient_polygon(surface, ground_points, surface_color, deep_color)
 
         # Bright grass/soil rim along the terrain crest for definition.
         crest = [p for p in ground_points if not (p[1] >= self.height - 1)]
         if len(crest) >= 2:
             rim = [(int(round(x)), int(round(y))) for x, y in crest]
-            pygame.draw.aalines(self.screen, scale_color(ground, 1.5), False, rim)
+            pygame.draw.aalines(surface, scale_color(ground, 1.5), False, rim)
             # A soft highlight just under the crest.
             shade = [(x, y + 3) for x, y in rim]
-            pygame.draw.aalines(self.screen, scale_color(ground, 1.05), False, shade)
+            pygame.draw.aalines(surface, scale_color(ground, 1.05), False, shade)
+            rect = rect.union(bounding_rect(rim))
+        return rect
 
     # -- Clouds -------------------------------------------------------------
 
+    @tracer.traced("render.clouds")
     def render_clouds(self, clouds):
-        for cloud in clouds:
-            cloud.draw(self.screen)
+        return union_rects(cloud.draw(self.screen) for cloud in clouds)
 
     # -- Building -----------------------------------------------------------
 
-    def render_building(self, building, x_center_screen, biome_code, liquefaction_effect_scale=0.0):
+    @tracer.traced("render.building")
+    def render_building(self, building, x_center_screen, biome_code, liquefaction_effect_scale=0.0,
+                        alpha=1.0, state=None):
         """Draw the building as a per-story deformed stack following the model.
 
         Each floor level is offset horizontally by the model's lateral
         displacement there (foundation sway + rocking + structural distortion),
         so the rendered shape is the actual mode/response profile -- straight
-        sway, soft-story kinks, and base translation all show up.
+        sway, soft-story kinks, and base translation all show up. ``alpha``
+        draws that far between the model's last two fixed steps; ``state``
+        (default: the building itself) supplies the response. Returns the
+        rect drawn to.
         """
         M2P = settings.METERS_TO_PIXELS
         n = building.num_stories
@@ -409,9 +500,10 @@ class Renderer:
         base_y = self.biome_generator.get_ground_y_at_x(x_center_screen, biome_code, liquefaction_effect_scale)
 
         # Horizontal pixel offset at each floor level k = 0 (base) .. n (roof).
-        disp = building.floor_displacements()  # metres, floors 1..n
-        offsets = [building.base_sway * M2P] + [float(d) * M2P for d in disp]
-        failed = building.collapse.failed
+        state = state or building
+        disp = state.floor_displacements(alpha)  # metres, floors 1..n
+        offsets = [state.foundation_sway(alpha) * M2P] + [float(d) * M2P for d in disp]
+        failed = state.failed_stories
 
         left_pts, right_pts = [], []
         for k in range(n + 1):
@@ -419,87 +511,148 @@ class Renderer:
             left_pts.append((x_left + offsets[k], y))
             right_pts.append((x_right + offsets[k], y))
 
-        self._draw_contact_shadow(x_center_screen + offsets[0], base_y, width_px)
+        shadow = self._draw_contact_shadow(x_center_screen + offsets[0], base_y, width_px)
 
         body = settings.GRAY
         polygon = left_pts + right_pts[::-1]
-        gradient_polygon(self.screen, polygon, scale_color(body, 1.25), scale_color(body, 0.8))
+        self._draw_facade(building, x_left, base_y, width_px, story_px, offsets)
 
         # Highlight the lit (left) edge and shade the right edge.
         pygame.draw.aalines(self.screen, scale_color(body, 1.5), False, left_pts)
         pygame.draw.aalines(self.screen, scale_color(body, 0.55), False, right_pts)
 
         # Mark hinged/failed stories with a translucent red overlay.
-        for s in range(n):
-            if failed[s]:
-                quad = [left_pts[s], right_pts[s], right_pts[s + 1], left_pts[s + 1]]
-                layer = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                aa_polygon(layer, quad, (200, 60, 50, 110))
-                self.screen.blit(layer, (0, 0))
-
-        # Floor slab lines.
-        for k in range(n + 1):
-            pygame.draw.aaline(self.screen, scale_color(body, 0.6), left_pts[k], right_pts[k])
-
-        self._draw_windows(building, left_pts, right_pts, story_px)
+        quads = [[left_pts[s], right_pts[s], right_pts[s + 1], left_pts[s + 1]]
+                 for s in range(n) if failed[s]]
+        if quads:
+            self._blit_translucent_polygons(quads, (200, 60, 50, 110))
 
         gfxdraw.aapolygon(self.screen, [(int(round(x)), int(round(y))) for x, y in polygon],
                           scale_color(body, 0.4))
+        return shadow.union(bounding_rect(polygon, pad=2))
+
+    def _blit_translucent_polygons(self, polygons, color):
+        """Blend translucent polygons onto the screen through the reusable layer.
+
+        Only the polygons' bounding rect of the layer is cleared and blitted.
+        """
+        rect = bounding_rect([p for poly in polygons for p in poly])
+        rect = rect.clip(self._fx_layer.get_rect())
+        if not rect:
+            return
+        layer = self._fx_layer
+        layer.fill((0, 0, 0, 0), rect)
+        for poly in polygons:
+            aa_polygon(layer, poly, color)
+        self.screen.blit(layer, rect.topleft, rect)
 
     def _draw_contact_shadow(self, x_center, ground_y, width):
         shadow = pygame.Surface((int(width * 1.6), 40), pygame.SRCALPHA)
         gfxdraw.filled_ellipse(shadow, shadow.get_width() // 2, 20,
                                int(width * 0.7), 14, (0, 0, 0, 90))
-        self.screen.blit(shadow, (x_center - shadow.get_width() // 2, ground_y - 12))
+        return self.screen.blit(shadow, (x_center - shadow.get_width() // 2, ground_y - 12))
+
+    FACADE_CACHE_SIZE = 8
 
-    @staticmethod
-    def _lerp_point(a, b, t):
-        return (a[0] + (b[0] - a[0]) * t, a[1] + (b[1] - a[1]) * t)
+    def _get_facade(self, building, width_px, story_px):
+        """The undeformed facade for this building's geometry, baked once.
 
-    def _draw_windows(self, building, left_pts, right_pts, story_px):
+        Returns ``(surface, row_areas)``: the facade's bottom rows up to the
+        screen height (nothing higher can be on screen while the base is)
+        and a 1-pixel-high source rect per row for :meth:`_draw_facade`.
+        """
+        key = (building.num_stories, round(story_px, 3), round(width_px, 3),
+               int(building.footprint_length))
+        facade = self._facade_cache.get(key)
+        if facade is None:
+            facade = self._bake_facade(building, width_px, story_px)
+            self._facade_cache[key] = facade
+            if len(self._facade_cache) > self.FACADE_CACHE_SIZE:
+                self._facade_cache.popitem(last=False)
+        else:
+            self._facade_cache.move_to_end(key)
+        return facade
+
+    @tracer.traced("render.facade_bake")
+    def _bake_facade(self, building, width_px, story_px):
         n = building.num_stories
+        full_h = n * story_px
+        w = max(1, int(round(width_px)))
+        h = max(1, min(int(math.ceil(full_h)), self.height))
+
+        # Body gradient over the whole building, of which the bottom h rows are kept.
+        body = settings.GRAY
+        top, bottom = scale_color(body, 1.25), scale_color(body, 0.8)
+        surf = vertical_gradient(w, h, lerp_color(bottom, top, h / full_h), bottom)
+
+        def level_y(k):     # texture row of floor level k (0 = base)
+            return h - k * story_px
+
+        # Floor slab lines.
+        visible_stories = min(n, int(math.ceil(h / story_px)))
+        for k in range(visible_stories + 1):
+            y = min(h - 1, max(0, int(round(level_y(k)))))
+            pygame.draw.line(surf, scale_color(body, 0.6), (0, y), (w - 1, y))
+
+        # Windows, lit at random but repeatably for a given building.
         num_windows = max(1, int(building.footprint_length / 5))
         window_width = story_px * 0.3
         window_height = story_px * 0.5
-
         rng = random.Random(building.num_stories * 131 + int(building.footprint_length))
         lit_warm = (255, 224, 150)
-        glass_top = (200, 228, 240)
-        glass_bottom = (120, 165, 195)
+        glow = radial_glow(int(window_width), lit_warm, 60)
+        pane = vertical_gradient(max(1, int(window_width)), max(1, int(window_height)),
+                                 (200, 228, 240), (120, 165, 195))
+        frame = scale_color(settings.GRAY, 0.4)
 
-        for s in range(n):
-            bottom_l, bottom_r = left_pts[s], right_pts[s]
-            top_l, top_r = left_pts[s + 1], right_pts[s + 1]
+        for s in range(visible_stories):
+            cy = level_y(s + 0.5)
             for i in range(num_windows):
-                frac = (i + 0.5) / num_windows
-                bottom = self._lerp_point(bottom_l, bottom_r, frac)
-                top = self._lerp_point(top_l, top_r, frac)
-                cx = (bottom[0] + top[0]) / 2
-                cy = (bottom[1] + top[1]) / 2
+                cx = (i + 0.5) / num_windows * w
                 rect = pygame.Rect(cx - window_width / 2, cy - window_height / 2,
                                    window_width, window_height)
-
                 if rng.random() < 0.28:
-                    pygame.draw.rect(self.screen, lit_warm, rect)
-                    glow = radial_glow(int(window_width), lit_warm, 60)
-                    self.screen.blit(glow, (rect.centerx - glow.get_width() // 2,
-                                            rect.centery - glow.get_height() // 2),
-                                     special_flags=pygame.BLEND_RGBA_ADD)
+                    pygame.draw.rect(surf, lit_warm, rect)
+                    surf.blit(glow, (rect.centerx - glow.get_width() // 2,
+                                     rect.centery - glow.get_height() // 2),
+                              special_flags=pygame.BLEND_RGBA_ADD)
                 else:
-                    grad = vertical_gradient(max(1, int(rect.width)), max(1, int(rect.height)),
-                                             glass_top, glass_bottom)
-                    self.screen.blit(grad, rect.topleft)
-                    pygame.draw.aaline(self.screen, (235, 245, 250),
+                    surf.blit(pane, rect.topleft)
+                    pygame.draw.aaline(surf, (235, 245, 250),
                                        (rect.left + 2, rect.bottom - 3),
                                        (rect.left + rect.width * 0.55, rect.top + 2))
-                pygame.draw.rect(self.screen, scale_color(settings.GRAY, 0.4), rect, 1)
+                pygame.draw.rect(surf, frame, rect, 1)
+
+        rows = [pygame.Rect(0, r, w, 1) for r in range(h)]
+        return surf.convert_alpha(), rows
+
+    @tracer.traced("render.facade")
+    def _draw_facade(self, building, x_left, base_y, width_px, story_px, offsets):
+        """Blit the baked facade sheared row by row to follow the deformed stack.
+
+        Each story is a horizontal shear of its undeformed strip, so every
+        pixel row moves by the lateral offset interpolated between the floor
+        levels above and below it. The cost is one blit per visible row,
+        however many windows there are.
+        """
+        surf, rows = self._get_facade(building, width_px, story_px)
+        h = len(rows)
+        bottom = int(round(base_y))
+        heights = h - 0.5 - np.arange(h)         # row centres above the base (px)
+        levels = np.arange(len(offsets)) * story_px
+        xs = np.rint(x_left + np.interp(heights, levels, offsets)).astype(int).tolist()
+        first = max(0, h - bottom)              # rows above the screen top are skipped
+        top = bottom - h
+        self.screen.blits([(surf, (xs[r], top + r), rows[r]) for r in range(first, h)],
+                          doreturn=False)
 
     # -- Fragments / rubble -------------------------------------------------
 
+    @tracer.traced("render.fragments")
     def render_fragments(self, fragments):
-        for fragment in fragments:
-            fragment.draw(self.screen)
+        return union_rects(fragment.draw(self.screen) for fragment in fragments)
 
+    @tracer.traced("render.rubble")
     def render_static_rubble_pile(self, building, x_center_screen, biome_code, liquefaction_effect_scale=0.0):
         rubble_width_pixels = building.footprint_length * settings.METERS_TO_PIXELS * 1.2
         rubble_height_pixels = building.total_height * settings.METERS_TO_PIXELS * 0.2
@@ -509,8 +662,8 @@ class Renderer:
         ground_y_left = self.biome_generator.get_ground_y_at_x(building_x_left, biome_code, liquefaction_effect_scale)
         ground_y_right = self.biome_generator.get_ground_y_at_x(building_x_right, biome_code, liquefaction_effect_scale)
 
-        self._draw_contact_shadow(x_center_screen, (ground_y_left + ground_y_right) / 2,
-                                  rubble_width_pixels)
+        shadow = self._draw_contact_shadow(x_center_screen, (ground_y_left + ground_y_right) / 2,
+                                           rubble_width_pixels)
 
         points = [
             (building_x_left, ground_y_left),
@@ -522,78 +675,149 @@ class Renderer:
         gradient_polygon(self.screen, points, scale_color(settings.GRAY, 1.1), scale_color(settings.GRAY, 0.7))
         gfxdraw.aapolygon(self.screen, [(int(round(x)), int(round(y))) for x, y in points],
                           scale_color(settings.GRAY, 0.4))
+        return shadow.union(bounding_rect(points))
 
     # -- Weather particles --------------------------------------------------
 
+    @tracer.traced("render.wind_particles")
     def render_wind_particles(self, wind_particles):
-        self._fx_layer.fill((0, 0, 0, 0))
-        for p in wind_particles:
-            sign = math.copysign(1, p.velocity_x_pixels_s)
-            head = (p.x + p.length * sign, p.y)
-            tail = (p.x, p.y)
-            pygame.draw.aaline(self._fx_layer, (*p.color, 130), tail, head)
-        self.screen.blit(self._fx_layer, (0, 0))
+        """Draw a :class:`graphics.particles.WindField`; returns the rect drawn to."""
+        return self._blit_particle_field(wind_particles)
 
+    @tracer.traced("render.rain_particles")
     def render_rain_particles(self, rain_particles):
-        self._fx_layer.fill((0, 0, 0, 0))
-        # Slight wind-driven slant for liveliness.
-        slant = 2
-        for p in rain_particles:
-            start = (p.x, p.y)
-            end = (p.x + slant, p.y + p.length)
-            pygame.draw.line(self._fx_layer, (*p.color, 150), start, end, 1)
-        self.screen.blit(self._fx_layer, (0, 0))
+        """Draw a :class:`graphics.particles.RainField`; returns the rect drawn to."""
+        return self._blit_particle_field(rain_particles)
+
+    def _streak_scratch(self, n, steps):
+        """``(n, steps)`` x, y and index arrays, reused across frames."""
+        xs, ys, index = self._streak_samples
+        if xs.size < n * steps:
+            size = max(n * steps, 2 * xs.size)
+            xs, ys, index = self._streak_samples = (
+                np.empty(size, np.float32), np.empty(size, np.float32), np.empty(size, np.int32))
+        return tuple(a[:n * steps].reshape(n, steps) for a in (xs, ys, index))
+
+    def _blit_particle_field(self, field):
+        """Rasterise every streak of ``field`` at once and blend it onto the screen.
+
+        Each streak is sampled at one-pixel steps along its length (with numpy,
+        for all particles together) into the renderer's coverage mask, which
+        becomes the alpha of the reusable layer, in the field's colour.
+        Samples past the screen edges are clamped into the mask's border
+        rather than clipped. Only the field's bounding rect of the mask and
+        the layer is touched.
+        """
+        if not len(field):
+            return None
+        x0, y0, x1, y1 = field.streaks().astype(np.float32).T
+        lo_x, hi_x = np.minimum(x0, x1), np.maximum(x0, x1)
+        lo_y, hi_y = np.minimum(y0, y1), np.maximum(y0, y1)
+        visible = (hi_x >= 0) & (lo_x < self.width) & (hi_y >= 0) & (lo_y < self.height)
+        if not visible.any():
+            return None
+        x0, y0 = x0[visible], y0[visible]
+        dx, dy = x1[visible] - x0, y1[visible] - y0
+        steps = int(np.ceil(np.sqrt((dx * dx + dy * dy).max()))) + 1
+        t = np.linspace(0.0, 1.0, steps, dtype=np.float32)
+        xs, ys, index = self._streak_scratch(len(x0), steps)
+        offset = np.float32(1.5)      # the border, plus rounding to the nearest pixel
+        np.multiply(dx[:, None], t, out=xs)
+        xs += (x0 + offset)[:, None]
+        np.clip(xs, 0.0, self.width + 1, out=xs)
+        np.multiply(dy[:, None], t, out=ys)
+        ys += (y0 + offset)[:, None]
+        np.clip(ys, 0.0, self.height + 1, out=ys)
+        stride = self.width + 2
+        index[:] = ys
+        index *= np.int32(stride)
+        np.add(index, xs, out=index, casting="unsafe")
+
+        left = max(0, int(lo_x[visible].min()))
+        top = max(0, int(lo_y[visible].min()))
+        right = min(self.width, int(np.ceil(hi_x[visible].max())) + 1)
+        bottom = min(self.height, int(np.ceil(hi_y[visible].max())) + 1)
+        *rgb, alpha = field.color
+        coverage = self._coverage[1:-1, 1:-1]
+        coverage[top:bottom, left:right] = 0
+        self._coverage.reshape(-1)[index] = alpha
+
+        rect = pygame.Rect(left, top, right - left, bottom - top)
+        layer = self._fx_layer
+        layer.fill((*rgb, 0), rect)
+        layer_alpha = pygame.surfarray.pixels_alpha(layer)
+        layer_alpha[left:right, top:bottom] = coverage[top:bottom, left:right].T
+        del layer_alpha  # release the surface lock before blitting
+        return self.screen.blit(layer, rect.topleft, rect)
 
     # -- Flood --------------------------------------------------------------
 
+    FLOOD_CACHE_SIZE = 4
+    FLOOD_MARGIN = 2    # rows above the water line the ripple highlight may reach
+
+    @tracer.traced("render.flood_water")
     def render_flood_water(self, water_surface_y_px, underlying_ground_points):
         """Render translucent flood water as a flat-topped body over the terrain.
 
         The water polygon runs along the flat surface line, then back along the
         terrain crest (reversed) so it correctly fills the gap between the water
-        line and the ground.
+        line and the ground. The body is baked once per whole-pixel water level
+        (for the last few levels) and reused until the terrain changes.
         """
         if water_surface_y_px >= self.height - 1:
             return
-
+        level = int(round(water_surface_y_px))
+        cache = self._flood_cache
+        if underlying_ground_points is not self._flood_ground:
+            self._flood_ground = underlying_ground_points
+            cache.clear()
+        if level in cache:
+            cache.move_to_end(level)
+            body = cache[level]
+        else:
+            body = cache[level] = self._bake_flood_water(level, underlying_ground_points)
+            if len(cache) > self.FLOOD_CACHE_SIZE:
+                cache.popitem(last=False)
+        if body is not None:
+            return self.screen.blit(body, (0, level - self.FLOOD_MARGIN))
+        return None
+
+    @tracer.traced("render.flood_bake")
+    def _bake_flood_water(self, level, underlying_ground_points):
+        """The water body below the line ``y = level``, or None if there is no terrain."""
         # Terrain crest points (exclude the two bottom-closing corners), left->right.
         crest = [p for p in underlying_ground_points if not (p[1] >= self.height - 1)]
         if len(crest) < 2:
-            return
+            return None
 
-        water_poly = [(0, water_surface_y_px), (self.width, water_surface_y_px)]
+        water_poly = [(0, level), (self.width, level)]
         for x, y in reversed(crest):
             # Where terrain rises above the water line, clamp to the water surface.
-            water_poly.append((x, max(y, water_surface_y_px)))
+            water_poly.append((x, max(y, level)))
 
-        layer = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        depth = self.height - water_surface_y_px
+        margin = self.FLOOD_MARGIN
+        depth = max(1, self.height - level)
+        layer = pygame.Surface((self.width, depth + margin), pygame.SRCALPHA)
         top = (90, 170, 210, 120)
         bottom = (30, 90, 140, 180)
         # Gradient body clipped to the water polygon.
-        grad = vertical_gradient(self.width, max(1, int(depth)), top[:3], bottom[:3], alpha=150)
-        mask = pygame.Surface((self.width, max(1, int(depth))), pygame.SRCALPHA)
-        local = [(x, y - water_surface_y_px) for x, y in water_poly]
+        grad = vertical_gradient(self.width, depth, top[:3], bottom[:3], alpha=150)
+        mask = pygame.Surface((self.width, depth), pygame.SRCALPHA)
+        local = [(x, y - level) for x, y in water_poly]
         aa_polygon(mask, local, (255, 255, 255, 255))
         grad.blit(mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-        layer.blit(grad, (0, water_surface_y_px))
+        layer.blit(grad, (0, margin))
 
         # Specular surface line with a subtle ripple, only where water exists
         # (i.e. where the terrain sits below the water line).
-        def ground_y_at(x):
-            prev = crest[0]
-            for pt in crest[1:]:
-                if prev[0] <= x <= pt[0]:
-                    span = pt[0] - prev[0]
-                    t = 0.0 if span == 0 else (x - prev[0]) / span
-                    return prev[1] + (pt[1] - prev[1]) * t
-                prev = pt
-            return prev[1]
+        xs = np.arange(0, self.width + 1, 16)
+        crest_x, crest_y = np.array(crest, dtype=float).T
+        underwater = (np.interp(xs, crest_x, crest_y) > level).tolist()
 
         segment = []
-        for x in range(0, self.width + 1, 16):
-            if ground_y_at(x) > water_surface_y_px:  # terrain is underwater here
-                segment.append((x, water_surface_y_px + 1.5 * math.sin(x * 0.05)))
+        for x, wet in zip(xs.tolist(), underwater):
+            if wet:
+                segment.append((x, margin + 1.5 * math.sin(x * 0.05)))
             elif len(segment) >= 2:
                 pygame.draw.aalines(layer, (220, 240, 250, 200), False, segment)
                 segment = []
@@ -601,4 +825,4 @@ class Renderer:
                 segment = []
         if len(segment) >= 2:
             pygame.draw.aalines(layer, (220, 240, 250, 200), False, segment)
-        self.screen.blit(layer, (0, 0))
+        return layer.convert_alpha()
@@ -1,11 +1,17 @@
 import random
+import time
+from dataclasses import dataclass
+
 import pygame
 import pygame_gui
 
 from config import settings
-from graphics.renderer import Renderer, Cloud, WindParticle, RainParticle
+from graphics.renderer import Renderer, Cloud
+from graphics.particles import RainField, WindField
 from core.biome_generator import BiomeGenerator
 from core import physics
+from core.worker import PhysicsWorker
+from core.trace import tracer
 from core.building_structure import (
     Building, CONCRETE, STEEL, WOOD, StructuralSystemType, MassDistribution,
 )
@@ -30,6 +36,95 @@ SOILS = {
 MOTIONS = ["Synthetic", "Harmonic"]
 
 
+@dataclass(frozen=True)
+class HazardState:
+    """What :class:`Hazards` reports with each published snapshot."""
+
+    quake_active: bool
+    liquefied: bool
+    water_level_m: float
+
+
+class Hazards:
+    """The environmental loads on the building, owned by the physics worker.
+
+    An instance is the worker's ``loads`` callable. Its state (the running
+    quake, the flood level, a liquefied soil) changes only on the worker
+    thread, so the UI changes it through ``worker.submit`` and reads it back
+    as ``snapshot.loads``, a :class:`HazardState`.
+    """
+
+    def __init__(self, building, soil):
+        self.wind_load = None
+        self.ground_motion = None
+        self.quake_t = 0.0
+        self.quake_active = False
+        self.rain_rate = None   # mm/hr while it rains
+        self.water_level_m = 0.0
+        self.install(building, soil, None)
+
+    def install(self, building, soil, wind_speed):
+        """Load ``building``, standing on ``soil`` (its un-liquefied profile)."""
+        self.building = building
+        self.soil = soil
+        self.liquefied = False
+        self.flood_load = physics.FloodLoad(building)
+        self.set_wind(wind_speed)
+
+    def set_wind(self, speed):
+        self.wind_load = physics.WindLoad(self.building, speed) if speed is not None else None
+
+    def set_rain(self, rate):
+        """Rain at ``rate`` mm/hr, or stop raining with ``None``."""
+        self.rain_rate = rate
+
+    def reset(self):
+        self.water_level_m = 0.0
+        self.wind_load = None
+        self.rain_rate = None
+
+    def start_quake(self, pga, motion):
+        if motion == "Harmonic":
+            self.ground_motion = physics.HarmonicGroundMotion(pga_g=pga, frequency_hz=1.5, duration=10.0)
+        else:
+            self.ground_motion = physics.SyntheticGroundMotion(pga_g=pga, duration=18.0, seed=random.randint(0, 9999))
+        self.quake_active = True
+        self.quake_t = 0.0
+        # Strong shaking liquefies the chosen soil for the duration of the event.
+        if pga >= 0.4 and not self.liquefied:
+            self.building.set_soil_profile(self.soil.with_shear_modulus_factor(0.05))
+            self.liquefied = True
+
+    def end_quake(self):
+        self.quake_active = False
+        if self.liquefied:
+            self.building.set_soil_profile(self.soil)
+            self.liquefied = False
+
+    def __call__(self, t):
+        """Loads for the model step ending at simulated time ``t``."""
+        step_dt = self.building.dt
+        ground_accel = 0.0
+        if self.quake_active:
+            ground_accel = self.ground_motion(self.quake_t)
+            self.quake_t += step_dt
+            if self.quake_t > self.ground_motion.duration:
+                self.end_quake()
+
+        wind_force = self.wind_load.force_at(t) if self.wind_load is not None else None
+
+        if self.rain_rate is not None:
+            self.water_level_m += (self.rain_rate / 100.0) * 0.4 * step_dt
+        else:
+            self.water_level_m = max(0.0, self.water_level_m - 0.05 * step_dt)
+        flood_force = (self.flood_load.lateral_force(self.water_level_m)
+                       if self.water_level_m > 0.01 else None)
+        return ground_accel, wind_force, flood_force
+
+    def snapshot(self):
+        return HazardState(self.quake_active, self.liquefied, self.water_level_m)
+
+
 def main():
     pygame.init()
     screen = pygame.display.set_mode((settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT))
@@ -45,18 +140,26 @@ def main():
     W, H = settings.SCREEN_WIDTH, settings.SCREEN_HEIGHT
 
     # --- UI construction helpers -------------------------------------------
+    # Screen regions the UI draws over (a dropdown's includes its expanded
+    # list); the renderer redraws them every frame.
+    ui_rects = []
+
     def label(x, y, w, text, container=None):
-        return pygame_gui.elements.UILabel(pygame.Rect((x, y), (w, 20)), text, manager=ui)
+        ui_rects.append(pygame.Rect((x, y), (w, 20)))
+        return pygame_gui.elements.UILabel(ui_rects[-1].copy(), text, manager=ui)
 
     def slider(x, y, w, start, rng):
+        ui_rects.append(pygame.Rect((x, y), (w, 22)))
         return pygame_gui.elements.UIHorizontalSlider(
-            pygame.Rect((x, y), (w, 22)), start_value=start, value_range=rng, manager=ui)
+            ui_rects[-1].copy(), start_value=start, value_range=rng, manager=ui)
 
     def dropdown(x, y, w, options, start):
+        ui_rects.append(pygame.Rect((x, y), (w, 26 * (len(options) + 1) + 4)))
         return pygame_gui.elements.UIDropDownMenu(options, start, pygame.Rect((x, y), (w, 26)), manager=ui)
 
     def button(x, y, w, text):
-        return pygame_gui.elements.UIButton(pygame.Rect((x, y), (w, 30)), text, manager=ui)
+        ui_rects.append(pygame.Rect((x, y), (w, 30)))
+        return pygame_gui.elements.UIButton(ui_rects[-1].copy(), text, manager=ui)
 
     # --- Left column: structure --------------------------------------------
     lx, lw = 12, 210
@@ -93,7 +196,9 @@ def main():
     b_quake = button(rx, y, rw, "Trigger Quake"); y += 36
     label(rx, y, rw, "Rainfall (mm/hr)"); y += 18
     s_rain = slider(rx, y, rw, 80, (0, 200)); y += 26
-    b_rain = button(rx, y, rw, "Start Rainfall"); y += 30
+    b_rain = button(rx, y, rw, "Start Rainfall"); y += 36
+    label(rx, y, rw, "Time Scale (x)"); y += 18
+    s_time_scale = slider(rx, y, rw, 1.0, (0.25, 10.0)); y += 26
 
     # --- Model construction -------------------------------------------------
     selected_soil = [SOILS["Firm"]]  # the user's chosen soil (liquefaction swaps temporarily)
@@ -128,69 +233,47 @@ def main():
 
     # --- Mutable run state --------------------------------------------------
     model_dirty = False
-    sim_time = 0.0
 
     wind_on = False
-    wind_load = [None]
-
-    quake_active = False
-    quake_t = 0.0
-    ground_motion = [None]
-    liquefied = False
-
     rain_on = False
-    water_level_m = 0.0
-    wind_particles = []
-    rain_particles = []
+    wind_particles = WindField(W, H, ground_y=biome_generator.get_ground_y_at_x(base_center_x, current_biome))
+    rain_particles = RainField(W, H)
 
     # Destruction state
     destruction_playing = False
     fragments = []
     destruction_timer = 0.0
     dialog = None
+    collapsed_building = None   # the building whose collapse is being shown
+
+    # The physics runs on a worker thread (see core.worker), stepping the
+    # building under the hazards' loads. Both are simulation state, so the
+    # UI changes them with worker.submit() and reads them back from the
+    # published snapshot; physics advances in whole model steps on the
+    # worker's simulated clock, decoupled from the frame rate.
+    hazards = Hazards(building, selected_soil[0])
+    worker = PhysicsWorker(building, hazards)
+
+    def install(new_building, soil, wind_speed):
+        hazards.install(new_building, soil, wind_speed)
+        worker.set_building(new_building)
 
     def rebuild():
-        nonlocal building, wind_load, liquefied
-        building = make_building()
-        if wind_on:
-            wind_load[0] = physics.WindLoad(building, s_wind.get_current_value())
-        liquefied = False
-
-    def start_quake():
-        nonlocal quake_active, quake_t, liquefied
-        pga = s_pga.get_current_value()
-        motion = d_motion.selected_option[0] if isinstance(d_motion.selected_option, tuple) else d_motion.selected_option
-        if motion == "Harmonic":
-            ground_motion[0] = physics.HarmonicGroundMotion(pga_g=pga, frequency_hz=1.5, duration=10.0)
-        else:
-            ground_motion[0] = physics.SyntheticGroundMotion(pga_g=pga, duration=18.0, seed=random.randint(0, 9999))
-        quake_active = True
-        quake_t = 0.0
-        # Strong shaking liquefies the chosen soil for the duration of the event.
-        if pga >= 0.4 and not liquefied:
-            building.set_soil_profile(selected_soil[0].with_shear_modulus_factor(0.05))
-            liquefied = True
+        worker.submit(install, make_building(), selected_soil[0],
+                      s_wind.get_current_value() if wind_on else None)
 
-    def end_quake():
-        nonlocal quake_active, liquefied
-        quake_active = False
-        if liquefied:
-            building.set_soil_profile(selected_soil[0])
-            liquefied = False
+    worker.start()
 
     def spawn_wind_particles():
-        wind_particles.clear()
         speed = s_wind.get_current_value()
-        if speed > 0.1:
-            for _ in range(min(int(speed * 1.5), 150)):
-                wind_particles.append(WindParticle(W, H, speed))
+        wind_particles.spawn(min(int(speed * 40), 3000) if speed > 0.1 else 0, speed)
 
     def spawn_rain_particles():
-        rain_particles.clear()
-        intensity = s_rain.get_current_value()
-        for _ in range(min(int(intensity * 1.5), 320)):
-            x = random.randint(0, W)
-            rain_particles.append(RainParticle(x, H, random.uniform(450, 700), random.uniform(8, 16)))
+        rain_particles.spawn(min(int(s_rain.get_current_value() * 60), 12000))
+
+    # F3 toggles span tracing and its overlay, F4 saves a Chrome trace (see core.trace).
+    show_trace = tracer.enabled
+    trace_status = None   # the last F4 save, shown under the overlay
 
     running = True
     while running:
@@ -200,15 +283,27 @@ def main():
                 running = False
             elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_trace = tracer.enabled = not tracer.enabled
+                tracer.clear()
+                trace_status = None
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F4 and tracer.enabled:
+                path = time.strftime("trace-%Y%m%d-%H%M%S.json")
+                trace_status = f"saved {tracer.save_chrome_trace(path)} spans to {path}"
 
-            ui.process_events(event)
+            with tracer.span("main.ui_events"):
+                ui.process_events(event)
 
             if event.type == pygame_gui.UI_HORIZONTAL_SLIDER_MOVED:
                 if event.ui_element in (s_stories, s_story_h, s_length, s_width, s_ductility):
                     model_dirty = True
+                elif event.ui_element is s_time_scale:
+                    worker.set_time_scale(s_time_scale.get_current_value())
                 elif event.ui_element is s_wind and wind_on:
-                    wind_load[0] = physics.WindLoad(building, s_wind.get_current_value())
+                    worker.submit(hazards.set_wind, s_wind.get_current_value())
                     spawn_wind_particles()
+                elif event.ui_element is s_rain and rain_on:
+                    worker.submit(hazards.set_rain, s_rain.get_current_value())
 
             elif event.type == pygame_gui.UI_DROP_DOWN_MENU_CHANGED:
                 if event.ui_element is d_soil:
@@ -222,19 +317,22 @@ def main():
                     wind_on = not wind_on
                     b_wind.set_text("Stop Wind" if wind_on else "Start Wind")
                     if wind_on:
-                        wind_load[0] = physics.WindLoad(building, s_wind.get_current_value())
+                        worker.submit(hazards.set_wind, s_wind.get_current_value())
                         spawn_wind_particles()
                     else:
-                        wind_load[0] = None
+                        worker.submit(hazards.set_wind, None)
                         wind_particles.clear()
-                elif event.ui_element is b_quake and not building.is_destroyed:
-                    start_quake()
+                elif event.ui_element is b_quake and not worker.snapshot.is_destroyed:
+                    motion = d_motion.selected_option[0] if isinstance(d_motion.selected_option, tuple) else d_motion.selected_option
+                    worker.submit(hazards.start_quake, s_pga.get_current_value(), motion)
                 elif event.ui_element is b_rain:
                     rain_on = not rain_on
                     b_rain.set_text("Stop Rainfall" if rain_on else "Start Rainfall")
                     if rain_on:
+                        worker.submit(hazards.set_rain, s_rain.get_current_value())
                         spawn_rain_particles()
                     else:
+                        worker.submit(hazards.set_rain, None)
                         rain_particles.clear()
 
             elif event.type == pygame_gui.UI_CONFIRMATION_DIALOG_CONFIRMED and event.ui_element is dialog:
@@ -243,7 +341,7 @@ def main():
                 b_wind.set_text("Start Wind")
                 rain_on = False
                 b_rain.set_text("Start Rainfall")
-                water_level_m = 0.0
+                worker.submit(hazards.reset)
                 rain_particles.clear()
                 wind_particles.clear()
                 rebuild()
@@ -254,96 +352,101 @@ def main():
             rebuild()
             model_dirty = False
 
-        ui.update(dt)
-        sim_time += dt
+        with tracer.span("main.ui_update"):
+            ui.update(dt)
 
-        # --- Drive the simulation ------------------------------------------
+        # --- Read the simulation -------------------------------------------
+        # The latest published state; the worker keeps stepping meanwhile.
+        snapshot = worker.snapshot
+        shown = snapshot.building
+        hazard = snapshot.loads
         liq_visual = 0.0
-        if not destruction_playing and not building.is_destroyed:
-            ground_accel = 0.0
-            if quake_active:
-                ground_accel = ground_motion[0](quake_t)
-                quake_t += dt
-                if liquefied:
-                    liq_visual = min(1.0, (s_pga.get_current_value() - 0.4) / 0.6 + 0.3)
-                if quake_t > ground_motion[0].duration:
-                    end_quake()
-
-            wind_force = wind_load[0].force_at(sim_time) if (wind_on and wind_load[0] is not None) else None
-
-            if rain_on:
-                water_level_m += (s_rain.get_current_value() / 100.0) * 0.4 * dt
-            else:
-                water_level_m = max(0.0, water_level_m - 0.05 * dt)
-            flood_force = physics.flood_lateral_force(building, water_level_m) if water_level_m > 0.01 else None
-
-            building.update_physics(dt, ground_accel, wind_force, flood_force)
-
-            if building.is_destroyed and not destruction_playing:
-                destruction_playing = True
-                destruction_timer = 0.0
-                base_x_m = base_center_x / settings.METERS_TO_PIXELS
-                ground_y_px = biome_generator.get_ground_y_at_x(base_center_x, current_biome, liq_visual)
-                base_y_m = ground_y_px / settings.METERS_TO_PIXELS
-                fragments = building.generate_fragments(base_x_m, base_y_m, building.angular_displacement_rad)
+        if hazard.quake_active and hazard.liquefied and not snapshot.is_destroyed:
+            liq_visual = min(1.0, (s_pga.get_current_value() - 0.4) / 0.6 + 0.3)
+        if snapshot.is_destroyed and shown is not collapsed_building:
+            # A destroyed building is no longer stepped, so it is safe to read here.
+            collapsed_building = shown
+            destruction_playing = True
+            destruction_timer = 0.0
+            base_x_m = base_center_x / settings.METERS_TO_PIXELS
+            ground_y_px = biome_generator.get_ground_y_at_x(base_center_x, current_biome, liq_visual)
+            base_y_m = ground_y_px / settings.METERS_TO_PIXELS
+            fragments = shown.generate_fragments(base_x_m, base_y_m, shown.angular_displacement_rad)
 
         # --- Update scene props --------------------------------------------
-        for cloud in clouds:
-            cloud.rect.x += cloud.speed
-            if cloud.speed > 0 and cloud.rect.left > W:
-                cloud.rect.right = 0
-                cloud.rect.y = random.randint(20, H // 3)
-            elif cloud.speed < 0 and cloud.rect.right < 0:
-                cloud.rect.left = W
-                cloud.rect.y = random.randint(20, H // 3)
-        for p in wind_particles:
-            p.update(dt)
-        for p in rain_particles:
-            p.update(dt)
-
-        if destruction_playing:
-            destruction_timer += dt
-            all_settled = bool(fragments)
-            for frag in fragments:
-                frag.update(dt, biome_generator.get_ground_y_at_x, current_biome)
-                if not frag.is_settled:
-                    all_settled = False
-            if (all_settled and fragments) or destruction_timer > 5.0:
-                destruction_playing = False
-                if dialog is None:
-                    dialog = pygame_gui.windows.UIConfirmationDialog(
-                        rect=pygame.Rect((W // 2 - 160, H // 2 - 100), (320, 200)),
-                        manager=ui, window_title="Building Collapsed!",
-                        action_long_desc="The structure has failed. Rebuild and try again?",
-                        action_short_name="Rebuild", blocking=True)
+        with tracer.span("main.props"):
+            for cloud in clouds:
+                cloud.rect.x += cloud.speed
+                if cloud.speed > 0 and cloud.rect.left > W:
+                    cloud.rect.right = 0
+                    cloud.rect.y = random.randint(20, H // 3)
+                elif cloud.speed < 0 and cloud.rect.right < 0:
+                    cloud.rect.left = W
+                    cloud.rect.y = random.randint(20, H // 3)
+            wind_particles.update(dt)
+            rain_particles.update(dt)
+
+            if destruction_playing:
+                destruction_timer += dt
+                all_settled = bool(fragments)
+                for frag in fragments:
+                    frag.update(dt, biome_generator.get_ground_y_at_x, current_biome)
+                    if not frag.is_settled:
+                        all_settled = False
+                if (all_settled and fragments) or destruction_timer > 5.0:
+                    destruction_playing = False
+                    if dialog is None:
+                        dialog = pygame_gui.windows.UIConfirmationDialog(
+                            rect=pygame.Rect((W // 2 - 160, H // 2 - 100), (320, 200)),
+                            manager=ui, window_title="Building Collapsed!",
+                            action_long_desc="The structure has failed. Rebuild and try again?",
+                            action_short_name="Rebuild", blocking=True)
 
         # --- Render ---------------------------------------------------------
         base_ground_y = biome_generator.get_ground_y_at_x(base_center_x, current_biome, liq_visual)
-        flood_surface_y = base_ground_y - water_level_m * settings.METERS_TO_PIXELS
+        flood_surface_y = base_ground_y - hazard.water_level_m * settings.METERS_TO_PIXELS
+        if dialog is not None:
+            renderer.invalidate()   # the modal dialog and its dimming cover the scene
         renderer.render_world(
-            current_biome, building, base_center_x, clouds=clouds,
+            current_biome, shown, base_center_x, clouds=clouds,
             active_fragments=fragments, destruction_animation_playing=destruction_playing,
             liquefaction_effect_scale=liq_visual, wind_particles=wind_particles,
             rain_particles=rain_particles,
-            flood_water_surface_y_px=(flood_surface_y if water_level_m > 0.01 else None))
-
-        draw_readout(screen, info_font, small_font, building, quake_active, water_level_m, liquefied)
-        ui.draw_ui(screen)
-        pygame.display.flip()
-
+            flood_water_surface_y_px=(flood_surface_y if hazard.water_level_m > 0.01 else None),
+            interpolation_alpha=worker.interpolation_alpha(snapshot), state=snapshot)
+
+        with tracer.span("main.readout"):
+            overlays = draw_readout(screen, info_font, small_font, snapshot, hazard.quake_active,
+                                    hazard.water_level_m, hazard.liquefied, worker.clock.time_scale)
+        with tracer.span("main.ui_draw"):
+            ui.draw_ui(screen)
+        overlays += ui_rects
+        if show_trace:
+            overlays.append(draw_trace_overlay(screen, small_font, tracer, trace_status))
+        with tracer.span("main.present"):
+            renderer.present(overlays)
+        tracer.end_frame()
+
+    worker.stop()
     pygame.quit()
 
 
-def draw_readout(screen, font, small_font, building, quake_active, water_level_m, liquefied):
-    """Live structural-response readout across the top-centre of the screen."""
+def draw_readout(screen, font, small_font, state, quake_active, water_level_m, liquefied,
+                 time_scale=1.0):
+    """Live structural-response readout across the top-centre of the screen.
+
+    ``state`` is a :class:`BuildingSnapshot` (or the building itself).
+    Returns the rects drawn to.
+    """
+    building = getattr(state, "building", state)
     cap = building.drift_capacity
-    drift = building.max_drift_ratio
+    drift = state.max_drift_ratio
     ratio = drift / cap if cap > 0 else 0.0
 
-    if building.is_destroyed:
+    if state.is_destroyed:
         status, color = "COLLAPSED", (235, 70, 60)
-    elif building.num_failed_stories > 0:
-        status, color = f"{building.num_failed_stories} STORY HINGED", (240, 170, 60)
+    elif state.num_failed_stories > 0:
+        status, color = f"{state.num_failed_stories} STORY HINGED", (240, 170, 60)
     else:
         status, color = "INTACT", (120, 220, 130)
 
@@ -357,13 +460,13 @@ def draw_readout(screen, font, small_font, building, quake_active, water_level_m
     cx = settings.SCREEN_WIDTH // 2
     line1 = f"T1 = {building.fundamental_period:.2f} s    mass {building.calculated_mass/1e3:,.0f} t"
     surf1 = font.render(line1, True, (245, 245, 245))
-    screen.blit(surf1, (cx - surf1.get_width() // 2, 12))
+    rects = [screen.blit(surf1, (cx - surf1.get_width() // 2, 12))]
 
     drift_txt = small_font.render(f"max drift {100*drift:.2f}%  (capacity {100*cap:.2f}%)", True, drift_color)
-    screen.blit(drift_txt, (cx - drift_txt.get_width() // 2, 36))
+    rects.append(screen.blit(drift_txt, (cx - drift_txt.get_width() // 2, 36)))
 
     status_surf = font.render(status, True, color)
-    screen.blit(status_surf, (cx - status_surf.get_width() // 2, 56))
+    rects.append(screen.blit(status_surf, (cx - status_surf.get_width() // 2, 56)))
 
     tags = []
     if quake_active:
@@ -372,9 +475,57 @@ def draw_readout(screen, font, small_font, building, quake_active, water_level_m
         tags.append("LIQUEFACTION")
     if water_level_m > 0.01:
         tags.append(f"FLOOD {water_level_m:.1f} m")
+    if time_scale != 1.0:
+        tags.append(f"TIME x{time_scale:.2g}")
     if tags:
         tag_surf = small_font.render("  ".join(tags), True, (200, 220, 255))
-        screen.blit(tag_surf, (cx - tag_surf.get_width() // 2, 80))
+        rects.append(screen.blit(tag_surf, (cx - tag_surf.get_width() // 2, 80)))
+    return rects
+
+
+def draw_trace_overlay(screen, font, tracer, status=None):
+    """Rolling frame-time breakdown in the bottom-left corner.
+
+    One line per span (mean and worst ms over the tracer's window, inclusive
+    of nested spans; ``physics.*`` runs on the worker thread, in parallel
+    with the rest), above a bar per recent frame. ``status`` (e.g. where the
+    last trace was saved) is shown as a line above the table. Returns the
+    rect drawn to.
+    """
+    rows = tracer.breakdown()
+    if not rows:
+        return None
+    budget_ms = 1000.0 / settings.FPS
+    line_h = font.get_linesize()
+    graph_h = 40
+    x, y = 12, settings.SCREEN_HEIGHT - 12 - graph_h - line_h * (len(rows) + 1)
+    status_surf = font.render(status, True, (120, 220, 130)) if status else None
+    if status_surf is not None:
+        y -= line_h
+
+    width = max(300, status_surf.get_width() + 12) if status_surf is not None else 300
+    panel = pygame.Surface((width, settings.SCREEN_HEIGHT - y + 6), pygame.SRCALPHA)
+    panel.fill((10, 14, 20, 170))
+    rect = screen.blit(panel, (x - 6, y - 6))
+
+    if status_surf is not None:
+        screen.blit(status_surf, (x, y))
+        y += line_h
+    header = font.render(f"{'span':<22}{'mean':>7}{'max':>7}  ms", True, (200, 220, 255))
+    screen.blit(header, (x, y))
+    for i, (name, mean_ms, max_ms) in enumerate(rows, start=1):
+        color = (235, 70, 60) if max_ms > budget_ms else (235, 235, 235)
+        text = font.render(f"{name[:21]:<22}{mean_ms:>7.2f}{max_ms:>7.2f}", True, color)
+        screen.blit(text, (x, y + i * line_h))
+
+    # Frame-time bars, scaled so the frame budget sits at half height.
+    base = settings.SCREEN_HEIGHT - 12
+    for i, ms in enumerate(tracer.frame_times()[-140:]):
+        h = min(graph_h, int(ms / budget_ms * graph_h / 2))
+        color = (235, 70, 60) if ms > budget_ms * 1.5 else (120, 220, 130)
+        pygame.draw.line(screen, color, (x + 2 * i, base), (x + 2 * i, base - h))
+    pygame.draw.line(screen, (200, 200, 200), (x, base - graph_h // 2), (x + 280, base - graph_h // 2))
+    return rect
 
 
 if __name__ == "__main__":
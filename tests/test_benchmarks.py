@@ -0,0 +1,48 @@
+"""Tests for the benchmark suite and its baseline comparison (benchmarks/suite.py)."""
+
+import os
+import tempfile
+import unittest
+
+from benchmarks import suite
+
+
+def _results(**seconds):
+    return {"meta": {}, "results": {k: {"seconds": s, "number": 1} for k, s in seconds.items()}}
+
+
+class CompareResultsTests(unittest.TestCase):
+    def test_flags_cases_slower_than_the_threshold(self):
+        baseline = _results(a=1.0, b=1.0, c=1.0, gone=1.0)
+        current = _results(a=1.05, b=1.2, c=0.5, new=1.0)
+        rows = {row[0]: row for row in suite.compare_results(baseline, current, threshold=0.1)}
+        self.assertEqual(sorted(rows), ["a", "b", "c"])
+        self.assertFalse(rows["a"][4])
+        self.assertTrue(rows["b"][4])
+        self.assertAlmostEqual(rows["b"][3], 1.2)
+        self.assertFalse(rows["c"][4])
+
+    def test_format_seconds(self):
+        self.assertEqual(suite.format_seconds(2.0), "2 s")
+        self.assertEqual(suite.format_seconds(1.5e-3), "1.5 ms")
+        self.assertEqual(suite.format_seconds(3e-8), "30 ns")
+
+
+class RunSuiteTests(unittest.TestCase):
+    def test_every_case_runs_and_round_trips_through_json(self):
+        results = suite.run_suite(sizes=(2,), min_time=1e-4, repeat=1)
+        expected = {suite.result_key(c.name, 2 if c.sized else None) for c in suite.CASES}
+        self.assertEqual(set(results["results"]), expected)
+        for entry in results["results"].values():
+            self.assertGreater(entry["seconds"], 0.0)
+            self.assertGreaterEqual(entry["number"], 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baselines", "run.json")
+            suite.save_results(results, path)
+            loaded = suite.load_results(path)
+        self.assertEqual(loaded, results)
+        self.assertFalse(any(row[4] for row in suite.compare_results(loaded, results)))
+
+
+if __name__ == "__main__":
+    unittest.main()
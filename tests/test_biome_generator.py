@@ -0,0 +1,67 @@
+"""Tests for the cached terrain heightfields (core/biome_generator.py)."""
+
+import math
+import unittest
+
+import numpy as np
+
+from core.biome_generator import BIOME_DATA, BiomeGenerator
+
+W, H = 1280, 720
+
+
+def analytic_ground_y(x, code, scale):
+    props = BIOME_DATA[code]
+    amplitude = props["amplitude"] * (1.0 + 0.8 * scale)
+    frequency = props["frequency"] * (1.0 + 0.5 * scale)
+    y = H * props["base_height_factor"] + amplitude * math.sin(frequency * x + props["phase_shift"])
+    return min(H - 1, max(0, y))
+
+
+class HeightfieldTests(unittest.TestCase):
+    def setUp(self):
+        self.biomes = BiomeGenerator(W, H)
+
+    def test_lookups_match_the_terrain_profile(self):
+        xs = np.linspace(0.0, W, 397)
+        for code in BIOME_DATA:
+            for scale in (0.0, 0.5, 1.0):
+                expected = [analytic_ground_y(x, code, scale) for x in xs]
+                ys = self.biomes.get_ground_y_at_x(xs, code, scale)
+                self.assertEqual(ys.shape, xs.shape)
+                np.testing.assert_allclose(ys, expected, atol=0.01)
+                self.assertAlmostEqual(self.biomes.get_ground_y_at_x(float(xs[5]), code, scale),
+                                       expected[5], delta=0.01)
+        for x in (10, np.float32(10.0), np.int64(10), np.array(10.0)):
+            self.assertIsInstance(self.biomes.get_ground_y_at_x(x, "Af"), float)
+
+    def test_x_is_clamped_to_the_screen(self):
+        self.assertEqual(self.biomes.get_ground_y_at_x(-50.0, "Dfc"),
+                         self.biomes.get_ground_y_at_x(0.0, "Dfc"))
+        np.testing.assert_array_equal(self.biomes.get_ground_y_at_x(np.array([W, W + 9.0]), "Dfc"),
+                                      self.biomes.heightfield("Dfc")[[-1, -1]])
+
+    def test_ground_points_are_cached_per_profile(self):
+        points = self.biomes.generate_ground_points("ET", liquefaction_effect_scale=0.3)
+        self.assertIs(self.biomes.generate_ground_points("ET", liquefaction_effect_scale=0.3), points)
+        self.assertIsNot(self.biomes.generate_ground_points("ET"), points)
+        self.assertEqual(len(points), W // 10 + 3)
+        self.assertIsInstance(points, tuple)
+        self.assertEqual(points[-2:], ((W, H), (0, H)))
+        scale = round(0.3 * 64) / 64     # liquefaction is rounded to 1/64
+        for x, y in points[:-2]:
+            self.assertAlmostEqual(y, analytic_ground_y(x, "ET", scale), places=9)
+
+    def test_cache_is_bounded(self):
+        biomes = BiomeGenerator(W, H, cache_size=3)
+        first = biomes.heightfield("Af", 0.0)
+        self.assertFalse(first.flags.writeable)
+        for scale in (0.25, 0.5, 0.75):
+            biomes.heightfield("Af", scale)
+        self.assertEqual(len(biomes._heightfields), 3)
+        self.assertIsNot(biomes.heightfield("Af", 0.0), first)
+        self.assertIs(biomes.heightfield("Af", 0.001), biomes.heightfield("Af", 0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Tests for the fixed-step simulation clock (core/clock.py) and how buildings use it."""
+
+import unittest
+
+import numpy as np
+
+from core import physics
+from core.building_structure import Building
+from core.clock import FixedStepClock
+
+
+class FixedStepClockTests(unittest.TestCase):
+    def test_steps_follow_accumulated_frame_time(self):
+        clock = FixedStepClock(0.01)
+        frames = [0.004, 0.013, 0.0175, 0.0155, 0.02]
+        steps = [clock.advance(f) for f in frames]
+        self.assertEqual(steps, [0, 1, 2, 2, 2])
+        self.assertEqual(clock.steps_taken, 7)
+        self.assertAlmostEqual(clock.time, 0.07)
+        self.assertAlmostEqual(clock.alpha, 0.0)
+        clock.advance(0.0025)
+        self.assertAlmostEqual(clock.alpha, 0.25)
+
+    def test_time_scale_and_catch_up_cap(self):
+        clock = FixedStepClock(1.0 / 60.0, time_scale=10.0)
+        self.assertEqual(clock.advance(1.0 / 60.0), 10)
+        self.assertEqual(list(clock.steps(1.0 / 60.0))[-1], clock.time)
+        clock.time_scale = 1.0
+        self.assertEqual(clock.advance(5.0), 15)    # capped at 0.25 s of work
+        self.assertAlmostEqual(clock.dropped_time, 4.75)
+        clock.time_scale = 0.0
+        self.assertEqual(clock.advance(0.1), 0)
+        clock.reset()
+        self.assertEqual((clock.time, clock.alpha, clock.dropped_time), (0.0, 0.0, 0.0))
+
+    def test_steps_count_only_what_the_caller_takes(self):
+        clock = FixedStepClock(0.01)
+        taken = []
+        for t in clock.steps(0.05):
+            taken.append(t)
+            if len(taken) == 2:
+                break
+        self.assertEqual(clock.steps_taken, 2)
+        self.assertEqual(clock.time, taken[-1])
+        self.assertEqual(list(clock.steps(0.01)), [0.03])   # the rest were dropped
+
+
+class BuildingTimeStepTests(unittest.TestCase):
+    PARAMS = dict(num_stories=6, story_height=3.0, footprint_length=18.0, footprint_width=12.0)
+
+    def test_delta_time_runs_whole_steps_and_carries_the_rest(self):
+        sub_stepped = Building(**self.PARAMS)
+        stepped = Building(**self.PARAMS)
+        frames = [2.5 * sub_stepped.dt, 0.25 * sub_stepped.dt, 1.25 * sub_stepped.dt]
+        taken = [sub_stepped.update_physics(f, 0.5) for f in frames]
+        self.assertEqual(taken, [2, 0, 2])
+        for _ in range(4):
+            stepped.update_physics(None, 0.5)
+        np.testing.assert_allclose(sub_stepped.q, stepped.q, rtol=1e-12, atol=0.0)
+
+    def test_interpolated_displacements_blend_last_two_steps(self):
+        b = Building(**self.PARAMS)
+        gm = physics.HarmonicGroundMotion(0.3, 1.5)
+        for i in range(1, 20):
+            b.update_physics(None, gm(i * b.dt))
+        before = b.floor_displacements(0.0)
+        after = b.floor_displacements()
+        np.testing.assert_allclose(b.floor_displacements(0.25), before + 0.25 * (after - before))
+        self.assertFalse(np.allclose(before, after))
+        self.assertEqual(b.foundation_sway(), b.base_sway)
+        b.update_physics(None, gm(20 * b.dt))
+        np.testing.assert_allclose(b.floor_displacements(0.0), after)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Tests for the Monte Carlo fragility analysis (core/fragility.py)."""
+
+import unittest
+
+import numpy as np
+
+from core import physics
+from core.building_structure import Building, BuildingBatch
+from core.fragility import fragility_analysis
+
+CONFIG = dict(num_stories=6, story_height=3.0, footprint_length=18.0, footprint_width=12.0)
+
+
+class FragilityAnalysisTests(unittest.TestCase):
+    def test_curves_have_expected_shape_and_trend(self):
+        result = fragility_analysis(CONFIG, [0.05, 0.5, 4.0], 6, duration=5.0,
+                                    max_workers=1, chunk_size=4)
+        self.assertEqual(result.peak_drifts.shape, (3, 6))
+        self.assertEqual(result.exceedance_probability.shape, (3, 4))
+        self.assertEqual(result.collapse_probability[0], 0.0)
+        self.assertEqual(result.collapse_probability[-1], 1.0)
+        self.assertTrue(np.all(np.diff(result.exceedance_probability, axis=0) >= 0.0))
+        # Higher drift thresholds are never exceeded more often.
+        self.assertTrue(np.all(np.diff(result.exceedance_probability, axis=1) <= 0.0))
+
+    def test_results_independent_of_workers_and_chunking(self):
+        kw = dict(pga_levels=[0.2, 0.8], num_records=5, duration=4.0, seed=7)
+        serial = fragility_analysis(CONFIG, max_workers=1, chunk_size=5, **kw)
+        pooled = fragility_analysis(CONFIG, max_workers=2, chunk_size=2, **kw)
+        np.testing.assert_array_equal(serial.peak_drifts, pooled.peak_drifts)
+        np.testing.assert_array_equal(serial.collapsed, pooled.collapsed)
+        other = fragility_analysis(CONFIG, max_workers=1, chunk_size=5,
+                                   **dict(kw, seed=8))
+        self.assertFalse(np.array_equal(serial.peak_drifts, other.peak_drifts))
+
+    def test_batch_reset_restores_intact_state(self):
+        building = Building(**CONFIG)
+        batch = BuildingBatch([building] * 2)
+        for _ in range(120):
+            batch.update_physics([0.0, 40.0])
+        self.assertTrue(batch.collapse.failed[1].any())
+        batch.reset()
+        fresh = BuildingBatch([building] * 2)
+        gm = physics.HarmonicGroundMotion(0.3, 1.5)
+        for i in range(1, 60):
+            a = gm(i * building.dt)
+            batch.update_physics(a)
+            fresh.update_physics(a)
+        np.testing.assert_allclose(batch.q, fresh.q, rtol=1e-10, atol=1e-14)
+        np.testing.assert_array_equal(batch.collapse.failed, fresh.collapse.failed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Tests for the numpy weather particle fields (graphics/particles.py)."""
+
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+import pygame
+
+from config import settings
+from core import physics
+from core.biome_generator import BiomeGenerator
+from graphics.particles import RainField, WindField
+from graphics.renderer import Renderer
+
+W, H = 320, 240
+
+
+class RainFieldTests(unittest.TestCase):
+    def test_drops_fall_and_respawn_above_the_screen(self):
+        rain = RainField(W, H, seed=1)
+        rain.spawn(500)
+        self.assertEqual(len(rain), 500)
+        x0 = rain.x.copy()
+        for _ in range(60):
+            rain.update(0.05)
+            self.assertTrue(np.all(rain.y <= H))
+        np.testing.assert_array_equal(rain.x, x0)
+        # Everything has fallen through the screen at least once by now.
+        self.assertTrue(np.all(rain.y < H))
+        self.assertTrue(np.all((rain.x >= 0.0) & (rain.x <= W)))
+
+    def test_spawn_replaces_and_clear_empties(self):
+        rain = RainField(W, H, seed=2)
+        rain.spawn(100)
+        rain.spawn(30)
+        self.assertEqual(len(rain), 30)
+        self.assertEqual(rain.streaks().shape, (30, 4))
+        rain.clear()
+        self.assertEqual(len(rain), 0)
+        rain.update(0.1)
+
+
+class WindFieldTests(unittest.TestCase):
+    def test_speeds_follow_the_wind_profile(self):
+        wind = WindField(W, H, ground_y=H, seed=3)
+        wind.spawn(400, 25.0)
+        z = np.maximum((H - wind.y) / settings.METERS_TO_PIXELS, 1.0)
+        expected = physics.wind_speed_profile(z, 25.0) * settings.METERS_TO_PIXELS
+        np.testing.assert_allclose(wind.vx, expected)
+        order = np.argsort(wind.y)
+        self.assertTrue(np.all(np.diff(wind.vx[order]) <= 1e-9))
+
+    def test_streaks_wrap_in_the_wind_direction(self):
+        for speed in (20.0, -20.0):
+            wind = WindField(W, H, seed=4)
+            wind.spawn(200, speed)
+            self.assertTrue(np.all(np.sign(wind.vx) == np.sign(speed)))
+            self.assertTrue(np.all(np.sign(wind.dx) == np.sign(speed)))
+            for _ in range(100):
+                wind.update(0.05)
+            self.assertTrue(np.all(wind.x >= -np.abs(wind.dx) - W / 4))
+            self.assertTrue(np.all(wind.x <= W + np.abs(wind.dx) + W / 4))
+
+
+class ParticleRenderTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.screen = pygame.display.set_mode((W, H))
+
+    def test_field_draws_within_its_dirty_rect(self):
+        renderer = Renderer(self.screen, BiomeGenerator(W, H))
+        self.screen.fill((0, 0, 0))
+        rain = RainField(W, H, color=(255, 255, 255, 255), seed=5)
+        rain.spawn(20)
+        rain.y[:] = np.linspace(20.0, 200.0, 20)
+        rect = renderer.render_rain_particles(rain)
+        self.assertIsNotNone(rect)
+        lit = np.argwhere(pygame.surfarray.array3d(self.screen).max(axis=2) > 0)
+        self.assertGreater(len(lit), 20)
+        self.assertTrue(np.all(lit[:, 0] >= rect.left) and np.all(lit[:, 0] < rect.right))
+        self.assertTrue(np.all(lit[:, 1] >= rect.top) and np.all(lit[:, 1] < rect.bottom))
+        empty = RainField(W, H)
+        self.assertFalse(renderer.render_rain_particles(empty))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,13 +10,15 @@ These use the standard-library ``unittest`` so no extra dependency is needed.
 import math
 import os
 import tempfile
+import tracemalloc
 import unittest
+from unittest import mock
 
 import numpy as np
 
 from core import physics
 from core.building_structure import (
-    Building, CONCRETE, STEEL, MassDistribution, StructuralSystemType,
+    Building, BuildingBatch, CONCRETE, STEEL, MassDistribution, StructuralSystemType,
 )
 
 
@@ -157,6 +159,53 @@ class BuildingDerivationTests(unittest.TestCase):
         self.assertTrue(0.2 < period < 1.5, f"fundamental period {period:.3f}s out of band")
 
 
+class AssemblyContextTests(unittest.TestCase):
+    SHARED = ("floor_masses", "column_section", "story_shear_stiffness", "flexural_inertia",
+              "shear_rigidity", "flexural_rigidity", "structural_stiffness_matrix",
+              "floor_heights", "fixed_base_mass_matrix", "fixed_base_modes")
+
+    def _building(self, **kw):
+        params = dict(num_stories=12, story_height=3.0, footprint_length=18.0,
+                      footprint_width=12.0, mass_distribution=MassDistribution.CONCENTRATED_TOP,
+                      structural_system=StructuralSystemType.CORE_WALL)
+        params.update(kw)
+        return Building(**params)
+
+    def test_build_model_derives_each_quantity_once(self):
+        for banded in (False, True):
+            with self.subTest(banded=banded):
+                b = self._building(banded=banded)
+                with mock.patch.object(physics, "modal_analysis",
+                                       wraps=physics.modal_analysis) as modal:
+                    with physics.AssemblyContext(b) as context:
+                        b.build_model()
+                self.assertEqual(set(context.evaluations), set(self.SHARED))
+                self.assertEqual(set(context.evaluations.values()), {1})
+                # One fixed-base solve (damping) and one SSI solve (period).
+                self.assertEqual(modal.call_count, 2)
+                self.assertIsNone(b._assembly_context)
+
+    def test_shared_values_match_uncached(self):
+        b = self._building()
+        b.build_model()
+        self.assertIsNone(getattr(b, "_assembly_context", None))
+        cached = self._building()
+        with physics.AssemblyContext(cached):
+            cached.build_model()
+            masses = physics.floor_masses(cached)
+            self.assertIs(physics.floor_masses(cached), masses)
+        np.testing.assert_allclose(masses, physics.floor_masses(b))
+        np.testing.assert_allclose(cached.K, b.K)
+        np.testing.assert_allclose(cached.C, b.C)
+        self.assertAlmostEqual(cached.fundamental_period, b.fundamental_period, places=10)
+
+    def test_system_factors_need_no_enum_import(self):
+        for system in StructuralSystemType:
+            self.assertIn(system.name, physics.SYSTEM_RIGIDITY_FACTORS)
+        self.assertEqual(physics._system_rigidity_factors(StructuralSystemType.SHEAR_WALLS),
+                         (3.0, 40.0))
+
+
 class ShearFlexuralStiffnessTests(unittest.TestCase):
     """Unified Timoshenko cantilever: limits and the exact coupling."""
 
@@ -207,6 +256,71 @@ class ShearFlexuralStiffnessTests(unittest.TestCase):
         self.assertGreater(tip_coupled, tip_bending)
 
 
+class BandedStorageTests(unittest.TestCase):
+    """Banded assembly, products, and solves must reproduce the dense path."""
+
+    def test_block_tridiagonal_solve_matches_dense(self):
+        rng = np.random.default_rng(3)
+        for m in (1, 2, 5, 16, 33):
+            with self.subTest(nodes=m):
+                # Diagonally dominant SPD blocks.
+                lower = rng.normal(size=(m - 1, 2, 2))
+                diag = np.array([np.eye(2) * 10.0 for _ in range(m)])
+                A = physics.BlockTridiagonal(diag, lower)
+                b = rng.normal(size=2 * m)
+                np.testing.assert_allclose(A.factor().solve(b),
+                                           np.linalg.solve(A.to_dense(), b), rtol=1e-10)
+
+    def test_banded_shear_matrix_matches_dense(self):
+        k = [100.0, 200.0, 300.0, 250.0]
+        K = physics.assemble_shear_stiffness_matrix(k)
+        Kb = physics.assemble_shear_stiffness_matrix(k, banded=True)
+        np.testing.assert_allclose(Kb.to_dense(), K)
+        x = np.array([1.0, -2.0, 0.5, 3.0])
+        np.testing.assert_allclose(Kb @ x, K @ x)
+        np.testing.assert_allclose(Kb.factor().solve(x), np.linalg.solve(K, x), rtol=1e-12)
+
+    def test_implicit_condensation_matches_dense_condensation(self):
+        EI = np.linspace(5.0e11, 2.0e11, 9)
+        K = physics.assemble_shear_flexural_stiffness(EI, 3.0e8, 3.0, 9)
+        Kb = physics.assemble_shear_flexural_stiffness(EI, 3.0e8, 3.0, 9, banded=True)
+        x = np.linspace(-1.0, 2.0, 9)
+        np.testing.assert_allclose(Kb @ x, K @ x, rtol=1e-9, atol=abs(K @ x).max() * 1e-12)
+        np.testing.assert_allclose(Kb.factor().solve(x), np.linalg.solve(K, x), rtol=1e-9)
+
+    def test_banded_ssi_system_matches_dense(self):
+        b = Building(num_stories=7, story_height=3.0, footprint_length=18.0,
+                     footprint_width=12.0, primary_material=CONCRETE)
+        dense = physics.build_ssi_system(b, physics.MEDIUM_SOIL)
+        banded = physics.build_ssi_system(b, physics.MEDIUM_SOIL, banded=True)
+        x = np.linspace(1.0, 2.0, b.num_stories + 2)
+        for A, Ab in zip(dense[:3], banded[:3]):
+            np.testing.assert_allclose(Ab.to_dense(), A, rtol=1e-9, atol=abs(A).max() * 1e-12)
+            np.testing.assert_allclose(Ab.factor().solve(x), np.linalg.solve(A, x), rtol=1e-8)
+        np.testing.assert_allclose(banded[3], dense[3])
+
+    def test_banded_building_response_matches_dense(self):
+        """Same shaking, same hinging: storage must not change the physics."""
+        kw = dict(num_stories=6, story_height=3.0, footprint_length=18.0,
+                  footprint_width=12.0, primary_material=CONCRETE, ductility_level=0.1)
+        dense, banded = Building(banded=False, **kw), Building(banded=True, **kw)
+        self.assertAlmostEqual(banded.fundamental_period, dense.fundamental_period, places=10)
+        gm = physics.SyntheticGroundMotion(pga_g=0.8, duration=8.0, seed=4)
+        for i in range(480):
+            a_g = gm(i * dense.dt)
+            dense.update_physics(None, a_g)
+            banded.update_physics(None, a_g)
+        self.assertGreater(dense.num_failed_stories, 0)
+        np.testing.assert_array_equal(banded.collapse.failed, dense.collapse.failed)
+        np.testing.assert_allclose(banded.q, dense.q, rtol=1e-6, atol=abs(dense.q).max() * 1e-8)
+
+    def test_tall_buildings_default_to_banded(self):
+        self.assertFalse(Building(num_stories=10).uses_banded_storage)
+        tall = Building(num_stories=physics.BANDED_MIN_STORIES)
+        self.assertTrue(tall.uses_banded_storage)
+        self.assertIsInstance(tall.K, physics.BorderedMatrix)
+
+
 class StructuralSystemTests(unittest.TestCase):
     def _building(self, system):
         return Building(num_stories=12, story_height=3.0, footprint_length=20.0,
@@ -279,6 +393,51 @@ class ModalAnalysisTests(unittest.TestCase):
         first = res.mode_shapes[:, 0]
         self.assertTrue(np.all(np.diff(np.abs(first)) > 0))
 
+    def test_partial_modes_match_full_solution(self):
+        for banded in (False, True):
+            with self.subTest(banded=banded):
+                b = Building(num_stories=30, story_height=3.0, footprint_length=18.0,
+                             footprint_width=14.0, primary_material=CONCRETE, banded=banded)
+                full = physics.modal_analysis(b.M, b.K, b.influence)
+                part = physics.modal_analysis(b.M, b.K, b.influence, num_modes=3)
+                self.assertEqual(part.mode_shapes.shape, (b.ndof, 3))
+                np.testing.assert_allclose(part.frequencies, full.frequencies[:3], rtol=1e-9)
+                np.testing.assert_allclose(part.mode_shapes, full.mode_shapes[:, :3],
+                                           atol=1e-7 * np.abs(full.mode_shapes[:, :3]).max())
+                np.testing.assert_allclose(part.participation, full.participation[:3], rtol=1e-7)
+
+    def test_warm_start_converges_in_fewer_sweeps(self):
+        def sweeps(**kw):
+            with mock.patch.object(physics.np.linalg, "eigh", wraps=np.linalg.eigh) as eigh:
+                result = physics.modal_analysis(b.M, b.K, num_modes=2, **kw)
+            return result, eigh.call_count
+
+        b = Building(num_stories=60, story_height=3.0, footprint_length=18.0,
+                     footprint_width=14.0, primary_material=CONCRETE)
+        previous = physics.modal_analysis(b.M, b.K, num_modes=2)
+        b.story_height = 3.1  # a slider nudge
+        b.build_model()
+        cold, cold_sweeps = sweeps()
+        warm, warm_sweeps = sweeps(initial_modes=previous.mode_shapes)
+        np.testing.assert_allclose(warm.frequencies, cold.frequencies, rtol=1e-10)
+        self.assertLess(warm_sweeps, cold_sweeps)
+
+    def test_accepts_nested_lists(self):
+        M = [[2.0, 0.0, 0.0], [0.0, 2.0, 0.0], [0.0, 0.0, 1.0]]
+        K = [[600.0, -300.0, 0.0], [-300.0, 600.0, -300.0], [0.0, -300.0, 300.0]]
+        full = physics.modal_analysis(M, K)
+        np.testing.assert_allclose(full.frequencies,
+                                   physics.modal_analysis(np.array(M), np.array(K)).frequencies)
+        big = physics.assemble_shear_stiffness_matrix(np.full(30, 4.0e5))
+        part = physics.modal_analysis(np.eye(30).tolist(), big.tolist(), num_modes=2)
+        np.testing.assert_allclose(part.frequencies,
+                                   physics.modal_analysis(np.eye(30), big).frequencies[:2], rtol=1e-7)
+
+    def test_unconverged_subspace_iteration_warns(self):
+        K = physics.assemble_shear_stiffness_matrix(np.full(30, 4.0e5))
+        with self.assertWarns(RuntimeWarning):
+            physics.modal_analysis(np.eye(30), K, num_modes=2, tol=0.0)
+
 
 class RayleighDampingTests(unittest.TestCase):
     def test_coefficients_match_equal_zeta_closed_form(self):
@@ -392,6 +551,48 @@ class NewmarkIntegratorTests(unittest.TestCase):
             u, v, a = integ.step(u, v, a, F)
         np.testing.assert_allclose(u, np.linalg.solve(K2, F), rtol=1e-3)
 
+    def test_cholesky_factor_solves_across_blocks(self):
+        rng = np.random.default_rng(5)
+        for n in (1, 16, 41):
+            A = rng.standard_normal((n, n))
+            A = A @ A.T + n * np.eye(n)
+            factor = physics.CholeskyFactor(A)
+            np.testing.assert_allclose(factor.L @ factor.L.T, A, rtol=1e-12)
+            b, B = rng.standard_normal(n), rng.standard_normal((n, 3))
+            np.testing.assert_allclose(factor.solve(b), np.linalg.solve(A, b), rtol=1e-10)
+            np.testing.assert_allclose(factor.solve(B), np.linalg.solve(A, B), rtol=1e-10)
+            out = np.empty(n)
+            self.assertIs(factor.solve(b, out=out), out)
+            np.testing.assert_allclose(out, np.linalg.solve(A, b), rtol=1e-10)
+        with self.assertRaises(np.linalg.LinAlgError):
+            physics.CholeskyFactor(-np.eye(3))
+
+    def test_step_inplace_matches_step_without_allocating(self):
+        n = 300
+        M = np.diag(np.full(n, 1000.0))
+        K = physics.assemble_shear_stiffness_matrix(np.full(n, 4.0e5))
+        integ = physics.NewmarkIntegrator(M, 0.01 * K, K, 0.01)
+        F = np.linspace(0.0, 500.0, n)
+        u, v, a = np.zeros(n), np.zeros(n), np.zeros(n)
+        ref = (u.copy(), v.copy(), a.copy())
+        for _ in range(20):
+            ref = integ.step(*ref, F)
+            integ.step_inplace(u, v, a, F)
+        for got, want in zip((u, v, a), ref):
+            np.testing.assert_allclose(got, want, rtol=1e-12, atol=1e-15)
+
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in range(50):
+                integ.step_inplace(u, v, a, F)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # Not even one state-sized temporary may be created per step.
+        self.assertLess(peak - before, u.nbytes)
+
     def test_resonant_forcing_amplifies(self):
         """Harmonic forcing at the natural frequency should build a large response."""
         m, k, zeta = 1.0, 400.0, 0.02
@@ -417,6 +618,107 @@ class NewmarkIntegratorTests(unittest.TestCase):
         self.assertGreater(peak_on, 5 * peak_off)
 
 
+class ModalIntegratorTests(unittest.TestCase):
+    """Exact modal recurrence and truncated mode superposition."""
+
+    def test_recurrence_reproduces_damped_free_vibration_exactly(self):
+        omega, zeta, dt = 7.0, 0.05, 0.01
+        A, _B0, _B1 = physics.sdof_recurrence(omega, zeta, dt)
+        omega_d = omega * math.sqrt(1.0 - zeta ** 2)
+        x = np.array([1.0, 0.0])
+        for i in range(1, 501):
+            x = A @ x
+            t = i * dt
+            exact = math.exp(-zeta * omega * t) * (
+                math.cos(omega_d * t) + (zeta * omega / omega_d) * math.sin(omega_d * t))
+            self.assertAlmostEqual(x[0], exact, places=12)
+
+    def test_constant_load_settles_to_static_for_any_damping(self):
+        omega = 6.0
+        for zeta in (0.05, 1.0, 3.0):
+            with self.subTest(zeta=zeta):
+                A, B0, B1 = physics.sdof_recurrence(omega, zeta, 0.01)
+                history = physics.sdof_response_history(A, B0, B1, np.ones(6000))
+                self.assertAlmostEqual(history[-1, 0], 1.0 / omega ** 2, places=7)
+
+    def _building(self):
+        return Building(num_stories=12, story_height=3.0, footprint_length=20.0,
+                        footprint_width=15.0, primary_material=CONCRETE)
+
+    def test_step_matches_vectorised_history(self):
+        b = self._building()
+        modal = physics.ModalIntegrator(b.M, b.C, b.K, b.dt, num_modes=4, influence=b.influence)
+        gm = physics.SyntheticGroundMotion(pga_g=0.3, duration=5.0, seed=2)
+        _, states = modal.run_ground_motion(gm, 5.0)
+        history = modal.recover(states)
+        _, accels = gm.sample(b.dt, 5.0)
+        pattern = physics.seismic_force(b.M, b.influence, 1.0)
+        for i in range(1, len(accels)):
+            modal.step(pattern * accels[i])
+            np.testing.assert_allclose(modal.displacement, history[i],
+                                       atol=abs(history).max() * 1e-9)
+
+    def test_truncation_error_is_reported_and_small(self):
+        b = self._building()
+        gm = physics.SyntheticGroundMotion(pga_g=0.3, duration=10.0, seed=5)
+        few = physics.ModalIntegrator(b.M, b.C, b.K, b.dt, num_modes=1, influence=b.influence)
+        many = physics.ModalIntegrator(b.M, b.C, b.K, b.dt, num_modes=5, influence=b.influence)
+        r_few = few.compare_with_newmark(gm, 10.0)
+        r_many = many.compare_with_newmark(gm, 10.0)
+        self.assertEqual(r_many.num_modes, 5)
+        self.assertGreater(r_many.mass_ratio, r_few.mass_ratio)
+        self.assertLess(r_many.relative_error, r_few.relative_error)
+        self.assertLess(r_many.relative_error, 0.05)
+
+
+class BatchIntegrationTests(unittest.TestCase):
+    """Many buildings stepped together match stepping each one on its own."""
+
+    def _buildings(self, banded=None):
+        return [Building(num_stories=10, story_height=3.0, footprint_length=18.0,
+                         footprint_width=12.0, primary_material=material,
+                         ductility_level=ductility, banded=banded)
+                for material, ductility in ((CONCRETE, 0.1), (STEEL, 0.5), (CONCRETE, 0.9))]
+
+    def test_batch_matches_individual_buildings_through_hinging(self):
+        gm = physics.SyntheticGroundMotion(pga_g=1.2, duration=6.0, seed=4)
+        for banded in (False, True):
+            with self.subTest(banded=banded):
+                buildings = self._buildings(banded)
+                batch = BuildingBatch(buildings)
+                self.assertEqual(batch.integrator.banded, banded)
+                _, accels = gm.sample(batch.dt, 6.0)
+                for a_g in accels:
+                    batch.update_physics(a_g)
+                    for b in buildings:
+                        b.update_physics(ground_acceleration=a_g)
+                self.assertTrue(batch.collapse.failed.any())
+                for i, b in enumerate(buildings):
+                    np.testing.assert_allclose(batch.q[i], b.q, atol=1e-9 * max(1.0, abs(b.q).max()))
+                    np.testing.assert_array_equal(batch.collapse.failed[i], b.collapse.failed)
+                    self.assertEqual(batch.is_destroyed[i], b.is_destroyed)
+                batch.reset()
+                np.testing.assert_array_equal(batch.q, 0.0)
+
+    def test_collapsed_buildings_are_frozen(self):
+        batch = BuildingBatch(self._buildings())
+        batch.collapse.is_collapsed[1] = True
+        batch.update_physics(2.0)
+        np.testing.assert_array_equal(batch.q[1], 0.0)
+        self.assertTrue(np.abs(batch.q[0]).max() > 0.0)
+
+    def test_mismatched_sizes_are_rejected(self):
+        short = Building(num_stories=4, story_height=3.0, footprint_length=18.0,
+                         footprint_width=12.0, primary_material=CONCRETE)
+        with self.assertRaises(ValueError):
+            BuildingBatch(self._buildings() + [short])
+
+    def test_batch_story_drifts_match_per_row(self):
+        v = np.random.default_rng(0).normal(size=(4, 6))
+        expected = np.stack([physics.story_drifts(row, 3.0) for row in v])
+        np.testing.assert_allclose(physics.story_drifts(v, 3.0), expected)
+
+
 class SoilStructureInteractionTests(unittest.TestCase):
     def _building(self, **kw):
         params = dict(num_stories=10, story_height=3.0, footprint_length=20.0,
@@ -532,6 +834,21 @@ class WindLoadTests(unittest.TestCase):
         self.assertLess(samples.min(), mean)      # lulls fall below it
         self.assertTrue(np.all(samples >= 0.0))   # squared factor stays non-negative
 
+    def test_force_history_matches_force_at(self):
+        wind = physics.WindLoad(self._building(), reference_speed=30.0, seed=3)
+        times = np.linspace(0.0, 120.0, 501)
+        expected = np.array([wind.force_at(t) for t in times])
+        np.testing.assert_allclose(wind.force_history(times), expected, rtol=1e-13)
+
+    def test_force_chunks_join_into_full_history(self):
+        wind = physics.WindLoad(self._building(), reference_speed=30.0, seed=3)
+        chunks = list(wind.force_chunks(0.05, 10.0, chunk_steps=64))
+        self.assertTrue(all(len(t) <= 64 for t, _ in chunks))
+        times = np.concatenate([t for t, _ in chunks])
+        np.testing.assert_allclose(times, np.arange(201) * 0.05)
+        np.testing.assert_allclose(np.concatenate([f for _, f in chunks]),
+                                   wind.force_history(times), rtol=1e-13)
+
 
 class GroundMotionTests(unittest.TestCase):
     def test_harmonic_peaks_at_pga(self):
@@ -549,6 +866,28 @@ class GroundMotionTests(unittest.TestCase):
         self.assertAlmostEqual(np.max(np.abs(accels)), 0.4 * physics.GRAVITY, delta=1e-2)
         self.assertEqual(gm(100.0), 0.0)  # zero outside its duration
 
+    def test_fft_synthesis_matches_direct_summation(self):
+        rng = np.random.default_rng(3)
+        amp, phase = rng.random(150), rng.uniform(0.0, 2.0 * math.pi, 150)
+        omega = np.linspace(0.01, 2.0 * math.pi * 100.0, 150)
+        t = np.arange(3001) * 0.005
+        direct = (amp * np.cos(np.outer(t, omega) + phase)).sum(axis=1)
+        fast = physics._cosine_series(amp, phase, omega[0], omega[1] - omega[0], 0.005, len(t))
+        np.testing.assert_allclose(fast, direct, atol=1e-10 * np.abs(direct).max())
+
+    def test_long_synthetic_record_memory_is_linear(self):
+        # 10 minutes at 5 ms with 2000 components: the phase matrix alone
+        # would take ~1.9 GB.
+        tracemalloc.start()
+        try:
+            gm = physics.SyntheticGroundMotion(pga_g=0.3, duration=600.0,
+                                               num_components=2000, seed=1)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 64e6)
+        self.assertAlmostEqual(np.max(np.abs(gm._accels)), 0.3 * physics.GRAVITY, delta=1e-9)
+
     def test_recorded_interpolates_and_scales(self):
         times = np.array([0.0, 1.0, 2.0])
         accels = np.array([0.0, 2.0, -4.0])
@@ -558,6 +897,31 @@ class GroundMotionTests(unittest.TestCase):
         self.assertAlmostEqual(np.max(np.abs([scaled(t) for t in times])),
                                0.5 * physics.GRAVITY, delta=1e-9)
 
+    def test_at_matches_scalar_calls(self):
+        irregular = np.sort(np.random.default_rng(2).uniform(0.0, 5.0, 40))
+        motions = {
+            "harmonic": physics.HarmonicGroundMotion(0.3, 2.0, duration=4.0),
+            "synthetic": physics.SyntheticGroundMotion(0.3, duration=4.0, seed=5),
+            "uniform record": physics.RecordedGroundMotion(np.arange(50) * 0.1,
+                                                           np.cos(np.arange(50))),
+            "irregular record": physics.RecordedGroundMotion(irregular, np.sin(irregular)),
+        }
+        times = np.linspace(-0.5, 5.5, 777)
+        for name, gm in motions.items():
+            with self.subTest(name):
+                expected = np.array([gm(float(t)) for t in times])
+                np.testing.assert_allclose(gm.at(times), expected, rtol=0.0, atol=1e-12)
+                for t in (1.25, np.float64(1.25), np.array(1.25), 9.0):
+                    value = gm.at(t)
+                    self.assertIsInstance(value, float)
+                    self.assertAlmostEqual(value, gm(float(t)), places=12)
+
+    def test_uniform_scalar_lookup_matches_interpolation(self):
+        gm = physics.SyntheticGroundMotion(pga_g=0.3, duration=10.0, seed=4)
+        self.assertIsNotNone(gm._step)
+        for t in (0.0, 0.0123, 3.33, 9.999, 10.0):
+            self.assertAlmostEqual(gm(t), float(np.interp(t, gm._times, gm._accels)), places=12)
+
     def test_recorded_from_two_column_file(self):
         path = os.path.join(tempfile.gettempdir(), "bs_test_record.txt")
         np.savetxt(path, np.column_stack([[0.0, 1.0, 2.0], [0.0, 1.0, 2.0]]))
@@ -568,6 +932,49 @@ class GroundMotionTests(unittest.TestCase):
             os.remove(path)
 
 
+class ResponseSpectrumTests(unittest.TestCase):
+    def _record(self):
+        return physics.SyntheticGroundMotion(pga_g=0.3, duration=10.0, seed=3)
+
+    def test_matches_direct_recurrence_loop(self):
+        gm = self._record()
+        spectrum = gm.response_spectrum([0.2, 1.0, 3.0], zetas=[0.02, 0.05])
+        _, accels = gm.sample(0.005, 10.0)
+        for i, zeta in enumerate((0.02, 0.05)):
+            for j, period in enumerate((0.2, 1.0, 3.0)):
+                A, B0, B1 = physics.sdof_recurrence(2 * math.pi / period, zeta, 0.005)
+                x, peak = np.zeros(2), 0.0
+                for k in range(1, len(accels)):
+                    x = A @ x - B0 * accels[k - 1] - B1 * accels[k]
+                    peak = max(peak, abs(x[0]))
+                self.assertAlmostEqual(spectrum.Sd[i, j] / peak, 1.0, places=10)
+
+    def test_short_period_acceleration_tends_to_pga(self):
+        spectrum = self._record().response_spectrum([0.01], zetas=0.05)
+        self.assertAlmostEqual(spectrum.Sa[0, 0] / (0.3 * physics.GRAVITY), 1.0, delta=0.02)
+
+    def test_pseudo_quantities_and_shape(self):
+        periods = np.geomspace(0.05, 4.0, 50)
+        spectrum = self._record().response_spectrum(periods, zetas=[0.02, 0.05, 0.1])
+        self.assertEqual(spectrum.Sd.shape, (3, 50))
+        omega = 2 * math.pi / periods
+        np.testing.assert_allclose(spectrum.Sa, omega ** 2 * spectrum.Sd)
+        # More damping, less response at every period.
+        self.assertTrue((spectrum.Sd[0] >= spectrum.Sd[2]).all())
+
+    def test_results_are_cached_per_record(self):
+        gm = self._record()
+        first = gm.response_spectrum([0.5, 1.0])
+        self.assertIs(gm.response_spectrum([0.5, 1.0]), first)
+        self.assertIsNot(gm.response_spectrum([0.5, 1.0], zetas=0.1), first)
+
+    def test_motion_without_record_needs_dt(self):
+        gm = physics.HarmonicGroundMotion(pga_g=0.3, frequency_hz=1.0, duration=5.0)
+        with self.assertRaises(ValueError):
+            gm.response_spectrum([1.0])
+        self.assertEqual(gm.response_spectrum([1.0], dt=0.01).Sd.shape, (1, 1))
+
+
 class FloodLoadTests(unittest.TestCase):
     def _building(self, **kw):
         params = dict(num_stories=10, story_height=3.0, footprint_length=20.0,
@@ -602,6 +1009,42 @@ class FloodLoadTests(unittest.TestCase):
         self.assertAlmostEqual(up3, 1000.0 * physics.GRAVITY * vol3, places=3)
         self.assertGreater(up6, up3)
 
+    def test_array_of_levels_matches_per_level_calls(self):
+        b = self._building()
+        levels = np.array([-1.0, 0.0, 1.3, 3.0, 7.7, 100.0])
+        F = physics.flood_lateral_force(b, levels)
+        self.assertEqual(F.shape, (len(levels), b.num_stories))
+        for level, row in zip(levels, F):
+            np.testing.assert_allclose(row, physics.flood_lateral_force(b, float(level)))
+        uplift, volume = physics.flood_buoyancy(b, levels)
+        self.assertEqual(uplift.shape, levels.shape)
+        self.assertEqual(volume[0], 0.0)
+        self.assertAlmostEqual(uplift[3], physics.flood_buoyancy(b, 3.0)[0])
+
+    def test_flood_load_caches_by_quantised_level(self):
+        b = self._building()
+        flood = physics.FloodLoad(b, resolution=0.01, cache_size=2)
+        first = flood.lateral_force(2.001)
+        self.assertIs(flood.lateral_force(1.999), first)
+        self.assertFalse(first.flags.writeable)
+        np.testing.assert_allclose(first, physics.flood_lateral_force(b, 2.0))
+        flood.lateral_force(3.0)
+        flood.lateral_force(4.0)   # evicts the least recently used level (2.0)
+        self.assertIsNot(flood.lateral_force(2.0), first)
+        history = flood.lateral_force_history([2.0, 3.004, 2.0])
+        np.testing.assert_allclose(history, physics.flood_lateral_force(b, [2.0, 3.0, 2.0]))
+
+    def test_flood_history_keeps_the_level_shape(self):
+        b = self._building()
+        flood = physics.FloodLoad(b)
+        levels = np.array([[0.5, 2.0], [3.0, 2.0], [7.5, 0.0]])
+        history = flood.lateral_force_history(levels)
+        self.assertEqual(history.shape, (3, 2, b.num_stories))
+        np.testing.assert_allclose(history, physics.flood_lateral_force(b, levels))
+        single = flood.lateral_force_history(2.0)
+        self.assertEqual(single.shape, (b.num_stories,))
+        np.testing.assert_allclose(single, physics.flood_lateral_force(b, 2.0))
+
 
 class LoadCouplingTests(unittest.TestCase):
     def test_force_maps_to_ssi_dofs(self):
@@ -685,6 +1128,82 @@ class ProgressiveCollapseTests(unittest.TestCase):
         self.assertTrue(pc.update(v))     # first time: stories fail
         self.assertFalse(pc.update(v))    # same state: nothing newly failed
 
+    def test_stiffness_update_is_low_rank_and_exact(self):
+        b = self._building()
+        pc = physics.ProgressiveCollapse(b)
+        K = pc.stiffness_matrix()
+        pc.failed[[0, 3, 4]] = True
+        U, D = pc.stiffness_update()
+        self.assertEqual(U.shape, (b.num_stories, 6))
+        K_new = pc.stiffness_matrix()
+        np.testing.assert_allclose(K + U @ D @ U.T, K_new, atol=1e-10 * np.abs(K_new).max())
+        self.assertIsNone(pc.stiffness_update())  # nothing new since the last call
+        pc.failed[7] = True
+        U, D = pc.stiffness_update()
+        np.testing.assert_allclose(K_new + U @ D @ U.T, pc.stiffness_matrix(),
+                                   atol=1e-10 * np.abs(K_new).max())
+
+    def test_stiffness_update_stays_exact_through_a_long_cascade(self):
+        b = self._building(num_stories=20)
+        pc = physics.ProgressiveCollapse(b)
+        K = pc.stiffness_matrix()
+        rebases = 0
+        for story in np.random.default_rng(2).permutation(20):
+            pc.failed[story] = True
+            before = pc._blocks
+            U, D = pc.stiffness_update()
+            rebases += pc._blocks is not before
+            K = K + U @ D @ U.T
+            np.testing.assert_allclose(K, pc.stiffness_matrix(), atol=1e-9 * np.abs(K).max())
+        self.assertGreater(rebases, 1)  # the local corrections are bounded
+
+    def test_low_rank_update_refactorises_when_bounded_or_ill_conditioned(self):
+        n = 6
+        K = physics.assemble_shear_stiffness_matrix(np.full(n, 4.0e5))
+        M, C = np.eye(n) * 1000.0, np.zeros((n, n))
+        F = np.linspace(1.0, 2.0, n) * 1e3
+        integ = physics.NewmarkIntegrator(M, C, K, 0.01)
+        U = np.eye(n)[:, :2]
+        D = np.diag([-1.0e5, 0.0])          # singular D
+        K = K + U @ D @ U.T
+        integ.update_stiffness(K, U, D)
+        self.assertEqual(integ._factor.rank, 2)
+        for _ in range(integ.max_update_rank // 2):
+            K = K + U @ D @ U.T
+            integ.update_stiffness(K, U, D)
+        self.assertLessEqual(getattr(integ._factor, "rank", 0), integ.max_update_rank)
+        state = [np.zeros(n) for _ in range(3)]
+        rebuilt = physics.NewmarkIntegrator(M, C, K, 0.01)
+        np.testing.assert_allclose(integ.step(*state, F)[0], rebuilt.step(*state, F)[0], rtol=1e-9)
+        # Softening the matrix to (near) singular is never applied as a correction.
+        K_eff = K + integ.c0 * M
+        U1 = np.eye(n)[:, :1]
+        D1 = np.array([[-(1.0 - 1e-12) / np.linalg.inv(K_eff)[0, 0]]])
+        self.assertIsNone(physics._update_factor(physics.CholeskyFactor(K_eff), U1, D1))
+
+    def test_integrator_low_rank_update_matches_refactorisation(self):
+        for banded in (False, True):
+            with self.subTest(banded=banded):
+                b = self._building(num_stories=12, banded=banded)
+                b.collapse.failed[[2, 5]] = True
+                U, D = b.collapse.stiffness_update()
+                U_ssi = np.zeros((b.ndof, U.shape[1]))
+                U_ssi[:b.n] = U
+                K_s = b.collapse.stiffness_matrix()
+                if banded:
+                    K = b.K.with_core(K_s)
+                else:
+                    K = b.K.copy()
+                    K[:b.n, :b.n] = K_s
+                updated = physics.NewmarkIntegrator(b.M, b.C, b.K, b.dt)
+                updated.update_stiffness(K, U_ssi, D)
+                rebuilt = physics.NewmarkIntegrator(b.M, b.C, K, b.dt)
+                F = np.linspace(1.0, 2.0, b.ndof) * 1e5
+                state = [np.zeros(b.ndof) for _ in range(3)]
+                u1, _, _ = updated.step(*state, F)
+                u2, _, _ = rebuilt.step(*state, F)
+                np.testing.assert_allclose(u1, u2, rtol=1e-9, atol=1e-12 * abs(u2).max())
+
     def test_sustained_overload_cascades_to_collapse(self):
         """Drive a heavy static load, refactorising as stories hinge; expect collapse."""
         b = self._building(ductility_level=0.4)
@@ -716,5 +1235,71 @@ class ProgressiveCollapseTests(unittest.TestCase):
         self.assertTrue(pc.failed.any())
 
 
+
+class StoryHysteresisTests(unittest.TestCase):
+    PARAMS = dict(num_stories=8, story_height=3.0, footprint_length=18.0,
+                  footprint_width=12.0, primary_material=CONCRETE)
+
+    def _run(self, building, pga_g, steps, integrator=None):
+        """Step ``integrator`` (default: the building's) under a resonant harmonic."""
+        integrator = integrator or building.integrator
+        gm = physics.HarmonicGroundMotion(pga_g, 1.0 / building.fundamental_period)
+        state = [np.zeros(building.ndof) for _ in range(3)]
+        for i in range(1, steps + 1):
+            integrator.step_inplace(*state, building._seismic_pattern * gm(i * building.dt))
+            yield state
+
+    def test_elastic_range_matches_linear_integrator(self):
+        for banded in (False, True):
+            with self.subTest(banded=banded):
+                b = Building(banded=banded, **self.PARAMS)
+                hysteretic = physics.hysteretic_integrator(
+                    b, b.soil_profile, physics.BilinearHysteresis(yield_drift=1.0), banded=banded)
+                for (u, _, a), (u2, _, a2) in zip(self._run(b, 0.3, 150),
+                                                  self._run(b, 0.3, 150, hysteretic)):
+                    np.testing.assert_allclose(u2, u, rtol=0, atol=1e-10 * abs(u).max())
+                    np.testing.assert_allclose(a2, a, rtol=0, atol=1e-9 * abs(a).max())
+                self.assertLessEqual(hysteretic.iterations, 2)
+
+    def test_bilinear_shear_is_capped_and_loops_dissipate(self):
+        law = physics.BilinearHysteresis(yield_drift=0.001, post_yield_ratio=0.0)
+        b = Building(hysteresis=law, **self.PARAMS)
+        integrator = b.integrator
+        yield_shear = integrator.k_s[0] * integrator.z_yield
+        work, sway, shear = 0.0, 0.0, 0.0
+        for _ in self._run(b, 0.6, 400):
+            new_sway, new_shear = integrator._sway[0], integrator.story_shears[0]
+            work += 0.5 * (shear + new_shear) * (new_sway - sway)
+            sway, shear = new_sway, new_shear
+        self.assertGreater(abs(sway), 0.0)
+        self.assertLessEqual(np.abs(integrator.story_shears).max(), yield_shear * (1 + 1e-9))
+        # Work done on the first story beyond what it can give back elastically.
+        dissipated = work - shear ** 2 / (2.0 * integrator.k_s[0])
+        self.assertGreater(dissipated, 10.0 * yield_shear * integrator.z_yield)
+
+    def test_bouc_wen_stays_inside_yield_surface_on_tall_banded_stack(self):
+        law = physics.BoucWenHysteresis(yield_drift=0.0005)
+        b = Building(**dict(self.PARAMS, num_stories=60, hysteresis=law))
+        self.assertTrue(b.uses_banded_storage)
+        iterations = []
+        for _ in self._run(b, 0.8, 200):
+            iterations.append(b.integrator.iterations)
+        z = b.integrator.z
+        self.assertGreater(np.abs(z).max(), 0.9 * b.integrator.z_yield)
+        self.assertLessEqual(np.abs(z).max(), b.integrator.z_yield)
+        self.assertLess(max(iterations), b.integrator.max_iter)
+
+    def test_building_steps_with_hysteresis(self):
+        b = Building(hysteresis=physics.BilinearHysteresis(), **self.PARAMS)
+        gm = physics.HarmonicGroundMotion(0.3, 1.5)
+        for i in range(1, 60):
+            b.update_physics(ground_acceleration=gm(i * b.dt), wind_force=np.full(b.n, 1e4))
+        self.assertEqual(b.base_shear, b.integrator.story_shears[0])
+        self.assertTrue(np.isfinite(b.floor_displacements()).all())
+        b.set_soil_profile(physics.SOFT_SOIL)
+        b.update_physics(ground_acceleration=gm(60 * b.dt))
+        with self.assertRaises(ValueError):
+            BuildingBatch([b, b])
+
 if __name__ == "__main__":
     unittest.main()
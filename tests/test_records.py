@@ -0,0 +1,128 @@
+"""Tests for the accelerogram parser and cached record library (core/records.py)."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from core import physics
+from core.records import AccelerogramLibrary
+
+AT2 = """PEER NGA STRONG MOTION DATABASE RECORD
+IMPERIAL VALLEY 10/15/79 2316, EL CENTRO ARRAY #6, 230
+ACCELERATION TIME SERIES IN UNITS OF G
+NPTS=    7, DT=   .0050 SEC
+  .1000000E-02  .2000000E-02 -.3000000E-02  .4000000E-02  .5000000E-02
+ -.6000000E-02  .7000000E-02
+"""
+
+
+class ParseAccelerogramTests(unittest.TestCase):
+    def test_peer_header_and_multi_column_rows(self):
+        times, dt, accels, units_g = physics.parse_accelerogram(AT2)
+        self.assertIsNone(times)
+        self.assertEqual(dt, 0.005)
+        self.assertTrue(units_g)
+        np.testing.assert_allclose(accels, [1e-3, 2e-3, -3e-3, 4e-3, 5e-3, -6e-3, 7e-3])
+
+    def test_fixed_width_fortran_columns(self):
+        text = "STATION 12\nDT = 0.01 s\n  1.5D-02-2.5D-02 3.0D-02\n -4.0D-02\n"
+        times, dt, accels, units_g = physics.parse_accelerogram(text)
+        self.assertEqual(dt, 0.01)
+        self.assertFalse(units_g)
+        np.testing.assert_allclose(accels, [0.015, -0.025, 0.03, -0.04])
+
+    def test_two_and_one_column_tables(self):
+        times, dt, accels, _ = physics.parse_accelerogram("# t, a\n0.0, 1.0\n0.5, 2.0\n1.0, 3.0\n")
+        np.testing.assert_allclose(times, [0.0, 0.5, 1.0])
+        np.testing.assert_allclose(accels, [1.0, 2.0, 3.0])
+        self.assertIsNone(dt)
+        with self.assertRaises(ValueError):
+            physics.parse_accelerogram("1.0\n2.0\n")
+        times, dt, accels, _ = physics.parse_accelerogram("1.0\n2.0\n", dt=0.02)
+        self.assertIsNone(times)
+        self.assertEqual(dt, 0.02)
+
+    def test_table_with_dt_in_header_keeps_its_time_column(self):
+        text = "Station 7, DT= 0.5 s\n0.0  1.0\n0.5  -2.0\n1.0  3.0\n"
+        times, dt, accels, _ = physics.parse_accelerogram(text)
+        self.assertIsNone(dt)
+        np.testing.assert_allclose(times, [0.0, 0.5, 1.0])
+        np.testing.assert_allclose(accels, [1.0, -2.0, 3.0])
+        # Full rows of samples are still read row by row.
+        text = "NPTS= 4, DT= 0.01\n 0.1 0.2\n 0.3 0.4\n"
+        times, dt, accels, _ = physics.parse_accelerogram(text)
+        self.assertIsNone(times)
+        np.testing.assert_allclose(accels, [0.1, 0.2, 0.3, 0.4])
+
+    def test_from_file_reads_m_per_s2_unless_asked(self):
+        path = os.path.join(tempfile.mkdtemp(), "elcentro.AT2")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        with open(path, "w") as f:
+            f.write(AT2)
+        plain = physics.RecordedGroundMotion.from_file(path)
+        auto = physics.RecordedGroundMotion.from_file(path, units_g=None)
+        self.assertAlmostEqual(np.max(np.abs(plain._accels)), 7e-3)
+        self.assertAlmostEqual(np.max(np.abs(auto._accels)), 7e-3 * physics.GRAVITY)
+
+    def test_short_record_is_rejected(self):
+        with self.assertRaises(ValueError):
+            physics.parse_accelerogram(AT2.replace("NPTS=    7", "NPTS=    9"))
+
+
+class AccelerogramLibraryTests(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        with open(os.path.join(self.root, "elcentro.AT2"), "w") as f:
+            f.write(AT2)
+        t = np.arange(200) * 0.01
+        np.savetxt(os.path.join(self.root, "uniform.txt"), np.column_stack([t, np.sin(t)]))
+        irregular = np.sort(np.random.default_rng(0).uniform(0.0, 2.0, 50))
+        np.savetxt(os.path.join(self.root, "irregular.csv"),
+                   np.column_stack([irregular, np.cos(irregular)]), delimiter=",")
+        with open(os.path.join(self.root, "notes.md"), "w") as f:
+            f.write("not a record")
+
+    def test_cached_records_match_text_loader(self):
+        library = AccelerogramLibrary(self.root)
+        self.assertEqual(library.names(), ["elcentro.AT2", "irregular.csv", "uniform.txt"])
+        self.assertEqual(library.build(), 3)
+        probe = np.linspace(-0.1, 2.1, 301)
+        for name in library:
+            with self.subTest(name):
+                cached = library.open(name)
+                direct = physics.RecordedGroundMotion.from_file(os.path.join(self.root, name),
+                                                                units_g=None)
+                np.testing.assert_allclose(cached.at(probe), direct.at(probe), atol=1e-12)
+        at2 = library.open("elcentro.AT2")
+        self.assertFalse(at2._accels.flags.owndata or at2._accels.flags.writeable)
+        self.assertAlmostEqual(library.info("elcentro.AT2")["pga"], 7e-3 * physics.GRAVITY)
+        self.assertEqual(library.info("uniform.txt")["dt"], 0.01)
+        self.assertIsNone(library.info("irregular.csv")["dt"])
+
+    def test_later_opens_do_not_reparse(self):
+        AccelerogramLibrary(self.root).build()
+        library = AccelerogramLibrary(self.root)
+        with mock.patch.object(physics, "parse_accelerogram",
+                               side_effect=AssertionError("re-parsed")):
+            for name in library:
+                library.open(name)
+                library.info(name)
+
+    def test_changed_source_is_converted_again(self):
+        library = AccelerogramLibrary(self.root)
+        library.build()
+        path = os.path.join(self.root, "elcentro.AT2")
+        with open(path, "w") as f:
+            f.write(AT2.replace(".7000000E-02", ".9000000E-02"))
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+        self.assertAlmostEqual(library.info("elcentro.AT2")["pga"], 9e-3 * physics.GRAVITY)
+        self.assertEqual(library.build(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Tests for the renderer's baked layers (graphics/renderer.py), drawn headless."""
+
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+import pygame
+
+from core.biome_generator import BiomeGenerator
+from core.building_structure import Building
+from core import physics
+from graphics.particles import WindField
+from graphics.renderer import Renderer, Cloud, merge_rects
+
+W, H = 480, 360
+
+
+class RendererCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        cls.screen = pygame.display.set_mode((W, H))
+
+    def setUp(self):
+        self.biomes = BiomeGenerator(W, H)
+        self.renderer = Renderer(self.screen, self.biomes)
+
+    def test_facade_is_baked_once_per_geometry(self):
+        b = Building(num_stories=5)
+        b.update_physics(None, 1.0)
+        self.renderer.render_building(b, W // 2, "Af")
+        self.renderer.render_building(b, W // 2, "Af")
+        self.assertEqual(len(self.renderer._facade_cache), 1)
+        surface, rows = next(iter(self.renderer._facade_cache.values()))
+        self.assertEqual(len(rows), surface.get_height())
+        self.renderer.render_building(Building(num_stories=6), W // 2, "Af")
+        self.assertEqual(len(self.renderer._facade_cache), 2)
+
+    def test_failed_stories_are_tinted(self):
+        b = Building(num_stories=4)
+        x, ground = W // 2, self.biomes.get_ground_y_at_x(W // 2, "Af")
+        # A pixel of the bottom story, clear of the windows at mid-story height.
+        probe = (x, int(ground - 0.15 * b.story_height * 6))
+        self.renderer.render_building(b, x, "Af")
+        intact = self.screen.get_at(probe)
+        b.collapse.failed[0] = True
+        self.renderer.render_building(b, x, "Af")
+        tinted = self.screen.get_at(probe)
+        self.assertGreater(tinted.r - tinted.b, intact.r - intact.b)
+
+    def test_flood_body_is_cached_per_level_and_terrain(self):
+        points = self.biomes.generate_ground_points("Af")
+        level = round(self.biomes.get_ground_y_at_x(W // 2, "Af")) - 12.0
+        self.renderer.render_flood_water(level, points)
+        body = self.renderer._flood_cache[round(level)]
+        self.renderer.render_flood_water(level + 0.2, points)
+        self.assertIs(self.renderer._flood_cache[round(level)], body)
+        self.assertEqual(len(self.renderer._flood_cache), 1)
+        wet = self.screen.get_at((W // 2, int(level) + 4))
+        self.assertGreater(wet.b, wet.r)
+        self.renderer.render_flood_water(level, self.biomes.generate_ground_points("ET"))
+        self.assertIsNot(self.renderer._flood_cache[round(level)], body)
+
+    def test_clouds_pass_behind_the_ground(self):
+        ground_y = self.biomes.heightfield("Af")
+        x = int(np.argmax(ground_y))     # the lowest point of the terrain
+        cloud = Cloud(x - 60, int(ground_y[x]) - 45, 120, 50, 0.0)
+        self.renderer.render_world("Af", clouds=[cloud])
+        above, below = (x, int(ground_y[x]) - 4), (x, int(ground_y[x]) + 8)
+        background = self.renderer._background
+        self.assertNotEqual(self.screen.get_at(above), background.get_at(above))
+        self.assertEqual(self.screen.get_at(below), background.get_at(below))
+
+
+class DirtyRectTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((W, H))
+
+    def test_partial_redraws_match_full_redraws(self):
+        biomes = BiomeGenerator(W, H)
+        partial = Renderer(pygame.Surface((W, H)), biomes)
+        full = Renderer(pygame.Surface((W, H)), biomes)
+        b = Building(num_stories=6)
+        gm = physics.HarmonicGroundMotion(0.5, 1.5)
+        clouds = [Cloud(60, 40, 120, 50, 3.0)]
+        wind = WindField(W, H, seed=0)
+        wind.spawn(5, 20.0)
+        wind.x[:] = 40.0 * np.arange(5)
+        wind.y[:] = 150 + 3 * np.arange(5)
+        for frame in range(12):
+            for _ in range(4):
+                b.update_physics(None, gm(b.dt * (frame * 4 + _)))
+            clouds[0].rect.x += clouds[0].speed
+            wind.update(0.05)
+            failed = frame > 6
+            b.collapse.failed[1] = failed
+            water = biomes.get_ground_y_at_x(W // 2, "Af") - 2 * frame if 3 < frame < 9 else None
+            full.invalidate()
+            for renderer in (partial, full):
+                renderer.render_world("Af", b, W // 2, clouds=clouds, wind_particles=wind,
+                                      flood_water_surface_y_px=water)
+            self.assertFalse(full._erased and not full._frame_is_full)
+            self.assertEqual(pygame.image.tobytes(partial.screen, "RGB"),
+                             pygame.image.tobytes(full.screen, "RGB"), f"frame {frame}")
+        self.assertFalse(partial._frame_is_full)
+        drawn = sum(r.width * r.height for r in merge_rects(partial._erased + partial._dirty))
+        self.assertLess(drawn, W * H / 2)
+
+    def test_merge_rects_removes_overlaps(self):
+        rects = [pygame.Rect(0, 0, 10, 10), pygame.Rect(5, 5, 10, 10), pygame.Rect(50, 0, 5, 5),
+                 pygame.Rect(12, 12, 30, 2), pygame.Rect(0, 0, 0, 0)]
+        merged = merge_rects(rects)
+        self.assertEqual(sorted(map(tuple, merged)), [(0, 0, 42, 15), (50, 0, 5, 5)])
+        for i, a in enumerate(merged):
+            self.assertEqual(a.collidelist(merged[i + 1:]), -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Tests for the headless scenario runner (core/scenario.py)."""
+
+import os
+import subprocess
+import sys
+import unittest
+
+import numpy as np
+
+from core import physics
+from core.building_structure import Building, CONCRETE
+from core.scenario import run_scenario
+
+
+def _building(**kw):
+    params = dict(num_stories=8, story_height=3.0, footprint_length=18.0,
+                  footprint_width=12.0, primary_material=CONCRETE)
+    params.update(kw)
+    return Building(**params)
+
+
+class RunScenarioTests(unittest.TestCase):
+    def test_matches_manual_update_physics_loop(self):
+        gm = physics.SyntheticGroundMotion(pga_g=0.3, duration=4.0, seed=1)
+        result = run_scenario(_building(), ground_motion=gm)
+
+        b = _building()
+        for t in result.times[1:]:
+            b.update_physics(b.dt, gm(float(t)))
+        np.testing.assert_allclose(result.floor_displacements[-1], b.floor_displacements(),
+                                   atol=1e-12)
+        self.assertEqual(result.drifts.shape, (len(result.times), b.n))
+        self.assertAlmostEqual(result.times[-1], 4.0, delta=b.dt)
+        self.assertGreater(np.abs(result.base_shear).max(), 0.0)
+        self.assertFalse(result.collapsed)
+
+    def test_static_flood_base_shear_balances_load(self):
+        b = _building()
+        result = run_scenario(b, water_level=6.0, duration=60.0)
+        total = physics.flood_lateral_force(b, 6.0).sum()
+        self.assertAlmostEqual(result.base_shear[-1] / total, 1.0, places=3)
+
+    def test_records_failure_and_collapse_times(self):
+        gm = physics.HarmonicGroundMotion(pga_g=2.0, frequency_hz=1.5, duration=20.0)
+        result = run_scenario(_building(ductility_level=0.05), ground_motion=gm)
+        self.assertTrue(result.collapsed)
+        self.assertEqual(result.times[-1], result.collapse_time)
+        failed = ~np.isnan(result.failure_times)
+        self.assertTrue(failed.any())
+        self.assertTrue((result.failure_times[failed] <= result.collapse_time).all())
+
+    def test_duration_required_without_ground_motion(self):
+        with self.assertRaises(ValueError):
+            run_scenario(_building(), water_level=2.0)
+
+    def test_does_not_import_pygame(self):
+        code = ("import sys; from core.scenario import run_scenario; "
+                "from core.building_structure import Building; "
+                "run_scenario(Building(), water_level=1.0, duration=0.5); "
+                "sys.exit('pygame' in sys.modules)")
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run([sys.executable, "-c", code], cwd=root)
+        self.assertEqual(proc.returncode, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Tests for the span tracer (core/trace.py) and the spans the simulator reports."""
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from core.building_structure import Building
+from core.trace import Tracer, tracer
+
+
+class TracerTests(unittest.TestCase):
+    def test_disabled_tracer_records_nothing(self):
+        t = Tracer()
+        traced = t.traced("f")(lambda x: x + 1)
+        with t.span("a"):
+            self.assertEqual(traced(1), 2)
+        t.end_frame()
+        self.assertEqual(t.breakdown(), [])
+        self.assertEqual(t.chrome_trace()["traceEvents"], [])
+
+    def test_frames_aggregate_spans_by_name(self):
+        t = Tracer(enabled=True, history=2)
+
+        @t.traced()
+        def square(x):
+            return x * x
+        for frame in range(3):
+            with t.span("outer"):
+                with t.span("inner"):
+                    pass
+                with t.span("inner"):
+                    square(frame)
+            t.end_frame()
+        rows = t.breakdown()
+        self.assertEqual(rows[0][0], "frame")
+        names = [row[0] for row in rows]
+        self.assertEqual(set(names), {"frame", "inner", "outer", square.__qualname__})
+        means = {name: mean for name, mean, _ in rows}
+        self.assertGreaterEqual(means["outer"], means["inner"])
+        self.assertEqual(len(t.frame_times()), 2)
+
+    def test_chrome_trace_lists_spans_per_thread(self):
+        t = Tracer(enabled=True, max_events=10)
+
+        def work():
+            with t.span("physics.step"):
+                pass
+        worker = threading.Thread(target=work, name="physics")
+        worker.start()
+        worker.join()
+        with t.span("render.world"):
+            pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            self.assertEqual(t.save_chrome_trace(path), 2)
+            with open(path) as f:
+                events = json.load(f)["traceEvents"]
+        spans = [e for e in events if e["ph"] == "X"]
+        self.assertEqual({e["cat"] for e in spans}, {"physics", "render"})
+        self.assertEqual(len({e["tid"] for e in spans}), 2)
+        self.assertTrue(all(e["dur"] >= 0 and e["ts"] >= 0 for e in spans))
+        thread_names = {e["args"]["name"] for e in events if e["ph"] == "M"}
+        self.assertIn("physics", thread_names)
+
+
+class SimulatorSpanTests(unittest.TestCase):
+    def setUp(self):
+        self.was_enabled = tracer.enabled
+        tracer.enabled = True
+        tracer.clear()
+
+    def tearDown(self):
+        tracer.enabled = self.was_enabled
+        tracer.clear()
+
+    def test_physics_and_render_report_spans(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from core.biome_generator import BiomeGenerator
+        from graphics.particles import RainField
+        from graphics.renderer import Renderer
+
+        pygame.init()
+        screen = pygame.display.set_mode((320, 240))
+        biomes = BiomeGenerator(320, 240)
+        b = Building(num_stories=4)
+        b.update_physics(None, 1.0)
+        rain = RainField(320, 240, seed=0)
+        rain.spawn(40)
+        rain.y[:] = 100.0
+        Renderer(screen, biomes).render_world("Af", b, 160, rain_particles=rain,
+                                              flood_water_surface_y_px=200.0)
+        tracer.end_frame()
+        names = {row[0] for row in tracer.breakdown()}
+        for name in ("physics.update", "render.world", "render.building", "render.facade",
+                     "render.rain_particles", "render.flood_water"):
+            self.assertIn(name, names)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Tests for the background physics worker (core/worker.py)."""
+
+import time
+import unittest
+
+import numpy as np
+
+from core import physics
+from core.building_structure import Building
+from core.worker import PhysicsWorker
+
+PARAMS = dict(num_stories=6, story_height=3.0, footprint_length=18.0, footprint_width=12.0)
+
+
+class PhysicsWorkerTests(unittest.TestCase):
+    def setUp(self):
+        self.gm = physics.HarmonicGroundMotion(0.3, 1.5)
+
+    def _loads(self, t):
+        return self.gm(t), None, None
+
+    def test_synchronous_steps_match_direct_stepping(self):
+        worker = PhysicsWorker(Building(**PARAMS), self._loads)
+        dt = worker.building.dt
+        self.assertEqual(worker.advance(12.5 * dt), 12)
+        reference = Building(**PARAMS)
+        for i in range(1, 13):
+            reference.update_physics(None, self.gm(i * dt))
+        snapshot = worker.snapshot
+        np.testing.assert_array_equal(snapshot.floor_displacements(), reference.floor_displacements())
+        self.assertAlmostEqual(snapshot.sim_time, 12 * dt)
+        self.assertEqual(snapshot.max_drift_ratio, reference.max_drift_ratio)
+
+    def test_snapshots_are_immutable_copies(self):
+        worker = PhysicsWorker(Building(**PARAMS), self._loads)
+        worker.advance(10 * worker.building.dt)
+        first = worker.snapshot
+        roof = first.floor_displacements()[-1]
+        with self.assertRaises(ValueError):
+            first.q[0] = 1.0
+        worker.advance(10 * worker.building.dt)
+        self.assertIsNot(worker.snapshot, first)
+        self.assertEqual(first.floor_displacements()[-1], roof)
+        self.assertNotEqual(worker.snapshot.floor_displacements()[-1], roof)
+
+    def test_commands_run_on_the_worker_before_stepping(self):
+        worker = PhysicsWorker(Building(**PARAMS), self._loads)
+        replacement = Building(**dict(PARAMS, num_stories=9))
+        worker.set_building(replacement)
+        self.assertIsNot(worker.snapshot.building, replacement)
+        worker.advance(0.0)
+        self.assertIs(worker.snapshot.building, replacement)
+        self.assertEqual(len(worker.snapshot.floor_displacements()), 9)
+
+    def test_sim_time_stops_with_a_destroyed_building(self):
+        class CollapsingBuilding(Building):
+            steps = 0
+
+            def update_physics(self, *args):
+                super().update_physics(*args)
+                self.steps += 1
+                self.is_destroyed = self.steps >= 3
+
+        times = []
+
+        def loads(t):
+            times.append(t)
+            return 0.0, None, None
+
+        worker = PhysicsWorker(CollapsingBuilding(**PARAMS), loads)
+        dt = worker.building.dt
+        self.assertEqual(worker.advance(10.5 * dt), 3)
+        self.assertAlmostEqual(worker.snapshot.sim_time, 3 * dt)
+        self.assertEqual(worker.advance(5 * dt), 0)
+        self.assertAlmostEqual(worker.snapshot.sim_time, 3 * dt)
+        self.assertEqual(len(times), 3)
+
+    def test_load_state_is_published_with_each_snapshot(self):
+        class CountingLoads:
+            calls = 0
+
+            def __call__(self, t):
+                self.calls += 1
+                return 0.0, None, None
+
+            def snapshot(self):
+                return self.calls
+
+        loads = CountingLoads()
+        worker = PhysicsWorker(Building(**PARAMS), loads)
+        self.assertEqual(worker.snapshot.loads, 0)
+        worker.advance(5.5 * worker.building.dt)
+        self.assertEqual(worker.snapshot.loads, 5)
+        self.assertIsNone(PhysicsWorker(Building(**PARAMS), self._loads).snapshot.loads)
+
+    def test_thread_publishes_and_stops(self):
+        with PhysicsWorker(Building(**PARAMS), self._loads, time_scale=5.0) as worker:
+            deadline = time.perf_counter() + 5.0
+            while worker.snapshot.sim_time < 0.2 and time.perf_counter() < deadline:
+                time.sleep(0.01)
+            self.assertGreaterEqual(worker.snapshot.sim_time, 0.2)
+            alpha = worker.interpolation_alpha()
+            self.assertTrue(0.0 <= alpha <= 1.0)
+        self.assertIsNone(worker._thread)
+
+    def test_failure_on_the_worker_surfaces_in_readers(self):
+        def broken(t):
+            raise ArithmeticError("bad load")
+        worker = PhysicsWorker(Building(**PARAMS), broken)
+        worker.start()
+        worker._thread.join(5.0)
+        with self.assertRaises(RuntimeError) as caught:
+            worker.snapshot
+        self.assertIsInstance(caught.exception.__cause__, ArithmeticError)
+        worker.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()